@@ -0,0 +1,98 @@
+"""
+Benchmark the BEP33 bloom filter operations of the DHT health manager: byte-wise Python loops versus big integers.
+
+Usage (from the repository root)::
+
+    python scripts/benchmarks/bloomfilter.py --filters 1000
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+sys.path.append(str(Path(__file__).parents[2] / "pyipv8"))
+sys.path.append(str(Path(__file__).parents[2] / "src"))
+
+from tribler.core.libtorrent.download_manager.dht_health_manager import DHTHealthManager
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def loop_combine_bloomfilters(bf1: bytearray, bf2: bytearray) -> bytearray:
+    """
+    Combine two bloom filters by ORing them byte by byte.
+    """
+    final_bf_len = min(len(bf1), len(bf2))
+    final_bf = bytearray(final_bf_len)
+    for bf_index in range(final_bf_len):
+        final_bf[bf_index] = bf1[bf_index] | bf2[bf_index]
+    return final_bf
+
+
+def loop_get_size_from_bloomfilter(bf: bytearray) -> int:
+    """
+    Estimate the number of items in a bloom filter by counting its zero bits one by one.
+    """
+    total_zeros = 0
+    for num in bytes(bf):
+        total_zeros += f"{num:08b}".count("0")
+    if total_zeros == 0:
+        return 6000
+    m = 256 * 8
+    c = min(m - 1, total_zeros)
+    return int(math.log(c / float(m)) / (2 * math.log(1 - 1 / float(m))))
+
+
+def generate_bloomfilters(count: int, seed: int) -> list[bytearray]:
+    """
+    Create bloom filters with a random fill rate, as received from DHT nodes.
+    """
+    rng = random.Random(seed)
+    filters = []
+    for _ in range(count):
+        fill = rng.random()
+        filters.append(bytearray(sum(1 << i for i in range(8) if rng.random() < fill) for _ in range(256)))
+    return filters
+
+
+def throughput(func: Callable[[list[bytearray]], list], filters: list[bytearray], repeat: int) -> float:
+    """
+    Get the best-of-``repeat`` throughput in bloom filters per second.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(filters)
+        best = min(best, time.perf_counter() - start)
+    return len(filters) / best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the BEP33 bloom filter operations.")
+    parser.add_argument("-n", "--filters", type=int, default=1000, help="The number of bloom filters.")
+    parser.add_argument("-r", "--repeat", type=int, default=10, help="The number of runs per benchmark.")
+    args = parser.parse_args()
+
+    bloomfilters = generate_bloomfilters(args.filters, 42)
+    pairs = list(zip(bloomfilters, bloomfilters[1:] + bloomfilters[:1], strict=True))
+    if ([loop_get_size_from_bloomfilter(bf) for bf in bloomfilters]
+            != [DHTHealthManager.get_size_from_bloomfilter(bf) for bf in bloomfilters]
+            or [loop_combine_bloomfilters(*pair) for pair in pairs]
+            != [DHTHealthManager.combine_bloomfilters(*pair) for pair in pairs]):
+        sys.exit("The big integer operations do not produce the same results as the loops!")
+
+    benchmarks = {
+        "size (loop)": lambda bfs: [loop_get_size_from_bloomfilter(bf) for bf in bfs],
+        "size (bit_count)": lambda bfs: [DHTHealthManager.get_size_from_bloomfilter(bf) for bf in bfs],
+        "combine (loop)": lambda bfs: [loop_combine_bloomfilters(*pair) for pair in pairs],
+        "combine (big int)": lambda bfs: [DHTHealthManager.combine_bloomfilters(*pair) for pair in pairs],
+    }
+    print(f"{'benchmark':<20} {'filters/s':>12}")  # noqa: T201
+    for name, function in benchmarks.items():
+        print(f"{name:<20} {throughput(function, bloomfilters, args.repeat):12.0f}")  # noqa: T201
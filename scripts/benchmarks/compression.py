@@ -0,0 +1,100 @@
+"""
+Measure how many entries fit in a select response with LZ4 and with each compression dictionary.
+
+Usage (from the repository root)::
+
+    python scripts/benchmarks/compression.py --database ~/.Tribler/8.0/sqlite/metadata.db
+    python scripts/benchmarks/compression.py --database ~/.Tribler/8.0/sqlite/metadata.db --train
+
+Without a database, a synthetic corpus is used. With ``--train``, the most common title tokens and tracker URLs of the
+database are printed, as a starting point for a new dictionary version.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parents[2] / "pyipv8"))
+sys.path.append(str(Path(__file__).parents[2] / "src"))
+
+from corpus import generate_corpus
+from ipv8.keyvault.crypto import default_eccrypto
+from pony.orm import db_session
+
+from tribler.core.database.compression import DICTIONARIES
+from tribler.core.database.orm_bindings.torrent_metadata import entries_to_chunk
+from tribler.core.database.serialization import REGULAR_TORRENT
+from tribler.core.database.store import MetadataStore
+
+MAXIMUM_PAYLOAD_SIZE = 1300  # Same as the ContentDiscoverySettings
+RESPONSE_SIZE = 100  # Same as the ContentDiscoverySettings
+TOKEN_PATTERN = re.compile(r"[^\s()\[\]{}]+")
+
+
+def entries_per_packet(entries: list, dictionary_version: int | None) -> float:
+    """
+    Get the average number of entries per packet when sending the given entries.
+    """
+    index = 0
+    packets = 0
+    while index < len(entries):
+        _, index = entries_to_chunk(entries, MAXIMUM_PAYLOAD_SIZE, start_index=index, include_health=True,
+                                    dictionary_version=dictionary_version)
+        packets += 1
+    return len(entries) / packets
+
+
+def train(mds: MetadataStore, count: int) -> None:
+    """
+    Print the most common title tokens and tracker URLs, the most common last.
+    """
+    tokens: Counter[str] = Counter()
+    with db_session:
+        for title, in mds.db.execute("SELECT title FROM ChannelNode"):
+            tokens.update(TOKEN_PATTERN.findall(title or ""))
+        trackers = [url for url, in mds.db.execute("""SELECT t.url FROM TrackerState t
+                                                      JOIN TorrentState_TrackerState tt ON tt.trackerstate = t.rowid
+                                                      GROUP BY t.rowid ORDER BY COUNT(*) DESC LIMIT $count""")]
+    trackers.reverse()
+    print("Tokens:", " ".join(token for token, _ in reversed(tokens.most_common(count))))  # noqa: T201
+    print("Trackers:", " ".join(trackers))  # noqa: T201
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the number of entries per select response.")
+    parser.add_argument("-d", "--database", type=Path, default=None, help="The metadata.db to use.")
+    parser.add_argument("-n", "--rows", type=int, default=20000, help="The size of the synthetic corpus.")
+    parser.add_argument("-q", "--queries", type=int, default=200, help="The number of (random) responses to send.")
+    parser.add_argument("-t", "--train", action="store_true", help="Print dictionary candidates.")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.gettempdir()) / "tribler_benchmarks"
+    workdir.mkdir(parents=True, exist_ok=True)
+    db_path = args.database or generate_corpus(workdir / f"metadata_{args.rows}_42.db", args.rows)
+    store = MetadataStore(str(db_path), default_eccrypto.generate_key("curve25519"), disable_sync=True,
+                          check_tables=False)
+    try:
+        if args.train:
+            train(store, 500)
+
+        rng = random.Random(42)
+        with db_session:
+            max_rowid = store.get_max_rowid()
+            results: dict[int | None, list[float]] = {None: [], **{version: [] for version in DICTIONARIES}}
+            for _ in range(args.queries):
+                response = store.get_entries(max_rowid=rng.randint(RESPONSE_SIZE, max_rowid), sort_by="rowid",
+                                             metadata_type=REGULAR_TORRENT, first=1, last=RESPONSE_SIZE)
+                for version, fill in results.items():
+                    fill.append(entries_per_packet(response, version))
+    finally:
+        store.shutdown()
+
+    for version, fill in results.items():
+        name = "LZ4" if version is None else f"dictionary v{version}"
+        print(f"{name:<16} {statistics.fmean(fill):6.2f} entries per packet")  # noqa: T201
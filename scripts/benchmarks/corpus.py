@@ -0,0 +1,193 @@
+"""
+Deterministic generation of synthetic ``metadata.db`` files for benchmarking.
+
+The same ``rows`` and ``seed`` always produce the same database, so timings can be compared across commits.
+"""
+from __future__ import annotations
+
+import logging
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from ipv8.keyvault.crypto import default_eccrypto
+from pony.orm import db_session
+
+from tribler.core.database.orm_bindings.torrent_metadata import COMMITTED
+from tribler.core.database.serialization import REGULAR_TORRENT, TorrentMetadataPayload
+from tribler.core.database.store import MetadataStore
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from ipv8.keyvault.keys import PrivateKey
+
+logger = logging.getLogger(__name__)
+
+INSERT_BATCH_SIZE = 50000
+NUM_PUBLISHERS = 1000
+NUM_TRACKERS = 200
+NOW = 1700000000  # Fixed "current" time, so the corpus does not depend on the day it was generated
+
+WORDS = ("the", "of", "and", "big", "buck", "bunny", "sintel", "tears", "steel", "elephants", "dream", "cosmos",
+         "laundromat", "spring", "agent", "caminandes", "llama", "drama", "glass", "half", "night", "city", "dark",
+         "light", "star", "wars", "planet", "earth", "ocean", "blue", "red", "green", "black", "white", "house",
+         "game", "thrones", "king", "queen", "lord", "rings", "return", "empire", "strikes", "back", "new", "hope",
+         "last", "first", "man", "woman", "world", "war", "peace", "love", "story", "time", "space", "odyssey",
+         "matrix", "reloaded", "revolutions", "alien", "aliens", "predator", "terminator", "judgment", "day",
+         "ubuntu", "debian", "fedora", "arch", "linux", "mint", "kali", "tails", "freebsd", "openbsd", "desktop",
+         "server", "live", "netinst", "minimal", "complete", "collection", "anthology", "greatest", "hits",
+         "symphony", "orchestra", "concert", "live", "acoustic", "sessions", "remastered", "deluxe", "edition",
+         "history", "science", "nature", "documentary", "lecture", "course", "python", "programming", "guide")
+MOVIE_TAGS = ("1080p", "720p", "2160p", "BluRay", "WEB-DL", "WEBRip", "HDTV", "x264", "x265", "HEVC", "AAC", "DTS")
+GROUPS = ("YTS", "RARBG", "EVO", "SPARKS", "NTb", "FLUX", "GalaxyRG", "ION10", "TGx", "CMRG")
+CATEGORIES = ("Video", "Video", "Video", "Audio", "Audio", "Documents", "Compressed", "Other")
+
+
+def zipf_choice(rng: random.Random, items: tuple[str, ...] | list[str], alpha: float = 1.2) -> str:
+    """
+    Pick an item, where the first items of the sequence are much more likely to be picked than the last ones.
+    """
+    return items[min(int(rng.paretovariate(alpha)) - 1, len(items) - 1)]
+
+
+def generate_title(rng: random.Random) -> str:
+    """
+    Create a torrent title that looks like one of the common title formats.
+    """
+    words = " ".join(zipf_choice(rng, WORDS, 0.6).capitalize() for _ in range(rng.randint(1, 5)))
+    kind = rng.random()
+    if kind < 0.45:
+        return (f"{words} ({rng.randint(1950, 2024)}) {zipf_choice(rng, MOVIE_TAGS)} "
+                f"{zipf_choice(rng, MOVIE_TAGS)}-{zipf_choice(rng, GROUPS)}")
+    if kind < 0.75:
+        return (f"{words} S{rng.randint(1, 12):02d}E{rng.randint(1, 24):02d} {zipf_choice(rng, MOVIE_TAGS)} "
+                f"{zipf_choice(rng, MOVIE_TAGS)}-{zipf_choice(rng, GROUPS)}")
+    if kind < 0.9:
+        return f"{words} - {zipf_choice(rng, WORDS).capitalize()} ({rng.randint(1960, 2024)}) [FLAC]"
+    return f"{words} {rng.randint(1, 30)}.{rng.randint(0, 12):02d} amd64"
+
+
+def generate_trackers() -> list[str]:
+    """
+    Create the (fixed) list of tracker URLs that the torrents of the corpus are announced on.
+    """
+    return [f"udp://tracker{i}.example.org:{6969 + i % 3}/announce" if i % 4 else
+            f"http://tracker{i}.example.com/announce" for i in range(NUM_TRACKERS)]
+
+
+def generate_health(rng: random.Random) -> tuple[int, int, int]:
+    """
+    Create a (seeders, leechers, last_check) tuple: many torrents are never checked or dead, few are very popular.
+    """
+    if rng.random() < 0.4:
+        return 0, 0, 0
+    seeders = max(0, int(rng.paretovariate(0.9)) - 2)
+    leechers = max(0, int(rng.paretovariate(1.1)) - 2)
+    last_check = NOW - int(rng.expovariate(1 / (3 * 24 * 3600)))
+    return seeders, leechers, last_check
+
+
+def generate_rows(rows: int, seed: int) -> Iterator[tuple[tuple, tuple, list[int]]]:
+    """
+    Generate the (TorrentState, ChannelNode, tracker indices) rows of the corpus.
+    """
+    rng = random.Random(seed)
+    publishers = [rng.randbytes(64) for _ in range(NUM_PUBLISHERS)]
+    epoch = datetime(1970, 1, 1)  # noqa: DTZ001
+    for rowid in range(1, rows + 1):
+        infohash = rng.randbytes(20)
+        seeders, leechers, last_check = generate_health(rng)
+        torrent_state = (rowid, infohash, seeders, leechers, last_check, 1 if last_check else 0, last_check > 0)
+
+        free_for_all = rng.random() < 0.3
+        torrent_date = str(epoch + timedelta(seconds=NOW - rng.randint(0, 10 * 365 * 24 * 3600)))
+        channel_node = (rowid, infohash, int(rng.lognormvariate(20, 2)), torrent_date, "", generate_title(rng),
+                        rng.choice(CATEGORIES), REGULAR_TORRENT, 0, 0,
+                        b"" if free_for_all else rng.choice(publishers), rowid, rowid * 1000,
+                        None if free_for_all else rng.randbytes(64), torrent_date, COMMITTED, 0.0, rowid, 0)
+
+        tracker_indices = list({min(int(rng.paretovariate(0.8)) - 1, NUM_TRACKERS - 1)
+                                for _ in range(rng.choice((0, 1, 1, 2, 3)))})
+        yield torrent_state, channel_node, tracker_indices
+
+
+def generate_corpus(db_path: Path, rows: int, seed: int = 42) -> Path:
+    """
+    Create a synthetic metadata database with the given number of rows, if it does not exist yet.
+    """
+    if db_path.exists():
+        return db_path
+
+    start = time.time()
+    tmp_path = db_path.with_suffix(".tmp")
+    tmp_path.unlink(missing_ok=True)
+
+    # Let the MetadataStore create the schema, exactly as Tribler would.
+    mds = MetadataStore(str(tmp_path), default_eccrypto.generate_key("curve25519"), disable_sync=True)
+    with db_session:
+        mds.drop_fts_triggers()
+    mds.shutdown()
+
+    connection = sqlite3.connect(tmp_path)
+    connection.execute("PRAGMA journal_mode = OFF")
+    connection.execute("PRAGMA synchronous = OFF")
+    connection.executemany("INSERT INTO TrackerState (rowid, url, last_check, alive, failures) VALUES (?, ?, 0, 1, 0)",
+                           list(enumerate(generate_trackers(), start=1)))
+
+    torrent_states, channel_nodes, torrent_trackers = [], [], []
+    for torrent_state, channel_node, tracker_indices in generate_rows(rows, seed):
+        torrent_states.append(torrent_state)
+        channel_nodes.append(channel_node)
+        torrent_trackers.extend((torrent_state[0], i + 1) for i in tracker_indices)
+        if len(torrent_states) == INSERT_BATCH_SIZE:
+            _insert_batch(connection, torrent_states, channel_nodes, torrent_trackers)
+            torrent_states, channel_nodes, torrent_trackers = [], [], []
+            logger.info("Generated %d/%d rows", torrent_state[0], rows)
+    _insert_batch(connection, torrent_states, channel_nodes, torrent_trackers)
+    connection.commit()
+    connection.close()
+
+    mds = MetadataStore(str(tmp_path), default_eccrypto.generate_key("curve25519"), disable_sync=True)
+    with db_session(ddl=True):
+        mds.fill_fts_index()
+        mds.create_fts_triggers()
+    mds.shutdown()
+
+    tmp_path.rename(db_path)
+    logger.info("Generated corpus of %d rows in %f seconds: %s", rows, time.time() - start, db_path)
+    return db_path
+
+
+def _insert_batch(connection: sqlite3.Connection, torrent_states: list[tuple], channel_nodes: list[tuple],
+                  torrent_trackers: list[tuple[int, int]]) -> None:
+    """
+    Insert a batch of generated rows.
+    """
+    connection.executemany("""INSERT INTO TorrentState (rowid, infohash, seeders, leechers, last_check, self_checked,
+                              has_data) VALUES (?, ?, ?, ?, ?, ?, ?)""", torrent_states)
+    connection.executemany("""INSERT INTO ChannelNode (rowid, infohash, size, torrent_date, tracker_info, title, tags,
+                              metadata_type, reserved_flags, origin_id, public_key, id_, timestamp, signature,
+                              added_on, status, xxx, health, tag_processor_version)
+                              VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", channel_nodes)
+    connection.executemany("INSERT INTO TorrentState_TrackerState (torrentstate, trackerstate) VALUES (?, ?)",
+                           torrent_trackers)
+
+
+def generate_squashed_mdblob(key: PrivateKey, entries: int, seed: int = 1337) -> bytes:
+    """
+    Create a blob of signed metadata payloads, as it would be received from other peers.
+    """
+    rng = random.Random(seed)
+    public_key = key.pub().key_to_bin()[10:]
+    blob = b""
+    for i in range(entries):
+        payload = TorrentMetadataPayload(REGULAR_TORRENT, 0, public_key, i, 0, i, rng.randbytes(20),
+                                         int(rng.lognormvariate(20, 2)), NOW - rng.randint(0, 3650 * 24 * 3600),
+                                         generate_title(rng), rng.choice(CATEGORIES), "")
+        payload.add_signature(key)
+        blob += payload.serialized() + payload.signature
+    return blob
@@ -0,0 +1,108 @@
+"""
+Benchmark the CPU cost per dht_pkt alert of the DHT health manager: decoding every packet versus prefiltering.
+
+Usage (from the repository root)::
+
+    python scripts/benchmarks/dht_packets.py --packets 100000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import Mock
+
+sys.path.append(str(Path(__file__).parents[2] / "pyipv8"))
+sys.path.append(str(Path(__file__).parents[2] / "src"))
+
+import libtorrent as lt
+
+from tribler.core.libtorrent.download_manager.dht_health_manager import DHTHealthManager
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class FakePacketAlert:
+    """
+    A dht_pkt alert with a packet buffer and a direction.
+    """
+
+    def __init__(self, pkt_buf: bytes, incoming: bool) -> None:
+        """
+        Create a new fake alert.
+        """
+        self.pkt_buf = pkt_buf
+        self.incoming = incoming
+
+    def __str__(self) -> str:
+        """
+        Format the direction of the packet like libtorrent does.
+        """
+        return "<== packet" if self.incoming else "==> packet"
+
+
+def generate_packets(count: int, bep33_fraction: float, seed: int) -> list[FakePacketAlert]:
+    """
+    Create the DHT traffic of a busy node: mostly pings, node lookups and peer lists, with a few BEP33 messages.
+    """
+    rng = random.Random(seed)
+    alerts = []
+    for i in range(count):
+        transaction_id = i.to_bytes(2, "big")
+        if rng.random() < bep33_fraction:
+            packet = {b"t": transaction_id, b"y": b"r", b"r": {b"id": rng.randbytes(20), b"BFsd": rng.randbytes(256),
+                                                               b"BFpe": rng.randbytes(256)}}
+        else:
+            packet = rng.choice([
+                {b"t": transaction_id, b"y": b"q", b"q": b"ping", b"a": {b"id": rng.randbytes(20)}},
+                {b"t": transaction_id, b"y": b"r", b"r": {b"id": rng.randbytes(20), b"nodes": rng.randbytes(208)}},
+                {b"t": transaction_id, b"y": b"r", b"r": {b"id": rng.randbytes(20), b"token": rng.randbytes(8),
+                                                          b"values": [rng.randbytes(6) for _ in range(8)]}},
+                {b"t": transaction_id, b"y": b"q", b"q": b"get_peers", b"a": {b"id": rng.randbytes(20),
+                                                                              b"info_hash": rng.randbytes(20)}},
+            ])
+        alerts.append(FakePacketAlert(lt.bencode(packet), rng.random() < 0.5))
+    return alerts
+
+
+def decode_all(manager: DHTHealthManager, alert: FakePacketAlert) -> None:
+    """
+    Decode every packet before looking for BEP33 messages.
+    """
+    manager.process_decoded_packet(alert, lt.bdecode(alert.pkt_buf))
+
+
+def cost_per_alert(func: Callable[[DHTHealthManager, FakePacketAlert], None], alerts: list[FakePacketAlert],
+                   repeat: int) -> float:
+    """
+    Get the best-of-``repeat`` CPU time per alert, in microseconds.
+    """
+    best = float("inf")
+    manager = DHTHealthManager(Mock())
+    for _ in range(repeat):
+        start = time.process_time()
+        for alert in alerts:
+            func(manager, alert)
+        best = min(best, time.process_time() - start)
+    return best / len(alerts) * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the CPU cost per dht_pkt alert.")
+    parser.add_argument("-n", "--packets", type=int, default=100000, help="The number of DHT packets.")
+    parser.add_argument("-f", "--bep33", type=float, default=0.01, help="The fraction of BEP33 responses.")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="The number of runs per benchmark.")
+    args = parser.parse_args()
+
+    packet_alerts = generate_packets(args.packets, args.bep33, 42)
+    benchmarks = {
+        "decode all": decode_all,
+        "prefilter": DHTHealthManager.process_packet,
+    }
+    print(f"{'benchmark':<12} {'us/alert':>9}")  # noqa: T201
+    for name, function in benchmarks.items():
+        print(f"{name:<12} {cost_per_alert(function, packet_alerts, args.repeat):9.3f}")  # noqa: T201
@@ -0,0 +1,195 @@
+"""
+Benchmark the MetadataStore on a synthetic corpus and write the timings as JSON.
+
+Usage (from the repository root)::
+
+    python scripts/benchmarks/metadata_store.py --rows 100000 --output before.json
+    python scripts/benchmarks/metadata_store.py --rows 100000 --output after.json --compare before.json
+
+Generated corpora are cached in the work directory, so only the first run for a given size and seed is slow.
+Typical sizes are 100000, 1000000 and 5000000 rows.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+sys.path.append(str(Path(__file__).parents[2] / "pyipv8"))
+sys.path.append(str(Path(__file__).parents[2] / "src"))
+
+from corpus import NOW, generate_corpus, generate_squashed_mdblob
+from ipv8.keyvault.crypto import default_eccrypto
+from ipv8.taskmanager import TaskManager
+from pony.orm import db_session
+
+from tribler.core.database.augmenter import AugmentedSearch
+from tribler.core.database.queries import to_fts_query
+from tribler.core.database.serialization import REGULAR_TORRENT
+from tribler.core.database.store import MetadataStore
+from tribler.core.notifier import Notifier
+from tribler.tribler_config import TriblerConfigManager
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+SEARCH_QUERIES = ("ubuntu", "big buck bunny", "star wars", "the", "1080p x264", "matrix reloaded", "linux amd64",
+                  "documentary", "s01e01", "nonexistentword")
+SORT_OPTIONS = (None, "HEALTH", "size", "title", "tags", "torrent_date", "infohash")
+INGEST_ENTRIES = 1000
+
+
+def measure(func: Callable[[], Any], repeat: int) -> dict[str, float]:
+    """
+    Call the given function ``repeat`` times and summarize the wall-clock times in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {"runs": repeat, "min": min(timings), "median": statistics.median(timings),
+            "mean": statistics.fmean(timings), "max": max(timings)}
+
+
+def create_augmenter(mds: MetadataStore, state_dir: Path) -> AugmentedSearch:
+    """
+    Train an augmenter on the titles of the corpus.
+    """
+    config = TriblerConfigManager(state_dir / "configuration.json")
+    config.set("state_dir", str(state_dir))
+
+    async def study() -> AugmentedSearch:
+        task_manager = TaskManager()
+        augmenter = AugmentedSearch(config, Notifier(), task_manager)
+        mds.seed_augmenter(augmenter)
+        await augmenter.study()
+        await task_manager.shutdown_task_manager()
+        return augmenter
+
+    return asyncio.run(study())
+
+
+def run_benchmarks(mds: MetadataStore, state_dir: Path, repeat: int) -> dict[str, dict[str, float]]:
+    """
+    Time the (potentially) expensive MetadataStore operations.
+    """
+    results = {}
+
+    for query in SEARCH_QUERIES:
+        fts_query = to_fts_query(query)
+        with db_session:
+            results[f"search_keyword[{query}]"] = measure(lambda q=fts_query: mds.search_keyword(q)[:100], repeat)
+        results[f"get_entries[txt_filter={query}]"] = measure(
+            lambda q=fts_query: mds.get_entries(txt_filter=q, metadata_type=REGULAR_TORRENT, first=1, last=50),
+            repeat
+        )
+
+    for sort_by in SORT_OPTIONS:
+        for sort_desc in (True, False):
+            results[f"get_entries[sort_by={sort_by},sort_desc={sort_desc}]"] = measure(
+                lambda s=sort_by, d=sort_desc: mds.get_entries(sort_by=s, sort_desc=d, first=1, last=50),
+                repeat
+            )
+
+    results["get_entries[popular]"] = measure(
+        lambda: mds.get_entries(popular=True, metadata_type=REGULAR_TORRENT, first=1, last=50),
+        repeat
+    )
+    results["get_entries[health_checked_after]"] = measure(
+        lambda: mds.get_entries(health_checked_after=NOW - 24 * 3600, sort_by="HEALTH", first=1, last=50),
+        repeat
+    )
+
+    for text in ("ub", "star w", "big buck b"):
+        results[f"get_auto_complete_terms[{text}]"] = measure(lambda t=text: mds.get_auto_complete_terms(t, 10),
+                                                              repeat)
+
+    augmenter = create_augmenter(mds, state_dir)
+    for query in SEARCH_QUERIES[:5]:
+        with db_session:
+            results[f"query_with_augmenter[{query}]"] = measure(
+                lambda q=query: list(mds.query_with_augmenter(q, augmenter, first=1, last=50)),
+                repeat
+            )
+
+    key = default_eccrypto.generate_key("curve25519")
+    blobs = [generate_squashed_mdblob(key, INGEST_ENTRIES, seed=i) for i in range(repeat)]
+    results[f"process_squashed_mdblob[{INGEST_ENTRIES}]"] = measure(lambda: mds.process_squashed_mdblob(blobs.pop()),
+                                                                     repeat)
+    return results
+
+
+def get_commit() -> str | None:
+    """
+    Get the git commit of the benchmarked code, if available.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, check=True,  # noqa: S607
+                              cwd=Path(__file__).parent, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict[str, dict[str, float]], previous: dict[str, dict[str, float]]) -> None:
+    """
+    Print the median timings of the current results relative to a previous run.
+    """
+    print(f"{'benchmark':<60} {'previous':>10} {'current':>10} {'ratio':>7}")  # noqa: T201
+    for name, timing in current.items():
+        if name in previous:
+            ratio = timing["median"] / max(previous[name]["median"], 1e-9)
+            print(f"{name:<60} {previous[name]['median']:10.5f} {timing['median']:10.5f} {ratio:7.2f}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the MetadataStore on a synthetic corpus.")
+    parser.add_argument("-n", "--rows", type=int, default=100000, help="The number of torrents in the corpus.")
+    parser.add_argument("-s", "--seed", type=int, default=42, help="The seed of the corpus generator.")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="The number of runs per benchmark.")
+    parser.add_argument("-w", "--workdir", type=Path, default=Path(tempfile.gettempdir()) / "tribler_benchmarks",
+                        help="The directory to cache generated corpora in.")
+    parser.add_argument("-o", "--output", type=Path, default=None, help="The JSON file to write the results to.")
+    parser.add_argument("-c", "--compare", type=Path, default=None, help="A previous JSON result to compare to.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger("MetadataStore").setLevel(logging.WARNING)
+    args.workdir.mkdir(parents=True, exist_ok=True)
+    corpus_path = generate_corpus(args.workdir / f"metadata_{args.rows}_{args.seed}.db", args.rows, args.seed)
+
+    with tempfile.TemporaryDirectory() as run_dir:
+        # Run on a copy, the ingest benchmark writes to the database.
+        db_path = Path(run_dir) / "metadata.db"
+        db_path.write_bytes(corpus_path.read_bytes())
+        store = MetadataStore(str(db_path), default_eccrypto.generate_key("curve25519"))
+        try:
+            benchmark_results = run_benchmarks(store, Path(run_dir), args.repeat)
+        finally:
+            store.shutdown()
+
+    report = {
+        "meta": {"rows": args.rows, "seed": args.seed, "repeat": args.repeat, "commit": get_commit(),
+                 "python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+                 "platform": platform.platform()},
+        "results": benchmark_results
+    }
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=4)
+    else:
+        print(json.dumps(report, indent=4))  # noqa: T201
+
+    if args.compare:
+        with open(args.compare) as compare_file:
+            compare(benchmark_results, json.load(compare_file)["results"])
@@ -0,0 +1,118 @@
+"""
+Benchmark the parsing of received metadata blobs: the generic ipv8 unpacking versus the fast path.
+
+Usage (from the repository root)::
+
+    python scripts/benchmarks/serialization.py --entries 10000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+sys.path.append(str(Path(__file__).parents[2] / "pyipv8"))
+sys.path.append(str(Path(__file__).parents[2] / "src"))
+
+from corpus import generate_squashed_mdblob
+from ipv8.keyvault.crypto import default_eccrypto
+from ipv8.messaging.serialization import default_serializer
+
+from tribler.core.database.serialization import (
+    SIGNATURE_SIZE,
+    HealthItemsPayload,
+    TorrentMetadataPayload,
+    read_payload_with_offset,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def generic_read_blob(data: bytes) -> list[TorrentMetadataPayload]:
+    """
+    Read all payloads of a blob using the generic ipv8 serializer.
+    """
+    offset = 0
+    payloads = []
+    while offset < len(data):
+        payload, offset = default_serializer.unpack_serializable(TorrentMetadataPayload, data, offset=offset)
+        payload.signature = data[offset: offset + SIGNATURE_SIZE]
+        offset += SIGNATURE_SIZE
+        payloads.append(payload)
+    return payloads
+
+
+def fast_read_blob(data: bytes) -> list[TorrentMetadataPayload]:
+    """
+    Read all payloads of a blob using ``read_payload_with_offset``.
+    """
+    offset = 0
+    payloads = []
+    data = memoryview(data)
+    while offset < len(data):
+        payload, offset = read_payload_with_offset(data, offset)
+        payloads.append(payload)
+    return payloads
+
+
+def generic_read_health(data: bytes) -> list[tuple[int, int, int]]:
+    """
+    Read a health block by splitting it.
+    """
+    items = default_serializer.unpack_serializable(HealthItemsPayload, data)[0].data.split(b";")[:-1]
+    return [HealthItemsPayload.parse_health_data_item(item) for item in items]
+
+
+def generate_health_block(entries: int, seed: int) -> bytes:
+    """
+    Create a serialized health block, as it is appended to a select response.
+    """
+    rng = random.Random(seed)
+    items = [f"{int(rng.paretovariate(0.9))},{int(rng.paretovariate(1.1))},{1700000000 - rng.randint(0, 10 ** 6)};"
+             if rng.random() < 0.6 else ";" for _ in range(entries)]
+    return HealthItemsPayload("".join(items).encode()).serialize()
+
+
+def throughput(func: Callable[[bytes], list[Any]], data: bytes, repeat: int) -> tuple[float, float]:
+    """
+    Get the best-of-``repeat`` throughput in (items per second, MB per second).
+    """
+    best = float("inf")
+    items = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = len(func(data))
+        best = min(best, time.perf_counter() - start)
+    return items / best, len(data) / best / 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the parsing of received metadata blobs.")
+    parser.add_argument("-n", "--entries", type=int, default=10000, help="The number of payloads per blob.")
+    parser.add_argument("-r", "--repeat", type=int, default=10, help="The number of runs per benchmark.")
+    args = parser.parse_args()
+
+    blob = generate_squashed_mdblob(default_eccrypto.generate_key("curve25519"), args.entries)
+    health_block = generate_health_block(args.entries, 42)
+    if ([p.to_dict() for p in generic_read_blob(blob)] != [p.to_dict() for p in fast_read_blob(blob)]
+            or generic_read_health(health_block) != HealthItemsPayload.unpack(health_block)):
+        sys.exit("The fast path does not produce the same results as the generic path!")
+
+    benchmarks = {
+        "payloads (generic)": (generic_read_blob, blob),
+        "payloads (fast)": (fast_read_blob, blob),
+        "payloads + to_dict (generic)": (lambda d: [p.to_dict() for p in generic_read_blob(d)], blob),
+        "payloads + to_dict (fast)": (lambda d: [p.to_dict() for p in fast_read_blob(d)], blob),
+        "payloads + serialized (generic)": (lambda d: [p.serialized() for p in generic_read_blob(d)], blob),
+        "payloads + serialized (fast)": (lambda d: [p.serialized() for p in fast_read_blob(d)], blob),
+        "health (generic)": (generic_read_health, health_block),
+        "health (fast)": (HealthItemsPayload.unpack, health_block),
+    }
+    print(f"{'benchmark':<32} {'items/s':>12} {'MB/s':>8}")  # noqa: T201
+    for name, (function, buffer) in benchmarks.items():
+        items_per_second, mb_per_second = throughput(function, buffer, args.repeat)
+        print(f"{name:<32} {items_per_second:12.0f} {mb_per_second:8.2f}")  # noqa: T201
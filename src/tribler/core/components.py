@@ -129,6 +129,15 @@ class ContentDiscoveryComponent(BaseLauncher["ContentDiscoveryCommunity"]):
     Launch instructions for the content discovery community.
     """
 
+    def get_kwargs(self, session: Session) -> dict:
+        """
+        Extend our community arguments with all necessary config settings.
+        """
+        out = super().get_kwargs(session)
+        out["remote_query_workers"] = session.config.get("content_discovery_community/remote_query_workers")
+        out["peer_scoreboard_file"] = Path(session.config.get_version_state_dir()) / "content_discovery_peers.json"
+        return out
+
     def finalize(self, ipv8: IPv8, session: Session, community: ContentDiscoveryCommunity) -> None:
         """
         When we are done launching, register our REST API.
@@ -192,6 +201,9 @@ class DatabaseComponent(ComponentLauncher):
             cast("MetadataStore", session.mds).seed_augmenter(db_endpoint.augmenter)
             community.register_task("Seed augmenter", db_endpoint.augmenter.study)
 
+        if session.config.get("database/warm_up"):
+            community.register_task("Warm up database", cast("MetadataStore", session.mds).warm_up_threaded)
+
     def get_endpoints(self) -> list[RESTEndpoint]:
         """
         Add the database endpoint.
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import math
+from hashlib import blake2b
+from typing import TYPE_CHECKING, Self
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterator
+
+BITS_PER_KEY = 10  # Gives a false positive rate of less than 1% with the optimal number of functions
+MAX_FUNCTIONS = 16
+MIN_SIZE = 8  # bytes
+
+
+class BloomFilter:
+    """
+    A salted Bloom filter over byte strings that can be sent to other peers.
+
+    Every filter uses its own salt, so that a key that is a false positive in one filter is most likely not a false
+    positive in the next one.
+    """
+
+    def __init__(self, data: bytes, functions: int, salt: int) -> None:
+        """
+        Create a Bloom filter from its bits.
+
+        :param data: the bits of the filter, its length determines the size of the filter.
+        :param functions: the number of hash functions (bits per key).
+        :param salt: the 32-bit salt of the hash functions.
+        """
+        self.data = bytearray(data)
+        self.size = len(self.data) * 8
+        self.functions = functions
+        self.salt = salt
+        self._key = salt.to_bytes(4, "big")
+
+    @classmethod
+    def create(cls: type[Self], keys: Collection[bytes], max_size: int, salt: int) -> Self:
+        """
+        Create a filter that contains the given keys and has the optimal number of functions for its size.
+
+        :param keys: the keys to add.
+        :param max_size: the maximum size of the filter in bytes.
+        :param salt: the 32-bit salt of the hash functions.
+        """
+        size = min(max(math.ceil(len(keys) * BITS_PER_KEY / 8), MIN_SIZE), max_size)
+        functions = min(max(round(size * 8 / max(len(keys), 1) * math.log(2)), 1), MAX_FUNCTIONS)
+        bloom_filter = cls(bytes(size), functions, salt)
+        for key in keys:
+            bloom_filter.add(key)
+        return bloom_filter
+
+    def _indices(self, key: bytes) -> Iterator[int]:
+        """
+        Get the bit indices of the given key, using double hashing.
+        """
+        digest = blake2b(key, digest_size=16, key=self._key).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        for i in range(self.functions):
+            yield (first + i * second) % self.size
+
+    def add(self, key: bytes) -> None:
+        """
+        Add the given key to the filter.
+        """
+        for index in self._indices(key):
+            self.data[index >> 3] |= 1 << (index & 7)
+
+    def __contains__(self, key: bytes) -> bool:
+        """
+        Check if the given key is (probably) in the filter.
+        """
+        return all(self.data[index >> 3] & (1 << (index & 7)) for index in self._indices(key))
+
+    def to_bytes(self) -> bytes:
+        """
+        Get the bits of the filter.
+        """
+        return bytes(self.data)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from binascii import hexlify
 from typing import TYPE_CHECKING, Self
 
@@ -26,6 +27,7 @@ class SelectRequest(RandomNumberCache):
         """
         super().__init__(request_cache, hexlify(peer.mid).decode())
         self.request_kwargs = request_kwargs
+        self.created = time.time()
         # The callback to call on results of processing of the response payload
         self.processing_callback = processing_callback
         # The maximum number of packets to receive from any given peer from a single request.
@@ -44,3 +46,34 @@ class SelectRequest(RandomNumberCache):
         """
         if self.timeout_callback is not None:
             self.timeout_callback(self)
+
+
+class CatchUpRequest(RandomNumberCache):
+    """
+    Keep track of the packets of a single page of a catch-up sync.
+    """
+
+    def __init__(self, request_cache: RequestCache, peer: Peer, cursor: bytes,
+                 timeout_callback: Callable[[Self], None]) -> None:
+        """
+        Create a new catch-up request cache.
+        """
+        super().__init__(request_cache, "catch-up-" + hexlify(peer.mid).decode())
+        self.peer = peer
+        self.cursor = cursor
+        self.total: int | None = None
+        self.received: set[int] = set()
+        self.timeout_callback = timeout_callback
+
+    @property
+    def complete(self) -> bool:
+        """
+        Whether all packets of the page have been received.
+        """
+        return self.total is not None and len(self.received) == self.total
+
+    def on_timeout(self: Self) -> None:
+        """
+        Call the timeout callback.
+        """
+        self.timeout_callback(self)
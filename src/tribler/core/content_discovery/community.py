@@ -3,13 +3,16 @@ from __future__ import annotations
 import heapq
 import json
 import random
+import struct
 import sys
 import time
 import uuid
+from asyncio import sleep
 from binascii import hexlify, unhexlify
-from collections import deque
+from collections import OrderedDict, deque
 from importlib.metadata import PackageNotFoundError, version
 from itertools import count
+from operator import itemgetter
 from typing import TYPE_CHECKING, Any, cast
 
 from ipv8.community import Community, CommunitySettings
@@ -17,31 +20,61 @@ from ipv8.lazy_community import lazy_wrapper
 from ipv8.requestcache import RequestCache
 from pony.orm import OperationalError, db_session
 
-from tribler.core.content_discovery.cache import SelectRequest
+from tribler.core.content_discovery.bloomfilter import MAX_FUNCTIONS, BloomFilter
+from tribler.core.content_discovery.cache import CatchUpRequest, SelectRequest
 from tribler.core.content_discovery.payload import (
+    CatchUpRequestPayload,
+    CatchUpResponsePayload,
     HealthPayload,
+    HealthReconcilePayload,
     HealthRequestPayload,
     RemoteSelectPayload,
     SelectResponsePayload,
     VersionRequest,
     VersionResponse,
 )
+from tribler.core.content_discovery.response_cache import SelectResponseCache, query_key
+from tribler.core.content_discovery.scheduler import QueryScheduler
+from tribler.core.content_discovery.scoreboard import PeerScoreboard
+from tribler.core.content_discovery.search import MAX_SEARCH_SESSIONS, SearchSession
+from tribler.core.content_discovery.send_queue import PRIORITY_BULK, PRIORITY_HIGH, SendQueue
+from tribler.core.database.compression import DICTIONARIES, select_dictionary_version
 from tribler.core.database.orm_bindings.torrent_metadata import LZ4_EMPTY_ARCHIVE, entries_to_chunk
+from tribler.core.database.serialization import REGULAR_TORRENT
 from tribler.core.database.store import MetadataStore, ObjState, ProcessingResult
 from tribler.core.notifier import Notification, Notifier
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Sequence
+    from pathlib import Path
 
+    from ipv8.messaging.payload import IntroductionResponsePayload, NewIntroductionResponsePayload
+    from ipv8.messaging.payload_headers import GlobalTimeDistributionPayload
     from ipv8.peer import Peer
 
     from tribler.core.database.orm_bindings.torrent_metadata import TorrentMetadata
+    from tribler.core.database.orm_bindings.torrent_state import TorrentState
     from tribler.core.torrent_checker.healthdataclasses import HealthInfo
     from tribler.core.torrent_checker.torrent_checker import TorrentChecker
 
 
 HEALTH_REQUEST_POPULAR = 1
 HEALTH_REQUEST_RANDOM = 2
+HEALTH_REQUEST_RECONCILE = 3
+
+# The estimated cost of remote queries, in the units of the peer query budget.
+QUERY_COST_LOOKUP = 1  # Queries for specific infohashes, served by an index
+QUERY_COST_BROWSE = 2  # Queries that (partially) sort the database
+QUERY_COST_TEXT = 4  # Full-text searches
+
+CATCH_UP_CURSOR = struct.Struct(">IQ")  # The seeders and rowid of the last torrent of a catch-up page
+
+
+def health_key(infohash: bytes, last_check: int) -> bytes:
+    """
+    Get the key of a torrent health check in a Bloom filter: a newer check of the same torrent has a different key.
+    """
+    return infohash + last_check.to_bytes(8, "big")
 
 
 class ContentDiscoverySettings(CommunitySettings):
@@ -51,12 +84,45 @@ class ContentDiscoverySettings(CommunitySettings):
 
     random_torrent_interval: float = 5  # seconds
     random_torrent_count: int = 10
+    health_reconciliation: bool = True  # Pull missing torrent health with Bloom filters, gossip only with older peers
+    reconcile_min_interval: float = 2  # seconds between health reconciliation rounds, when they bring novelty
+    reconcile_max_interval: float = 60  # seconds between health reconciliation rounds, when they bring nothing new
+    reconcile_set_size: int = 800  # Max number of (the most recently checked) torrents to put in a Bloom filter
+    reconcile_filter_size: int = 1024  # bytes, max size of a Bloom filter
+    legacy_gossip_interval: float = 30  # seconds between random health gossip rounds with peers that do not reconcile
     max_query_peers: int = 20
+    search_exploration: float = 0.25  # Fraction of the search peers to select at random instead of by score
+    peer_scoreboard_file: Path | None = None  # Where to keep the peer scores between sessions
+    search_update_interval: float = 0.5  # seconds, minimum time between two ranked search result updates
+    search_deadline: float = 10  # seconds after which a search no longer accepts results
+    search_target_results: int = 50  # Number of good results after which a search finishes early
+    search_good_rank: float = 0.5  # Minimum rank of a good search result
     maximum_payload_size: int = 1300
     max_response_size: int = 100  # Max number of entries returned by SQL query
+    dictionary_compression: bool = True  # Ask for (and answer with) dictionary-compressed responses
+    remote_query_workers: int = 4  # Max number of remote queries that are processed concurrently
+    remote_query_queue_size: int = 100  # Max number of remote queries that wait for a worker
+    remote_query_max_wait: float = 5  # seconds, remote queries that wait longer are dropped
+    peer_query_budget: float = 20  # Max query cost that a single peer can spend in a burst
+    peer_query_refill_rate: float = 1  # Query cost per second that a single peer can spend in the long run
+    response_cache_ttl: float = 10  # seconds that the response to a remote query may be sent to other peers again
+    response_cache_size: int = 256  # Max number of remote query responses to cache
+    send_rate: float = 100  # packets per second that we send in response to the queries of other peers
+    send_burst: float = 25  # Max number of response packets to send at once
+    send_queue_size: int = 500  # Max number of queued response packets, per priority
+    resolve_window: float = 0.5  # seconds to collect the unknown infohashes of a peer before resolving them at once
+    max_resolve_batch: int = 25  # Max number of infohashes to resolve with a single select (that fits in a packet)
+    catch_up: bool = True  # Pull the popular torrents that were checked recently from peers, page by page
+    catch_up_max_age: int = 7 * 24 * 3600  # seconds, only catch up on torrents that were checked more recently
+    catch_up_page_size: int = 50  # Max number of torrents per catch-up page
+    catch_up_max_pages: int = 40  # Max number of catch-up pages to pull per session
+    catch_up_page_interval: float = 2  # seconds between two catch-up page requests
+    catch_up_max_packets: int = 20  # Max number of packets of a single catch-up page
 
     binary_fields: Sequence[str] = ("infohash", "channel_pk")
+    binary_set_fields: Sequence[str] = ("infohash_set",)
     deprecated_parameters: Sequence[str] = ("subscribed", "attribute_ranges", "complete_channel")
+    compression_parameter: str = "dictionaries"  # Older peers ignore unknown parameters and answer with LZ4
 
     metadata_store: MetadataStore
     torrent_checker: TorrentChecker
@@ -79,7 +145,10 @@ class ContentDiscoveryCommunity(Community):
         self.composition = settings
 
         self.add_message_handler(HealthRequestPayload, self.on_health_request)
+        self.add_message_handler(HealthReconcilePayload, self.on_health_reconcile)
         self.add_message_handler(HealthPayload, self.on_health)
+        self.add_message_handler(CatchUpRequestPayload, self.on_catch_up_request)
+        self.add_message_handler(CatchUpResponsePayload, self.on_catch_up_response)
         self.add_message_handler(VersionRequest, self.on_version_request)
         self.add_message_handler(VersionResponse, self.on_version_response)
         self.add_message_handler(RemoteSelectPayload, self.on_remote_select)
@@ -95,20 +164,51 @@ class ContentDiscoveryCommunity(Community):
 
         self.request_cache = RequestCache()
 
-        self.remote_queries_in_progress = 0
+        self.query_scheduler = QueryScheduler(self.composition.remote_query_workers,
+                                              self.composition.remote_query_queue_size,
+                                              self.composition.remote_query_max_wait,
+                                              self.composition.peer_query_budget,
+                                              self.composition.peer_query_refill_rate)
+        self.send_queue = SendQueue(self.ez_send, self.composition.send_rate, self.composition.send_burst,
+                                    self.composition.send_queue_size)
+        self.response_cache = SelectResponseCache(self.composition.response_cache_ttl,
+                                                  self.composition.response_cache_size)
+        self.peer_scoreboard = PeerScoreboard(self.composition.peer_scoreboard_file,
+                                              self.composition.search_exploration)
+        self.search_sessions: OrderedDict[str, SearchSession] = OrderedDict()
         self.next_remote_query_num = count().__next__  # generator of sequential numbers, for logging & debug purposes
 
         self.health_history: deque[HealthInfo] = deque(maxlen=1000)
+        self.reconciling_peers: set[bytes] = set()  # mids of the peers that we have seen reconciling health
+        self.pending_resolves: dict[Peer, set[bytes]] = {}
+
+        self.catch_up_checked_after = int(time.time()) - self.composition.catch_up_max_age
+        self.catch_up_cursor = b""
+        self.catch_up_pages = 0
+        self.catch_up_peer: Peer | None = None
+        self.catch_up_failed_peers: set[bytes] = set()
+        self.catch_up_finished = not self.composition.catch_up
 
         self.logger.info("Content Discovery Community initialized (peer mid %s)", hexlify(self.my_peer.mid))
-        self.register_task("gossip_random_torrents", self.gossip_random_torrents_health,
-                           interval=self.composition.random_torrent_interval)
+        self.reconcile_interval = self.composition.random_torrent_interval
+        if self.composition.health_reconciliation:
+            self.register_task("reconcile_torrents_health", self.reconcile_torrents_health_loop)
+            self.register_task("gossip_random_torrents", self.gossip_random_torrents_health,
+                               interval=self.composition.legacy_gossip_interval)
+        else:
+            self.register_task("gossip_random_torrents", self.gossip_random_torrents_health,
+                               interval=self.composition.random_torrent_interval)
 
     async def unload(self) -> None:
         """
-        Shut down the request cache.
+        Shut down the request cache and store the peer scores.
         """
+        for search_session in list(self.search_sessions.values()):
+            search_session.finish()
         await self.request_cache.shutdown()
+        self.send_queue.shutdown()
+        if self.composition.peer_scoreboard_file is not None:
+            self.peer_scoreboard.save()
         await super().unload()
 
     def sanitize_dict(self, parameters: dict[str, Any], decode: bool = True) -> None:
@@ -119,6 +219,11 @@ class ContentDiscoveryCommunity(Community):
             value = parameters.get(field)
             if value is not None:
                 parameters[field] = unhexlify(value.encode()) if decode else hexlify(value).decode()
+        for field in self.composition.binary_set_fields:
+            values = parameters.get(field)
+            if values is not None:
+                parameters[field] = ({unhexlify(value.encode()) for value in values} if decode
+                                     else [hexlify(value).decode() for value in values])
 
     def sanitize_query(self, query_dict: dict[str, Any], cap: int = 100) -> dict[str, Any]:
         """
@@ -155,20 +260,28 @@ class ContentDiscoveryCommunity(Community):
 
     def get_alive_checked_torrents(self) -> list[HealthInfo]:
         """
-        Get torrents that we know have seeders AND leechers.
+        Get torrents that we know have seeders.
         """
         if not self.composition.torrent_checker:
             return []
 
-        # Filter torrents that have seeders
-        return [health for health in self.composition.torrent_checker.torrents_checked.values() if
-                health.seeders > 0 and health.leechers >= 0]
+        return list(self.composition.torrent_checker.alive_torrents)
+
+    def get_gossip_peers(self) -> list[Peer]:
+        """
+        Get the peers to gossip random torrent health with: those that we have not seen reconciling health (yet).
+        """
+        peers = self.get_peers()
+        if not self.composition.health_reconciliation:
+            return peers
+        self.reconciling_peers.intersection_update(peer.mid for peer in peers)
+        return [peer for peer in peers if peer.mid not in self.reconciling_peers]
 
     def gossip_random_torrents_health(self) -> None:
         """
         Gossip random torrent health information to another peer.
         """
-        peers = self.get_peers()
+        peers = self.get_gossip_peers()
         if not peers or not self.composition.torrent_checker:
             return
 
@@ -178,6 +291,53 @@ class ContentDiscoveryCommunity(Community):
         for p in random.sample(peers, min(len(peers), 5)):
             self.ez_send(p, HealthRequestPayload(HEALTH_REQUEST_RANDOM))
 
+    def get_known_health(self) -> dict[bytes, int]:
+        """
+        Get the last check time of all torrents that we checked ourselves or recently heard about.
+        """
+        known = {health.infohash: health.last_check for health in self.health_history}
+        if self.composition.torrent_checker:
+            for health in self.composition.torrent_checker.torrents_checked.values():
+                known[health.infohash] = max(health.last_check, known.get(health.infohash, 0))
+        return known
+
+    def create_reconcile_request(self) -> HealthReconcilePayload:
+        """
+        Create a request for the torrent health that is missing from (or fresher than) the most recent health we know.
+        """
+        freshest = heapq.nlargest(self.composition.reconcile_set_size, self.get_known_health().items(),
+                                  key=itemgetter(1))
+        bloom_filter = BloomFilter.create([health_key(infohash, last_check) for infohash, last_check in freshest],
+                                          self.composition.reconcile_filter_size, random.getrandbits(32))
+        return HealthReconcilePayload(bloom_filter.functions, bloom_filter.salt, bloom_filter.to_bytes())
+
+    def reconcile_torrents_health(self) -> None:
+        """
+        Ask a random peer for the torrent health that we do not know yet.
+        """
+        peers = self.get_peers()
+        if peers:
+            self.ez_send(random.choice(peers), self.create_reconcile_request())
+
+    async def reconcile_torrents_health_loop(self) -> None:
+        """
+        Reconcile torrent health with other peers, as often as the previous rounds justify.
+        """
+        while True:
+            await sleep(self.reconcile_interval)
+            self.reconcile_torrents_health()
+
+    def adapt_reconcile_interval(self, novel: int) -> None:
+        """
+        Reconcile more often if the last round brought us new information and less often if it did not.
+        """
+        if novel:
+            self.reconcile_interval = max(self.composition.reconcile_min_interval, self.reconcile_interval / 2)
+        else:
+            self.reconcile_interval = min(self.composition.reconcile_max_interval, self.reconcile_interval * 1.5)
+        self.logger.debug("Reconciliation brought %d novel torrents, next round in %f seconds",
+                          novel, self.reconcile_interval)
+
     @db_session
     def process_torrents_health(self, health_list: list[HealthInfo]) -> set[bytes]:
         """
@@ -201,7 +361,23 @@ class ContentDiscoveryCommunity(Community):
                     HEALTH_REQUEST_POPULAR: self.get_popular_torrents}
 
         if handler := handlers.get(payload.request_type):
-            self.ez_send(peer, HealthPayload.create(payload.request_type, handler()))
+            self.send_queue.send(peer, HealthPayload.create(payload.request_type, handler()), PRIORITY_HIGH)
+
+    @lazy_wrapper(HealthReconcilePayload)
+    async def on_health_reconcile(self, peer: Peer, payload: HealthReconcilePayload) -> None:
+        """
+        Callback for when we receive a request for the torrent health that is not in a Bloom filter.
+        """
+        if (not 0 < payload.functions <= MAX_FUNCTIONS
+                or not 0 < len(payload.bloom) <= self.composition.reconcile_filter_size):
+            self.logger.warning("Ignoring health reconciliation request with an invalid Bloom filter")
+            return
+        self.reconciling_peers.add(peer.mid)
+        bloom_filter = BloomFilter(payload.bloom, payload.functions, payload.salt)
+        missing = [health for health in self.get_alive_checked_torrents()
+                   if health_key(health.infohash, health.last_check) not in bloom_filter]
+        missing.sort(key=lambda health: health.last_check, reverse=True)
+        self.send_queue.send(peer, HealthPayload.create(HEALTH_REQUEST_RECONCILE, missing), PRIORITY_HIGH)
 
     @lazy_wrapper(HealthPayload)
     async def on_health(self, peer: Peer, payload: HealthPayload) -> None:
@@ -212,35 +388,62 @@ class ContentDiscoveryCommunity(Community):
                           len(payload.torrents), payload.response_type)
 
         health_list = payload.get_health_info()
+        if payload.response_type == HEALTH_REQUEST_RECONCILE:
+            self.reconciling_peers.add(peer.mid)
+            known = self.get_known_health()
+            self.adapt_reconcile_interval(sum(1 for health in health_list
+                                              if health.last_check > known.get(health.infohash, -1)))
         to_resolve = self.process_torrents_health(health_list)
 
-        for health_info in health_list:
-            self.health_history.append(health_info)
-            # Get a single result per infohash to avoid duplicates
-            if health_info.infohash in to_resolve:
-                self.send_remote_select(peer=peer, infohash=health_info.infohash, last=1)
+        self.health_history.extend(health_list)
+        if to_resolve:
+            self.resolve_infohashes(peer, to_resolve)
+
+    def resolve_infohashes(self, peer: Peer, infohashes: set[bytes]) -> None:
+        """
+        Ask the given peer for the metadata of the given infohashes.
+
+        The infohashes are collected for a short while, so that they can be resolved with as few selects as possible.
+        """
+        pending = self.pending_resolves.setdefault(peer, set())
+        pending.update(infohashes)
+        task_name = f"resolve_infohashes_{hexlify(peer.mid).decode()}"
+        if len(pending) >= self.composition.max_resolve_batch:
+            self.cancel_pending_task(task_name)
+            self.flush_resolves(peer)
+        elif not self.is_pending_task_active(task_name):
+            self.register_task(task_name, self.flush_resolves, peer, delay=self.composition.resolve_window)
+
+    def flush_resolves(self, peer: Peer) -> None:
+        """
+        Send the selects for the infohashes that we collected for the given peer.
+        """
+        infohashes = sorted(self.pending_resolves.pop(peer, ()))
+        batch_size = self.composition.max_resolve_batch
+        for batch in (infohashes[i:i + batch_size] for i in range(0, len(infohashes), batch_size)):
+            if len(batch) == 1:
+                self.send_remote_select(peer=peer, infohash=batch[0], last=1)
+            else:
+                request = self.send_remote_select(peer=peer, infohash_set=batch, last=len(batch))
+                request.timeout_callback = self._on_batch_query_timeout
 
     def get_random_torrents(self) -> list[HealthInfo]:
         """
         Get torrent health info for torrents that were alive, last we know of.
         """
-        checked_and_alive = self.get_alive_checked_torrents()
-        if not checked_and_alive:
+        if not self.composition.torrent_checker:
             return []
 
-        num_torrents_to_send = min(self.composition.random_torrent_count, len(checked_and_alive))
-        return random.sample(checked_and_alive, num_torrents_to_send)
+        return self.composition.torrent_checker.alive_torrents.sample(self.composition.random_torrent_count)
 
     def get_popular_torrents(self) -> list[HealthInfo]:
         """
         Get torrent health info for the most popular torrent, last we know of.
         """
-        checked_and_alive = self.get_alive_checked_torrents()
-        if not checked_and_alive:
+        if not self.composition.torrent_checker:
             return []
 
-        num_torrents_to_send = min(self.composition.random_torrent_count, len(checked_and_alive))
-        return heapq.nlargest(num_torrents_to_send, checked_and_alive, key=lambda t: t.seeders + t.leechers)
+        return self.composition.torrent_checker.alive_torrents.most_popular(self.composition.random_torrent_count)
 
     def get_random_peers(self, sample_size: int | None = None) -> list[Peer]:
         """
@@ -251,12 +454,22 @@ class ContentDiscoveryCommunity(Community):
 
     def send_search_request(self, **kwargs) -> tuple[uuid.UUID, list[Peer]]:
         """
-        Send a remote query request to multiple random peers to search for some terms.
+        Send a remote query request to multiple peers to search for some terms.
+
+        Most peers are selected for their previous fast and useful responses, some are selected at random. Their
+        results are merged and ranked in a search session.
         """
         request_uuid = uuid.uuid4()
+        search_session = self.create_search_session(str(request_uuid), kwargs.get("txt_filter") or "")
 
         def notify_gui(request: SelectRequest, processing_results: list[ProcessingResult]) -> None:
+            search_session.add_results(hexlify(request.peer.mid).decode(), [r.data for r in processing_results])
             results = [r.data for r in processing_results if r.obj_state == ObjState.NEW_OBJECT]
+            if self.composition.torrent_checker:
+                # The user is looking at these torrents, so their health should be fresh
+                self.composition.torrent_checker.check_schedule.add_interest(
+                    unhexlify(r["infohash"]) for r in results if r.get("type") == REGULAR_TORRENT
+                )
 
             if self.composition.notifier:
                 self.composition.notifier.notify(Notification.remote_query_results,
@@ -265,13 +478,28 @@ class ContentDiscoveryCommunity(Community):
                                                  uuid=str(request_uuid),
                                                  peer=hexlify(request.peer.mid).decode())
 
-        peers_to_query = self.get_random_peers(self.composition.max_query_peers)
+        peers_to_query = self.peer_scoreboard.select(self.get_peers(), self.composition.max_query_peers)
 
         for p in peers_to_query:
             self.send_remote_select(p, **kwargs, processing_callback=notify_gui)
 
         return request_uuid, peers_to_query
 
+    def create_search_session(self, request_uuid: str, query: str) -> SearchSession:
+        """
+        Start merging and ranking the results of a new search, forgetting the oldest search if there are too many.
+        """
+        search_session = SearchSession(request_uuid, query,
+                                       update_interval=self.composition.search_update_interval,
+                                       deadline=self.composition.search_deadline,
+                                       target_results=self.composition.search_target_results,
+                                       good_rank=self.composition.search_good_rank)
+        self.search_sessions[request_uuid] = search_session
+        while len(self.search_sessions) > MAX_SEARCH_SESSIONS:
+            _, oldest = self.search_sessions.popitem(last=False)
+            oldest.finish()
+        return search_session
+
     @lazy_wrapper(VersionRequest)
     async def on_version_request(self, peer: Peer, _: VersionRequest) -> None:
         """
@@ -298,36 +526,44 @@ class ContentDiscoveryCommunity(Community):
         """
         request = SelectRequest(self.request_cache, kwargs, peer, processing_callback, self._on_query_timeout)
         self.request_cache.add(request)
+        self.peer_scoreboard.record_request(peer)
 
         self.logger.debug("Select to %s with (%s)", hexlify(peer.mid).decode(), str(kwargs))
-        self.ez_send(peer, RemoteSelectPayload(request.number, self.convert_to_json(kwargs).encode()))
+        parameters = kwargs
+        if self.composition.dictionary_compression:
+            parameters = {**kwargs, self.composition.compression_parameter: list(DICTIONARIES)}
+        self.ez_send(peer, RemoteSelectPayload(request.number, self.convert_to_json(parameters).encode()))
         return request
 
-    def should_limit_rate_for_query(self, sanitized_parameters: dict[str, Any]) -> bool:
+    def estimate_query_cost(self, sanitized_parameters: dict[str, Any]) -> float:
         """
-        Don't allow too many queries with potentially heavy database load.
+        Estimate the database load of the given query.
         """
-        return "txt_filter" in sanitized_parameters
+        if "txt_filter" in sanitized_parameters:
+            return QUERY_COST_TEXT
+        if "infohash" in sanitized_parameters or "infohash_set" in sanitized_parameters:
+            return QUERY_COST_LOOKUP
+        return QUERY_COST_BROWSE
 
-    async def process_rpc_query_rate_limited(self, sanitized_parameters: dict[str, Any]) -> list:
+    async def process_rpc_query_rate_limited(self, peer: Peer, sanitized_parameters: dict[str, Any]) -> list:
         """
-        Process the given query and return results.
+        Process the given query of the given peer, when it is its turn, and return results.
         """
         query_num = self.next_remote_query_num()
-        if self.remote_queries_in_progress and self.should_limit_rate_for_query(sanitized_parameters):
-            self.logger.warning("Ignore remote query %d as another one is already processing. The ignored query: %s",
-                                query_num, sanitized_parameters)
-            return []
-
-        self.logger.info("Process remote query %d: %s", query_num, sanitized_parameters)
-        self.remote_queries_in_progress += 1
         t = time.time()
-        try:
+
+        async def process() -> list:
+            self.logger.info("Process remote query %d: %s", query_num, sanitized_parameters)
             return await self.process_rpc_query(sanitized_parameters)
-        finally:
-            self.remote_queries_in_progress -= 1
-            self.logger.info("Remote query %d processed in %f seconds: %s",
-                             query_num, time.time() - t, sanitized_parameters)
+
+        results = await self.query_scheduler.run(peer.mid, self.estimate_query_cost(sanitized_parameters), process)
+        if results is None:
+            self.logger.warning("Ignore remote query %d as the scheduler rejected or dropped it: %s",
+                                query_num, sanitized_parameters)
+            return []
+        self.logger.info("Remote query %d processed in %f seconds: %s", query_num, time.time() - t,
+                         sanitized_parameters)
+        return results
 
     async def process_rpc_query(self, sanitized_parameters: dict[str, Any]) -> list:
         """
@@ -340,37 +576,88 @@ class ContentDiscoveryCommunity(Community):
         return await self.composition.metadata_store.get_entries_threaded(**sanitized_parameters)
 
 
-    def send_db_results(self, peer: Peer, request_payload_id: int, db_results: list[TorrentMetadata]) -> None:
+    def create_response_chunks(self, db_results: list[TorrentMetadata],
+                               dictionary_version: int | None = None) -> list[bytes]:
+        """
+        Compress the given results, with the given dictionary version (or LZ4), into chunks that fit in a packet.
+        """
+        # Every chunk holds at least one result, so no result is left out
+        chunks, _ = self.create_limited_response_chunks(db_results, len(db_results), dictionary_version)
+        return chunks
+
+    def create_limited_response_chunks(self, db_results: list[TorrentMetadata], max_chunks: int,
+                                       dictionary_version: int | None = None) -> tuple[list[bytes], int]:
         """
-        Send the given results to the given peer.
+        Compress the first of the given results into at most the given number of chunks that fit in a packet.
+
+        :return: the chunks and the number of results that they hold.
         """
         # Special case of empty results list - sending empty lz4 archive
         if len(db_results) == 0:
-            self.ez_send(peer, SelectResponsePayload(request_payload_id, LZ4_EMPTY_ARCHIVE))
-            return
+            return [LZ4_EMPTY_ARCHIVE], 0
 
+        chunks: list[bytes] = []
         index = 0
-        while index < len(db_results):
+        while index < len(db_results) and len(chunks) < max_chunks:
             transfer_size = self.composition.maximum_payload_size
-            data, index = entries_to_chunk(db_results, transfer_size, start_index=index, include_health=True)
-            payload = SelectResponsePayload(request_payload_id, data)
-            self.ez_send(peer, payload)
+            data, index = entries_to_chunk(db_results, transfer_size, start_index=index, include_health=True,
+                                           dictionary_version=dictionary_version)
+            chunks.append(data)
+        return chunks, index
+
+    def send_response_chunks(self, peer: Peer, request_payload_id: int, chunks: list[bytes]) -> None:
+        """
+        Send the given response chunks to the given peer, single-packet responses before bulk responses.
+        """
+        priority = PRIORITY_HIGH if len(chunks) == 1 else PRIORITY_BULK
+        for chunk in chunks:
+            self.send_queue.send(peer, SelectResponsePayload(request_payload_id, chunk), priority)
+
+    def send_db_results(self, peer: Peer, request_payload_id: int, db_results: list[TorrentMetadata],
+                        dictionary_version: int | None = None) -> None:
+        """
+        Send the given results to the given peer, compressed with the given dictionary version (or LZ4).
+        """
+        self.send_response_chunks(peer, request_payload_id, self.create_response_chunks(db_results, dictionary_version))
 
     @lazy_wrapper(RemoteSelectPayload)
     async def on_remote_select(self, peer: Peer, request_payload: RemoteSelectPayload) -> None:
         """
         Callback for when another peer queries us.
+
+        Identical queries are answered from the response cache, as long as the database did not change.
         """
         try:
             sanitized_parameters = self.parse_parameters(request_payload.json)
+            dictionary_version = None
+            if self.composition.dictionary_compression:
+                dictionary_version = select_dictionary_version(
+                    sanitized_parameters.get(self.composition.compression_parameter)
+                )
+            sanitized_parameters.pop(self.composition.compression_parameter, None)
             # Drop selects with deprecated queries
             if any(param in sanitized_parameters for param in self.composition.deprecated_parameters):
                 self.logger.warning("Remote select with deprecated parameters: %s", str(sanitized_parameters))
-                self.ez_send(peer, SelectResponsePayload(request_payload.id, LZ4_EMPTY_ARCHIVE))
+                self.send_response_chunks(peer, request_payload.id, [LZ4_EMPTY_ARCHIVE])
                 return
-            db_results = await self.process_rpc_query_rate_limited(sanitized_parameters)
 
-            self.send_db_results(peer, request_payload.id, db_results)
+            key = query_key(sanitized_parameters, dictionary_version)
+            generation = self.composition.metadata_store.write_generation
+            chunks = self.response_cache.get(key, generation)
+            if chunks is not None:
+                # Cached answers are cheap, but should not let a peer replay a query without limit
+                if not self.query_scheduler.charge(peer.mid, self.estimate_query_cost(sanitized_parameters)):
+                    self.logger.warning("Ignore cached remote query as the scheduler rejected it: %s",
+                                        sanitized_parameters)
+                    chunks = [LZ4_EMPTY_ARCHIVE]
+            else:
+                db_results = await self.process_rpc_query_rate_limited(peer, sanitized_parameters)
+                chunks = self.create_response_chunks(db_results, dictionary_version)
+                # Results that were read while the database changed may already be outdated.
+                if db_results and generation == self.composition.metadata_store.write_generation:
+                    self.response_cache.put(key, chunks, generation)
+
+            self.send_response_chunks(peer, request_payload.id, chunks)
         except (OperationalError, TypeError, ValueError) as error:
             self.logger.exception("Remote select error: %s. Request content: %s",
                                   str(error), repr(request_payload.json))
@@ -407,6 +694,12 @@ class ContentDiscoveryCommunity(Community):
         )
         self.logger.debug("Response result: %s", str(processing_results))
 
+        self.peer_scoreboard.record_packet(
+            peer,
+            sum(1 for r in processing_results if r.obj_state == ObjState.NEW_OBJECT),
+            None if request.peer_responded else time.time() - request.created
+        )
+
         if isinstance(request, SelectRequest) and request.processing_callback:
             request.processing_callback(request, processing_results)
 
@@ -421,6 +714,7 @@ class ContentDiscoveryCommunity(Community):
         Remove a peer if it failed to respond to our select request.
         """
         if not request_cache.peer_responded:
+            self.peer_scoreboard.record_timeout(request_cache.peer)
             self.logger.debug(
                 "Remote query timeout, deleting peer: %s %s %s",
                 str(request_cache.peer.address),
@@ -429,6 +723,123 @@ class ContentDiscoveryCommunity(Community):
             )
             self.network.remove_peer(request_cache.peer)
 
+    def _on_batch_query_timeout(self, request_cache: SelectRequest) -> None:
+        """
+        Resolve the infohashes of a batch one by one if the peer did not respond, it may not support batches.
+        """
+        if not request_cache.peer_responded:
+            self.peer_scoreboard.record_timeout(request_cache.peer)
+            self.logger.debug("Batch query timeout, resolving %d infohashes separately: %s",
+                              len(request_cache.request_kwargs["infohash_set"]), str(request_cache.peer.address))
+            for infohash in request_cache.request_kwargs["infohash_set"]:
+                self.send_remote_select(peer=request_cache.peer, infohash=infohash, last=1)
+
+    def introduction_response_callback(self, peer: Peer, dist: GlobalTimeDistributionPayload,
+                                       payload: IntroductionResponsePayload | NewIntroductionResponsePayload) -> None:
+        """
+        Start catching up with the first peer that we meet, if we did not catch up yet.
+        """
+        self.start_catch_up()
+
+    def start_catch_up(self) -> None:
+        """
+        Ask a random peer that has not failed us yet for the next catch-up page, unless a catch-up is running.
+        """
+        if self.catch_up_finished or self.catch_up_peer is not None:
+            return
+        candidates = [peer for peer in self.get_peers() if peer.mid not in self.catch_up_failed_peers]
+        if not candidates:
+            return
+        self.catch_up_peer = random.choice(candidates)
+        self.request_catch_up_page(self.catch_up_peer)
+
+    def request_catch_up_page(self, peer: Peer) -> None:
+        """
+        Ask the given peer for the catch-up page after our current cursor.
+        """
+        request = CatchUpRequest(self.request_cache, peer, self.catch_up_cursor, self._on_catch_up_timeout)
+        self.request_cache.add(request)
+        self.logger.debug("Catch-up page %d request to %s", self.catch_up_pages, hexlify(peer.mid).decode())
+        dictionaries = bytes(DICTIONARIES) if self.composition.dictionary_compression else b""
+        self.ez_send(peer, CatchUpRequestPayload(request.number, self.catch_up_checked_after,
+                                                 self.composition.catch_up_page_size, self.catch_up_cursor,
+                                                 dictionaries))
+
+    @lazy_wrapper(CatchUpRequestPayload)
+    async def on_catch_up_request(self, peer: Peer, payload: CatchUpRequestPayload) -> None:
+        """
+        Callback for when a peer asks us for a catch-up page.
+        """
+        if payload.cursor and len(payload.cursor) != CATCH_UP_CURSOR.size:
+            self.logger.warning("Ignoring catch-up request with an invalid cursor from %s", str(peer.address))
+            return
+        cursor = CATCH_UP_CURSOR.unpack(payload.cursor) if payload.cursor else None
+        count = min(payload.count, self.composition.catch_up_page_size)
+
+        async def query() -> tuple[list[TorrentMetadata], tuple[int, int] | None]:
+            return await self.composition.metadata_store.get_catch_up_entries_threaded(payload.checked_after, count,
+                                                                                       cursor)
+
+        page = await self.query_scheduler.run(peer.mid, QUERY_COST_BROWSE, query)
+        if page is None:
+            self.logger.debug("Ignoring catch-up request of %s, as the scheduler rejected or dropped it",
+                              str(peer.address))
+            return
+        entries, next_cursor = page
+        dictionary_version = None
+        if self.composition.dictionary_compression:
+            dictionary_version = select_dictionary_version(list(payload.dictionaries))
+        chunks, sent = self.create_limited_response_chunks(entries, self.composition.catch_up_max_packets,
+                                                           dictionary_version)
+        if sent < len(entries):
+            # The next page starts after the last entry that fit in our packets, so that the others are not skipped
+            last = entries[sent - 1]
+            next_cursor = (cast("TorrentState", last.health).seeders, cast("int", last.rowid))
+        next_cursor_bytes = CATCH_UP_CURSOR.pack(*next_cursor) if next_cursor is not None else b""
+        for index, chunk in enumerate(chunks):
+            self.send_queue.send(peer, CatchUpResponsePayload(payload.id, index, len(chunks), next_cursor_bytes, chunk))
+
+    @lazy_wrapper(CatchUpResponsePayload)
+    async def on_catch_up_response(self, peer: Peer, payload: CatchUpResponsePayload) -> None:
+        """
+        Callback for when we receive a packet of a catch-up page: write it and ask for the next page once complete.
+        """
+        prefix = "catch-up-" + hexlify(peer.mid).decode()
+        if not self.request_cache.has(prefix, payload.id):
+            return
+        request = cast("CatchUpRequest", self.request_cache.get(prefix, payload.id))
+        if (payload.total > self.composition.catch_up_max_packets or payload.index >= payload.total
+                or request.total not in (None, payload.total) or payload.index in request.received
+                or (payload.cursor and len(payload.cursor) != CATCH_UP_CURSOR.size)):
+            return
+        request.total = payload.total
+        request.received.add(payload.index)
+        if request.complete:
+            self.request_cache.pop(prefix, payload.id)
+
+        await self.composition.metadata_store.process_compressed_mdblob_threaded(payload.raw_blob)
+
+        if request.complete:
+            self.catch_up_pages += 1
+            self.catch_up_cursor = payload.cursor
+            if not payload.cursor or self.catch_up_pages >= self.composition.catch_up_max_pages:
+                self.logger.info("Caught up after %d pages", self.catch_up_pages)
+                self.catch_up_finished = True
+                self.catch_up_peer = None
+            else:
+                self.register_task("request_catch_up_page", self.request_catch_up_page, peer,
+                                   delay=self.composition.catch_up_page_interval)
+
+    def _on_catch_up_timeout(self, request_cache: CatchUpRequest) -> None:
+        """
+        Continue the catch-up with another peer, from the start of the page that did not complete.
+        """
+        self.logger.debug("Catch-up page timeout, received %d of %s packets from %s", len(request_cache.received),
+                          str(request_cache.total), str(request_cache.peer.address))
+        self.catch_up_failed_peers.add(request_cache.peer.mid)
+        self.catch_up_peer = None
+        self.start_catch_up()
+
     def send_ping(self, peer: Peer) -> None:
         """
         Send a ping to a peer to keep it alive.
@@ -20,6 +20,55 @@ class HealthRequestPayload(VariablePayload):
     request_type: int
 
 
+@vp_compile
+class HealthReconcilePayload(VariablePayload):
+    """
+    A request to be sent the health information of torrents that are not in a Bloom filter.
+    """
+
+    msg_id = 5
+    format_list = ["B", "I", "varlenH"]
+    names = ["functions", "salt", "bloom"]
+
+    functions: int
+    salt: int
+    bloom: bytes
+
+
+@vp_compile
+class CatchUpRequestPayload(VariablePayload):
+    """
+    A request to be sent a page of the torrents that were checked after a given time, the most popular first.
+    """
+
+    msg_id = 6
+    format_list = ["I", "Q", "H", "varlenH", "varlenH"]
+    names = ["id", "checked_after", "count", "cursor", "dictionaries"]
+
+    id: int
+    checked_after: int
+    count: int
+    cursor: bytes
+    dictionaries: bytes
+
+
+@vp_compile
+class CatchUpResponsePayload(VariablePayload):
+    """
+    A single packet of a page of torrents, with the cursor of the next page (empty for the last page).
+    """
+
+    msg_id = 7
+    format_list = ["I", "H", "H", "varlenH", "raw"]
+    names = ["id", "index", "total", "cursor", "raw_blob"]
+
+    id: int
+    index: int
+    total: int
+    cursor: bytes
+    raw_blob: bytes
+
+
 @vp_compile
 class HealthFormat(VariablePayload):
     """
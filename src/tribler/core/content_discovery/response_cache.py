@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+import time
+from binascii import hexlify
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, TypedDict
+
+
+class ResponseCacheStatistics(TypedDict):
+    """
+    The statistics of a select response cache.
+    """
+
+    entries: int
+    hits: int
+    misses: int
+    expired: int
+    invalidated: int
+
+
+@dataclass
+class CachedResponse:
+    """
+    The response chunks of a single query, built when the database was at the given write generation.
+    """
+
+    chunks: list[bytes]
+    generation: int
+    expires: float
+
+
+def query_key(sanitized_parameters: dict[str, Any], dictionary_version: int | None) -> str:
+    """
+    Get a canonical representation of a sanitized query and the compression it should be answered with.
+    """
+    def encode(value: Any) -> Any:  # noqa: ANN401
+        if isinstance(value, bytes):
+            return hexlify(value).decode()
+        if isinstance(value, set | frozenset):
+            return sorted(encode(item) for item in value)
+        return value
+
+    return json.dumps([dictionary_version, {key: encode(value) for key, value in sanitized_parameters.items()}],
+                      sort_keys=True, default=str)
+
+
+class SelectResponseCache:
+    """
+    Remember the (compressed) response chunks of recent remote queries, so that identical queries of other peers
+    do not have to hit the database again.
+
+    An entry is only valid for a short time and only as long as no torrents were added or changed since it was
+    created. Health updates do not invalidate entries: the health in a cached response is at most ``ttl`` seconds
+    old. The least recently used entries are dropped when the cache is full.
+    """
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        """
+        Create a new cache.
+
+        :param ttl: the number of seconds that an entry is valid.
+        :param max_entries: the maximum number of entries to keep.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, CachedResponse] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.invalidated = 0
+
+    def get(self, key: str, generation: int) -> list[bytes] | None:
+        """
+        Get the cached response chunks for the given query key, if they are still valid.
+
+        :param key: the query key, see ``query_key``.
+        :param generation: the current write generation of the database.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.generation != generation:
+            self.invalidated += 1
+        elif entry.expires < time.monotonic():
+            self.expired += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry.chunks
+        del self.entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: str, chunks: list[bytes], generation: int) -> None:
+        """
+        Store the response chunks for the given query key.
+
+        :param key: the query key, see ``query_key``.
+        :param chunks: the response chunks.
+        :param generation: the write generation of the database before the query was run.
+        """
+        if self.max_entries <= 0 or self.ttl <= 0:
+            return
+        self.entries[key] = CachedResponse(chunks, generation, time.monotonic() + self.ttl)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get_statistics(self) -> ResponseCacheStatistics:
+        """
+        Get the current size and counters of this cache.
+        """
+        return ResponseCacheStatistics(
+            entries=len(self.entries),
+            hits=self.hits,
+            misses=self.misses,
+            expired=self.expired,
+            invalidated=self.invalidated
+        )
@@ -1,17 +1,24 @@
 from __future__ import annotations
 
+import json
 from binascii import hexlify
 from typing import TYPE_CHECKING
 
-from aiohttp import web
+from aiohttp import ClientConnectionResetError, web
 from aiohttp_apispec import docs, querystring_schema
 from ipv8.REST.schema import schema
-from marshmallow.fields import Integer, List, String
+from marshmallow.fields import Boolean, Dict, Integer, List, String
 
 from tribler.core.database.queries import to_fts_query
 from tribler.core.database.restapi.database_endpoint import DatabaseEndpoint
 from tribler.core.database.restapi.schema import MetadataParameters
-from tribler.core.restapi.rest_endpoint import HTTP_BAD_REQUEST, MAX_REQUEST_SIZE, RESTEndpoint, RESTResponse
+from tribler.core.restapi.rest_endpoint import (
+    HTTP_BAD_REQUEST,
+    HTTP_NOT_FOUND,
+    MAX_REQUEST_SIZE,
+    RESTEndpoint,
+    RESTResponse,
+)
 
 if TYPE_CHECKING:
     from tribler.core.content_discovery.community import ContentDiscoveryCommunity
@@ -46,7 +53,8 @@ class SearchEndpoint(RESTEndpoint):
         self.content_discovery_community: ContentDiscoveryCommunity | None = None
         self.required_components = ("content_discovery_community", )
 
-        self.app.add_routes([web.put("/remote", self.remote_search)])
+        self.app.add_routes([web.put("/remote", self.remote_search),
+                             web.get("/remote/{request_uuid}/results", self.stream_results)])
 
     @docs(
         tags=["Metadata"],
@@ -96,3 +104,66 @@ class SearchEndpoint(RESTEndpoint):
         peers_mid_list = [hexlify(p.mid).decode() for p in peers_list]
 
         return RESTResponse({"request_uuid": str(request_uuid), "peers": peers_mid_list})
+
+    @docs(
+        tags=["Metadata"],
+        summary="Stream the merged and ranked results of a remote search.",
+        parameters=[{
+            "in": "query",
+            "name": "format",
+            "description": 'The stream format: "ndjson" (default) or "sse" (server-sent events).',
+            "type": "string",
+            "required": False
+        }],
+        responses={
+            200: {
+                "schema": schema(SearchUpdate={"uuid": String(), "query": String(), "results": List(Dict()),
+                                               "peers": Integer(), "finished": Boolean()}),
+            },
+            HTTP_NOT_FOUND: {
+                "schema": schema(SearchNotFoundResponse={"error": schema(ErrorResponse={"handled": Boolean(),
+                                                                                        "message": String()})})
+            }
+        },
+    )
+    async def stream_results(self, request: RequestType) -> web.StreamResponse:
+        """
+        Stream the merged and ranked results of a remote search, until the search finishes.
+
+        Every update contains all results so far, the best ranked first. Updates are sent at a bounded rate.
+
+            **Example request**:
+
+                .. sourcecode:: none
+
+                    curl -X GET http://localhost:20100/search/remote/268560c0-3f28-4e6e-9d85-d5ccb0269693/results
+        """
+        search_session = request.context[0].search_sessions.get(request.match_info["request_uuid"])
+        if search_session is None:
+            return RESTResponse({"error": {
+                                    "handled": True,
+                                    "message": "this search does not exist"
+                                }}, status=HTTP_NOT_FOUND)
+
+        server_sent_events = request.query.get("format") == "sse"
+        response = web.StreamResponse(status=200,
+                                      reason="OK",
+                                      headers={"Content-Type": ("text/event-stream" if server_sent_events
+                                                                else "application/x-ndjson"),
+                                               "Cache-Control": "no-cache"})
+        await response.prepare(request)
+
+        updates = search_session.subscribe()
+        try:
+            while True:
+                update = await updates.get()
+                data = json.dumps(update).encode()
+                await response.write(b"event: search_results\ndata: " + data + b"\n\n" if server_sent_events
+                                     else data + b"\n")
+                if update["finished"]:
+                    break
+        except ClientConnectionResetError:
+            self._logger.info("Search result stream was closed by the client")
+        finally:
+            search_session.unsubscribe(updates)
+        return response
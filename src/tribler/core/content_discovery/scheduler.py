@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import logging
+import time
+from asyncio import CancelledError, Future, TimerHandle, get_running_loop
+from binascii import hexlify
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, TypedDict, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+T = TypeVar("T")
+
+MAX_TRACKED_PEERS = 1000  # Maximum number of peers to keep a token bucket and rejection counter for
+
+
+class SchedulerStatistics(TypedDict):
+    """
+    The statistics of a query scheduler.
+    """
+
+    workers: int
+    running: int
+    queued: int
+    accepted: int
+    completed: int
+    expired: int
+    rejected: int
+    rejected_peers: dict[str, int]
+
+
+class TokenBucket:
+    """
+    A token bucket that is refilled at a fixed rate, up to its capacity.
+    """
+
+    def __init__(self, capacity: float, rate: float, now: float) -> None:
+        """
+        Create a new (full) token bucket.
+        """
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = now
+
+    def refill(self, now: float) -> None:
+        """
+        Add the tokens that have accumulated since the last refill.
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def consume(self, amount: float, now: float) -> bool:
+        """
+        Take the given amount of tokens out of the bucket, if there are enough.
+        """
+        self.refill(now)
+        if self.tokens < amount:
+            return False
+        self.tokens -= amount
+        return True
+
+    def is_full(self, now: float) -> bool:
+        """
+        Check if the bucket has refilled completely, i.e., if forgetting about it changes nothing.
+        """
+        self.refill(now)
+        return self.tokens >= self.capacity
+
+
+@dataclass(eq=False)
+class QueuedQuery:
+    """
+    A query that is waiting for a free worker.
+    """
+
+    peer_mid: bytes
+    future: Future[bool]
+    timer: TimerHandle | None = None
+
+
+class QueryScheduler:
+    """
+    Run queries of other peers with bounded concurrency.
+
+    Every peer has a token bucket that limits the cost of the queries that it can have us run. Queries that cannot
+    be run right away are queued and peers with queued queries are served in a round-robin fashion. Queued queries
+    that do not get a worker before their deadline are dropped.
+    """
+
+    def __init__(self, workers: int, queue_size: int, max_wait: float, peer_budget: float,
+                 peer_refill_rate: float) -> None:
+        """
+        Create a new scheduler.
+
+        :param workers: the maximum number of queries to run concurrently.
+        :param queue_size: the maximum number of queries to queue.
+        :param max_wait: the maximum number of seconds that a query may be queued.
+        :param peer_budget: the maximum query cost that a single peer can spend in a burst.
+        :param peer_refill_rate: the query cost per second that a single peer can spend in the long run.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.workers = workers
+        self.queue_size = queue_size
+        self.max_wait = max_wait
+        self.peer_budget = peer_budget
+        self.peer_refill_rate = peer_refill_rate
+
+        self.running = 0
+        self.queued = 0
+        self.queues: OrderedDict[bytes, deque[QueuedQuery]] = OrderedDict()
+        self.buckets: OrderedDict[bytes, TokenBucket] = OrderedDict()
+
+        self.accepted = 0
+        self.completed = 0
+        self.expired = 0
+        self.rejected = 0
+        self.rejected_peers: Counter[bytes] = Counter()
+
+    def _get_bucket(self, peer_mid: bytes, now: float) -> TokenBucket:
+        """
+        Get the token bucket of the given peer, creating it if it does not exist yet.
+        """
+        bucket = self.buckets.get(peer_mid)
+        if bucket is None:
+            bucket = self.buckets[peer_mid] = TokenBucket(self.peer_budget, self.peer_refill_rate, now)
+            self._forget_idle_peers(now)
+        else:
+            self.buckets.move_to_end(peer_mid)
+        return bucket
+
+    def _admit(self, peer_mid: bytes, cost: float) -> bool:
+        """
+        Check if a peer can afford a query of the given cost and if there is room for it.
+        """
+        now = time.monotonic()
+        bucket = self._get_bucket(peer_mid, now)
+        if self.running >= self.workers and self.queued >= self.queue_size:
+            return False
+        return bucket.consume(cost, now)
+
+    def _reject(self, peer_mid: bytes, cost: float) -> None:
+        """
+        Count a query that a peer could not afford or that did not fit.
+        """
+        self.rejected += 1
+        self.rejected_peers[peer_mid] += 1
+        self.logger.debug("Rejected query of %s with cost %f", hexlify(peer_mid).decode(), cost)
+
+    def charge(self, peer_mid: bytes, cost: float) -> bool:
+        """
+        Charge a peer for a query that we answer without running it, for example from a cache.
+
+        :param peer_mid: the mid of the peer that sent the query.
+        :param cost: the (estimated) cost of the query, in the same units as the peer budget.
+        :return: whether the peer could afford the query.
+        """
+        now = time.monotonic()
+        if not self._get_bucket(peer_mid, now).consume(cost, now):
+            self._reject(peer_mid, cost)
+            return False
+        return True
+
+    def _forget_idle_peers(self, now: float) -> None:
+        """
+        Drop the oldest token buckets and rejection counters if we track too many peers.
+        """
+        while len(self.buckets) > MAX_TRACKED_PEERS:
+            peer_mid, bucket = next(iter(self.buckets.items()))
+            if not bucket.is_full(now):
+                # The least recently seen peer still has a deficit: we cannot forget any bucket yet.
+                break
+            del self.buckets[peer_mid]
+        if len(self.rejected_peers) > MAX_TRACKED_PEERS:
+            self.rejected_peers = Counter(dict(self.rejected_peers.most_common(MAX_TRACKED_PEERS // 2)))
+
+    def _enqueue(self, peer_mid: bytes) -> QueuedQuery:
+        """
+        Queue a query for the given peer.
+        """
+        query = QueuedQuery(peer_mid, get_running_loop().create_future())
+        query.timer = get_running_loop().call_later(self.max_wait, self._expire, query)
+        self.queues.setdefault(peer_mid, deque()).append(query)
+        self.queued += 1
+        return query
+
+    def _dequeue(self, query: QueuedQuery) -> None:
+        """
+        Remove a query from the queue of its peer.
+        """
+        if query.timer is not None:
+            query.timer.cancel()
+        queue = self.queues[query.peer_mid]
+        queue.remove(query)
+        if not queue:
+            del self.queues[query.peer_mid]
+        self.queued -= 1
+
+    def _expire(self, query: QueuedQuery) -> None:
+        """
+        Drop a query that did not get a worker in time.
+        """
+        self._dequeue(query)
+        self.expired += 1
+        query.future.set_result(False)
+
+    def _release(self) -> None:
+        """
+        Free up a worker and hand it to the next peer in line.
+        """
+        self.running -= 1
+        if self.queues:
+            peer_mid, queue = next(iter(self.queues.items()))
+            query = queue[0]
+            self._dequeue(query)
+            if queue:
+                self.queues.move_to_end(peer_mid)
+            # Reserve the worker for the queued query, so that no newly arriving query can take it first.
+            self.running += 1
+            query.future.set_result(True)
+
+    async def run(self, peer_mid: bytes, cost: float, query: Callable[[], Awaitable[T]]) -> T | None:
+        """
+        Run the given query on behalf of the given peer, when it is its turn.
+
+        :param peer_mid: the mid of the peer that wants the query to be run.
+        :param cost: the (estimated) cost of the query, in the same units as the peer budget.
+        :param query: the function that creates the query coroutine.
+        :return: the result of the query or None if it was rejected or it expired.
+        """
+        if not self._admit(peer_mid, cost):
+            self._reject(peer_mid, cost)
+            return None
+        self.accepted += 1
+
+        if self.running < self.workers and not self.queues:
+            self.running += 1
+        else:
+            queued = self._enqueue(peer_mid)
+            try:
+                if not await queued.future:
+                    self.logger.debug("Dropped query of %s after %f seconds", hexlify(peer_mid).decode(),
+                                      self.max_wait)
+                    return None
+            except CancelledError:
+                # Cancelling the awaiting task also cancels the future, unless it already had a result.
+                if queued.future.cancelled():
+                    self._dequeue(queued)
+                elif queued.future.result():
+                    self._release()
+                raise
+
+        try:
+            return await query()
+        finally:
+            self.completed += 1
+            self._release()
+
+    def get_statistics(self) -> SchedulerStatistics:
+        """
+        Get the current state and counters of this scheduler.
+        """
+        return SchedulerStatistics(
+            workers=self.workers,
+            running=self.running,
+            queued=self.queued,
+            accepted=self.accepted,
+            completed=self.completed,
+            expired=self.expired,
+            rejected=self.rejected,
+            rejected_peers={hexlify(peer_mid).decode(): count
+                            for peer_mid, count in self.rejected_peers.most_common(10)}
+        )
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import random
+import time
+from binascii import hexlify
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from ipv8.peer import Peer
+
+MAX_SCORED_PEERS = 1000  # Maximum number of peers to keep (and store) the score of
+SMOOTHING = 0.3  # The weight of a new latency or reliability sample
+LATENCY_OFFSET = 0.5  # seconds, added to the latency so that an extremely fast peer does not dominate the score
+LATENCY_PRIOR = 10.0  # seconds, the timeout of a select request: the latency of peers that never answered
+
+
+@dataclass
+class PeerScore:
+    """
+    The select request statistics of a single peer.
+    """
+
+    requests: int = 0
+    responses: int = 0
+    timeouts: int = 0
+    packets: int = 0
+    new_objects: int = 0
+    latency: float = LATENCY_PRIOR  # seconds until the first response packet, moving average
+    reliability: float = 1.0  # fraction of requests that were answered, moving average
+    last_seen: float = 0.0
+
+    @property
+    def yield_per_request(self) -> float:
+        """
+        The average number of new objects that a request to this peer brought us.
+        """
+        return self.new_objects / max(self.requests, 1)
+
+    @property
+    def score(self) -> float:
+        """
+        The expected number of new objects per second of waiting: higher is better.
+        """
+        return self.reliability * (1 + self.yield_per_request) / (self.latency + LATENCY_OFFSET)
+
+
+class PeerScoreboard:
+    """
+    Keep track of how fast and how useful the responses of peers to our select requests are.
+    """
+
+    def __init__(self, path: Path | None = None, exploration: float = 0.25) -> None:
+        """
+        Create a new scoreboard, loading the scores of an earlier session if they exist.
+
+        :param path: the file to store the scores in, or None to not store them.
+        :param exploration: the fraction of peers to select at random, to discover new good peers.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.path = path
+        self.exploration = exploration
+        self.scores: dict[bytes, PeerScore] = {}
+        if path is not None:
+            self.load()
+
+    def get(self, peer: Peer) -> PeerScore:
+        """
+        Get the score of the given peer, creating it if it does not exist yet.
+        """
+        score = self.scores.get(peer.mid)
+        if score is None:
+            if len(self.scores) >= MAX_SCORED_PEERS:
+                del self.scores[min(self.scores, key=lambda mid: self.scores[mid].last_seen)]
+            score = self.scores[peer.mid] = PeerScore()
+        score.last_seen = time.time()
+        return score
+
+    def record_request(self, peer: Peer) -> None:
+        """
+        Register that we sent a select request to the given peer.
+        """
+        self.get(peer).requests += 1
+
+    def record_packet(self, peer: Peer, new_objects: int, latency: float | None = None) -> None:
+        """
+        Register a response packet of the given peer.
+
+        :param peer: the peer that responded.
+        :param new_objects: the number of objects in the packet that we did not know before.
+        :param latency: the seconds between the request and this packet, only for the first packet of a request.
+        """
+        score = self.get(peer)
+        score.packets += 1
+        score.new_objects += new_objects
+        if latency is not None:
+            score.responses += 1
+            first = score.responses == 1 and not score.timeouts
+            score.latency = latency if first else (1 - SMOOTHING) * score.latency + SMOOTHING * latency
+            score.reliability = (1 - SMOOTHING) * score.reliability + SMOOTHING
+
+    def record_timeout(self, peer: Peer) -> None:
+        """
+        Register that the given peer did not respond to a select request.
+
+        A timeout counts as a latency sample of the full request timeout.
+        """
+        score = self.get(peer)
+        score.timeouts += 1
+        score.reliability *= 1 - SMOOTHING
+        score.latency = (1 - SMOOTHING) * score.latency + SMOOTHING * LATENCY_PRIOR
+
+    def select(self, peers: list[Peer], count: int) -> list[Peer]:
+        """
+        Select the given number of peers, mostly the best scoring ones and some at random.
+        """
+        count = min(count, len(peers))
+        exploit = count - math.ceil(count * self.exploration)
+        known = sorted((peer for peer in peers if peer.mid in self.scores),
+                       key=lambda peer: self.scores[peer.mid].score, reverse=True)
+        selected = known[:exploit]
+        selected_set = set(selected)
+        remaining = [peer for peer in peers if peer not in selected_set]
+        return selected + random.sample(remaining, count - len(selected))
+
+    def load(self) -> None:
+        """
+        Load the scores from our file, if it exists.
+        """
+        if self.path is None:
+            return
+        try:
+            with open(self.path) as score_file:
+                stored = json.load(score_file)
+            self.scores = {bytes.fromhex(mid): PeerScore(**score) for mid, score in stored.items()}
+        except FileNotFoundError:
+            return
+        except (OSError, TypeError, ValueError, AttributeError) as e:
+            self.logger.warning("Could not load peer scores: %s: %s", e.__class__.__name__, str(e))
+
+    def save(self) -> None:
+        """
+        Write the scores to our file.
+        """
+        if self.path is None:
+            return
+        stored = {hexlify(mid).decode(): asdict(score) for mid, score in self.scores.items()}
+        try:
+            with open(self.path, "w") as score_file:
+                json.dump(stored, score_file)
+        except OSError as e:
+            self.logger.warning("Could not save peer scores: %s: %s", e.__class__.__name__, str(e))
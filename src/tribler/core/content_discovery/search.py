@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import logging
+import time
+from asyncio import Queue, TimerHandle, get_running_loop
+from typing import Any, TypedDict
+
+from tribler.core.database.ranks import item_rank
+
+MAX_SEARCH_SESSIONS = 16  # Maximum number of (recent) search sessions to keep the results of
+
+
+class SearchUpdate(TypedDict):
+    """
+    The ranked results of a search session, up to now.
+    """
+
+    uuid: str
+    query: str
+    results: list[dict[str, Any]]
+    peers: int
+    finished: bool
+
+
+class SearchSession:
+    """
+    Merge the results that peers return for a single remote search and rank them.
+
+    Updates are sent to subscribers at most once per update interval. The search finishes when enough good results
+    are found or when the deadline passes, whichever comes first.
+    """
+
+    def __init__(self, uuid: str, query: str, *, update_interval: float = 0.5, deadline: float = 10,
+                 target_results: int = 50, good_rank: float = 0.5) -> None:
+        """
+        Create a new search session.
+
+        :param uuid: the identifier of the search.
+        :param query: the (full-text search) query that was sent to the peers.
+        :param update_interval: the minimum number of seconds between two updates.
+        :param deadline: the number of seconds after which the search finishes.
+        :param target_results: the number of good results after which the search finishes.
+        :param good_rank: the minimum rank of a good result.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.uuid = uuid
+        self.query = query
+        self.update_interval = update_interval
+        self.target_results = target_results
+        self.good_rank = good_rank
+
+        self.results: dict[str, dict[str, Any]] = {}
+        self.ranks: dict[str, float] = {}
+        self.peers: set[str] = set()
+        self.good_results = 0
+        self.finished = False
+
+        self.subscribers: list[Queue[SearchUpdate]] = []
+        self.last_update = 0.0
+        self.update_handle: TimerHandle | None = None
+        self.deadline_handle: TimerHandle | None = get_running_loop().call_later(deadline, self.finish)
+
+    def add_results(self, peer_mid: str, results: list[dict[str, Any]]) -> None:
+        """
+        Merge the results of a response packet of the given peer.
+        """
+        if self.finished:
+            return
+        self.peers.add(peer_mid)
+        for result in results:
+            infohash = result.get("infohash")
+            if infohash is None or "name" not in result:
+                continue
+            known = self.results.get(infohash)
+            if known is not None and known.get("last_tracker_check", 0) >= result.get("last_tracker_check", 0):
+                continue
+            self.results[infohash] = result
+            rank = item_rank(self.query, result)
+            was_good = known is not None and self.ranks[infohash] >= self.good_rank
+            self.good_results += (rank >= self.good_rank) - was_good
+            self.ranks[infohash] = rank
+
+        if self.good_results >= self.target_results:
+            self.logger.info("Search %s found %d good results, finishing early", self.uuid, self.good_results)
+            self.finish()
+        elif self.update_handle is None:
+            delay = max(0.0, self.last_update + self.update_interval - time.monotonic())
+            self.update_handle = get_running_loop().call_later(delay, self.send_update)
+
+    def get_ranked_results(self) -> list[dict[str, Any]]:
+        """
+        Get the results so far, the best ranked first.
+        """
+        return [dict(self.results[infohash], rank=rank)
+                for infohash, rank in sorted(self.ranks.items(), key=lambda item: item[1], reverse=True)]
+
+    def create_update(self) -> SearchUpdate:
+        """
+        Create an update with the current state of this search.
+        """
+        return SearchUpdate(uuid=self.uuid, query=self.query, results=self.get_ranked_results(),
+                            peers=len(self.peers), finished=self.finished)
+
+    def send_update(self) -> None:
+        """
+        Send the current state of this search to all subscribers.
+        """
+        self.update_handle = None
+        self.last_update = time.monotonic()
+        update = self.create_update()
+        for subscriber in self.subscribers:
+            subscriber.put_nowait(update)
+
+    def subscribe(self) -> Queue[SearchUpdate]:
+        """
+        Get a queue that receives the updates of this search, starting with the current state.
+        """
+        subscriber: Queue[SearchUpdate] = Queue()
+        subscriber.put_nowait(self.create_update())
+        if not self.finished:
+            self.subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Queue[SearchUpdate]) -> None:
+        """
+        Stop sending updates to the given queue.
+        """
+        if subscriber in self.subscribers:
+            self.subscribers.remove(subscriber)
+
+    def finish(self) -> None:
+        """
+        Stop accepting results and send the final update.
+        """
+        if self.finished:
+            return
+        self.finished = True
+        for handle in (self.update_handle, self.deadline_handle):
+            if handle is not None:
+                handle.cancel()
+        self.deadline_handle = None
+        self.send_update()
+        self.subscribers.clear()
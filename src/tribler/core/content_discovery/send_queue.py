@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import logging
+import time
+from asyncio import TimerHandle, get_running_loop
+from collections import deque
+from typing import TYPE_CHECKING, TypedDict
+
+from tribler.core.content_discovery.scheduler import TokenBucket
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from ipv8.messaging.lazy_payload import VariablePayload
+    from ipv8.peer import Peer
+
+PRIORITY_HIGH = 0  # Health responses and answers that fit in a single packet
+PRIORITY_BULK = 1  # Multi-packet select results and catch-up pages
+
+
+class SendQueueStatistics(TypedDict):
+    """
+    The statistics of a send queue.
+    """
+
+    rate: float
+    queued: int
+    sent: int
+    paced: int
+    dropped: int
+
+
+class SendQueue:
+    """
+    Pace outgoing packets to a maximum rate, so that bursts of responses do not overflow the socket buffers.
+
+    Packets are sent right away as long as the token bucket allows it. Otherwise, they are queued and high-priority
+    packets are sent before bulk packets. Packets that do not fit in the queue of their priority are dropped.
+    """
+
+    def __init__(self, send: Callable[[Peer, VariablePayload], None], rate: float, burst: float,
+                 max_queued: int) -> None:
+        """
+        Create a new send queue.
+
+        :param send: the function that actually sends a packet.
+        :param rate: the maximum number of packets per second, in the long run.
+        :param burst: the maximum number of packets to send at once.
+        :param max_queued: the maximum number of queued packets per priority.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._send = send
+        self.rate = rate
+        self.max_queued = max_queued
+        self.bucket = TokenBucket(burst, rate, time.monotonic())
+        self.queues: tuple[deque[tuple[Peer, VariablePayload]], ...] = (deque(), deque())
+        self.drain_handle: TimerHandle | None = None
+
+        self.sent = 0
+        self.paced = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        """
+        Get the number of queued packets.
+        """
+        return sum(len(queue) for queue in self.queues)
+
+    def send(self, peer: Peer, payload: VariablePayload, priority: int = PRIORITY_BULK) -> bool:
+        """
+        Send the given payload to the given peer, now or when the rate allows it.
+
+        :return: False if the packet was dropped.
+        """
+        if not len(self) and self.bucket.consume(1, time.monotonic()):
+            self.sent += 1
+            self._send(peer, payload)
+            return True
+        queue = self.queues[priority]
+        if len(queue) >= self.max_queued:
+            self.dropped += 1
+            self.logger.debug("Dropping packet to %s, the send queue is full", str(peer.address))
+            return False
+        queue.append((peer, payload))
+        self.paced += 1
+        self.schedule_drain()
+        return True
+
+    def schedule_drain(self) -> None:
+        """
+        Schedule sending the next queued packet for when a token becomes available.
+        """
+        if self.drain_handle is None:
+            delay = max(0.0, (1 - self.bucket.tokens) / self.rate)
+            self.drain_handle = get_running_loop().call_later(delay, self.drain)
+
+    def drain(self) -> None:
+        """
+        Send as many queued packets as the rate allows, highest priority first.
+        """
+        self.drain_handle = None
+        now = time.monotonic()
+        for queue in self.queues:
+            while queue and self.bucket.consume(1, now):
+                self.sent += 1
+                self._send(*queue.popleft())
+        if len(self):
+            self.schedule_drain()
+
+    def shutdown(self) -> None:
+        """
+        Drop all queued packets.
+        """
+        if self.drain_handle is not None:
+            self.drain_handle.cancel()
+            self.drain_handle = None
+        for queue in self.queues:
+            queue.clear()
+
+    def get_statistics(self) -> SendQueueStatistics:
+        """
+        Get the current state and counters of this queue.
+        """
+        return SendQueueStatistics(
+            rate=self.rate,
+            queued=len(self),
+            sent=self.sent,
+            paced=self.paced,
+            dropped=self.dropped
+        )
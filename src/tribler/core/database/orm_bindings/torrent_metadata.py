@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import random
+import threading
 from binascii import hexlify, unhexlify
+from collections import OrderedDict
 from datetime import datetime
 from struct import unpack
 from typing import TYPE_CHECKING, Any, Self
@@ -10,6 +12,7 @@ from lz4.frame import LZ4FrameCompressor
 from pony import orm
 from pony.orm import Database, db_session
 
+from tribler.core.database.compression import compress
 from tribler.core.database.serialization import (
     EPOCH,
     REGULAR_TORRENT,
@@ -31,6 +34,8 @@ LZ4_END_MARK_SIZE = 4  # in bytes, from original specification. We don't use CRC
 
 HEALTH_ITEM_HEADER_SIZE = 4  # in bytes, len of varlenI header
 
+SERIALIZED_CACHE_SIZE = 10000  # Number of serialized entries to keep in memory (roughly 3MB)
+
 # Metadata, torrents and channel statuses
 NEW = 0  # The entry is newly created and is not published yet. It will be committed at the next commit.
 TODELETE = 1  # The entry is marked to be removed at the next commit.
@@ -78,6 +83,8 @@ if TYPE_CHECKING:
 
         def serialized(self, key: bytes | None = None) -> bytes: ...  # noqa: D102
 
+        def invalidate_serialized(self) -> None: ...  # noqa: D102
+
         def to_simple_dict(self) -> dict[str, str | bytes | float | None]: ...  # noqa: D102
 
         @staticmethod
@@ -95,6 +102,9 @@ if TYPE_CHECKING:
         @staticmethod
         def from_payload(payload: TorrentMetadataPayload) -> TorrentMetadata: ...  # noqa: D102
 
+        @staticmethod
+        def from_dict(dct: dict) -> TorrentMetadata: ...  # noqa: D102
+
         @staticmethod
         def select_by_sql(selector: str) -> TorrentMetadata: ...  # noqa: D102
 
@@ -131,7 +141,7 @@ def tdef_to_metadata_dict(tdef: TorrentDef) -> dict:
 
 
 def entries_to_chunk(metadata_list: list[TorrentMetadata], chunk_size: int, start_index: int = 0,
-                     include_health: bool = False) -> tuple[bytes, int]:
+                     include_health: bool = False, dictionary_version: int | None = None) -> tuple[bytes, int]:
     """
     Put serialized data of one or more metadata entries into a single binary chunk. The data is added
     incrementally until it stops fitting into the designated chunk size. The first entry is added
@@ -139,7 +149,7 @@ def entries_to_chunk(metadata_list: list[TorrentMetadata], chunk_size: int, star
 
     The chunk format is:
 
-        <LZ4-compressed sequence of serialized metadata entries>
+        <LZ4-compressed (or dictionary-compressed) sequence of serialized metadata entries>
         [<optional HealthItemsPayload>]
 
     For the details of the health info format see the documentation: doc/metadata_store/serialization_format.rst
@@ -148,6 +158,7 @@ def entries_to_chunk(metadata_list: list[TorrentMetadata], chunk_size: int, star
     :param chunk_size: the desired chunk size limit, in bytes.
     :param start_index: the index of the element of metadata_list from which the processing should start.
     :param include_health: if True, put metadata health information into the chunk.
+    :param dictionary_version: the version of the compression dictionary to use instead of LZ4, if any.
     :return: (chunk, last_entry_index) tuple, where chunk is the resulting chunk in string form and
         last_entry_index is the index of the element of the input list that was put into the chunk the last.
     """
@@ -155,6 +166,10 @@ def entries_to_chunk(metadata_list: list[TorrentMetadata], chunk_size: int, star
         msg = "Could not serialize chunk: incorrect start_index"
         raise Exception(msg, metadata_list, chunk_size, start_index)
 
+    if dictionary_version is not None:
+        return _entries_to_dictionary_chunk(metadata_list, chunk_size, start_index, include_health,
+                                            dictionary_version)
+
     compressor = LZ4FrameCompressor(auto_flush=True)
     metadata_buffer = compressor.begin()
     health_buffer = b""
@@ -187,6 +202,40 @@ def entries_to_chunk(metadata_list: list[TorrentMetadata], chunk_size: int, star
     return result, index + 1
 
 
+def _entries_to_dictionary_chunk(metadata_list: list[TorrentMetadata], chunk_size: int, start_index: int,
+                                 include_health: bool, dictionary_version: int) -> tuple[bytes, int]:
+    """
+    Put serialized data of one or more metadata entries into a single dictionary-compressed chunk.
+
+    Unlike LZ4 frames, a zlib stream cannot be cut short after an arbitrary entry. However, the chunks are small,
+    so we simply compress all entries that fit so far, again, for every entry that is added.
+    """
+    metadata_buffer = b""
+    health_buffer = b""
+    compressed = b""
+    overhead = HEALTH_ITEM_HEADER_SIZE if include_health else 0
+
+    index = start_index
+    for count in range(start_index, len(metadata_list)):
+        metadata = metadata_list[count]
+        extended_buffer = metadata_buffer + metadata.serialized()
+        extended_health = health_buffer + (metadata.serialized_health() if include_health else b"")
+        extended_compressed = compress(extended_buffer, dictionary_version)
+
+        if len(extended_compressed) + len(extended_health) + overhead > chunk_size and count > start_index:
+            # The first entry is always added even if the resulted size exceeds the chunk size.
+            break
+
+        metadata_buffer, health_buffer, compressed = extended_buffer, extended_health, extended_compressed
+        index = count
+
+    result = compressed
+    if include_health:
+        result += HealthItemsPayload(health_buffer).serialize()
+
+    return result, index + 1
+
+
 def define_binding(db: Database, notifier: Notifier | None,  # noqa: C901
                    tag_processor_version: int) -> type[TorrentMetadata]:
     """
@@ -234,6 +283,9 @@ def define_binding(db: Database, notifier: Notifier | None,  # noqa: C901
 
         # Special class-level properties
         payload_class = TorrentMetadataPayload
+        # LRU cache of the signed wire format of rows, by rowid, to avoid repacking popular rows for every response
+        _serialized_cache: OrderedDict[int, bytes] = OrderedDict()
+        _serialized_cache_lock = threading.Lock()
 
         def __init__(self, *args: Any, **kwargs) -> None:  # noqa: ANN401
             # Any public keys + signatures are considered to be correct at this point, and should
@@ -370,14 +422,45 @@ def define_binding(db: Database, notifier: Notifier | None,  # noqa: C901
             """
             Serializes the object and returns the result with added signature (blob output).
 
+            Unless a key is given, the result is cached by rowid until the row is updated or deleted. Rows with changes
+            that are not flushed yet are never served from, nor stored in, the cache.
+
             :param key: private key to sign object with
             :return: serialized_data+signature binary string
             """
+            cacheable = key is None and self.rowid is not None and self._status_ not in ("created", "modified")
+            if cacheable:
+                with self._serialized_cache_lock:
+                    blob = self._serialized_cache.get(self.rowid)
+                    if blob is not None:
+                        self._serialized_cache.move_to_end(self.rowid)
+                        return blob
+
             kwargs = self.to_dict()
             payload = self.payload_class.from_dict(**kwargs)
             payload.signature = kwargs.pop("signature", None) or payload.signature
             if key:
                 payload.add_signature(key)
-            return payload.serialized() + payload.signature
+            blob = payload.serialized() + payload.signature
+
+            if cacheable:
+                with self._serialized_cache_lock:
+                    self._serialized_cache[self.rowid] = blob
+                    if len(self._serialized_cache) > SERIALIZED_CACHE_SIZE:
+                        self._serialized_cache.popitem(last=False)
+            return blob
+
+        def invalidate_serialized(self) -> None:
+            """
+            Drop the cached serialized form of this row.
+            """
+            with self._serialized_cache_lock:
+                self._serialized_cache.pop(self.rowid, None)
+
+        def before_update(self) -> None:
+            self.invalidate_serialized()
+
+        def before_delete(self) -> None:
+            self.invalidate_serialized()
 
     return TorrentMetadata
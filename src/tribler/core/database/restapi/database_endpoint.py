@@ -10,7 +10,7 @@ from typing import Self
 from aiohttp import web
 from aiohttp_apispec import docs, querystring_schema
 from ipv8.REST.schema import schema
-from marshmallow.fields import Boolean, Integer, String
+from marshmallow.fields import Boolean, Float, Integer, String
 from pony.orm import db_session
 
 from tribler.core.database.queries import to_fts_query
@@ -97,6 +97,7 @@ class DatabaseEndpoint(RESTEndpoint):
                 web.patch("/torrents/{infohash}/tags", self.update_tags),
                 web.get("/torrents/popular", self.get_popular_torrents),
                 web.get("/torrents/health", self.get_torrent_health_history),
+                web.get("/trackers", self.get_tracker_scores),
                 web.get("/search/local", self.local_search),
                 web.get("/search/completions", self.completions),
             ]
@@ -214,6 +215,41 @@ class DatabaseEndpoint(RESTEndpoint):
                                "remote": [h.to_api_response() for h in self.content_discovery_community.health_history]}
         })
 
+    @docs(
+        tags=["Metadata"],
+        summary="Fetch the latency, reliability and backoff state of the trackers that we checked.",
+        responses={
+            200: {
+                "schema": schema(
+                    TrackerScoresResponse={
+                        "trackers": [schema(TrackerScore={
+                            "url": String,
+                            "state": String,
+                            "checks": Integer,
+                            "successes": Integer,
+                            "consecutive_failures": Integer,
+                            "latency": Float,
+                            "latency_deviation": Float,
+                            "success_rate": Float,
+                            "last_error": String,
+                            "last_check": Float,
+                            "open_until": Float,
+                            "probe_started": Float,
+                        })]
+                    }
+                )
+            }
+        },
+    )
+    async def get_tracker_scores(self, request: RequestType) -> RESTResponse:
+        """
+        Fetch the latency, reliability and backoff state of the trackers that we checked.
+        """
+        if self.torrent_checker is None:
+            return RESTResponse({"trackers": []})
+
+        return RESTResponse({"trackers": self.torrent_checker.tracker_scores.to_api_response()})
+
     def add_download_progress_to_metadata_list(self, contents_list: list[dict]) -> None:
         """
         Retrieve the download status from libtorrent and attach it to the torrent descriptions in the content list.
@@ -329,6 +365,11 @@ class DatabaseEndpoint(RESTEndpoint):
             self._logger.exception("Error while performing DB search: %s: %s", type(e).__name__, e)
             return RESTResponse(status=HTTP_BAD_REQUEST)
 
+        if self.torrent_checker is not None:
+            # The user is looking at these torrents, so their health should be fresh
+            self.torrent_checker.check_schedule.add_interest(unhexlify(r["infohash"]) for r in search_results
+                                                             if r["type"] == REGULAR_TORRENT)
+
         response_dict = {
             "results": search_results,
             "first": sanitized["first"],
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
+import re
 import struct
 from binascii import hexlify
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Self
+from typing import TYPE_CHECKING, Any, Self
 
 from ipv8.keyvault.crypto import default_eccrypto
 from ipv8.messaging.lazy_payload import VariablePayload, vp_compile
 from ipv8.messaging.serialization import VarLenUtf8, default_serializer
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from ipv8.keyvault.keys import PrivateKey
 
 default_serializer.add_packer("varlenIutf8", VarLenUtf8(">I"))
@@ -68,12 +71,16 @@ class UnknownBlobTypeException(Exception):
     """
 
 
-def read_payload_with_offset(data: bytes, offset: int = 0) -> tuple[SignedPayload, int]:
+def read_payload_with_offset(data: bytes | memoryview, offset: int = 0) -> tuple[SignedPayload, int]:
     """
     Read the next payload from the data buffer (at the given offset).
     """
     # First we have to determine the actual payload type
     metadata_type = struct.unpack_from(">H", data, offset=offset)[0]
+    if metadata_type == REGULAR_TORRENT:
+        # By far the most common payload: use the fast path.
+        return LazyTorrentMetadataPayload.from_buffer(data if isinstance(data, memoryview) else memoryview(data),
+                                                      offset)
     payload_class = METADATA_TYPE_TO_PAYLOAD_CLASS.get(metadata_type)
     if payload_class is not None:
         payload, offset = default_serializer.unpack_serializable(payload_class, data, offset=offset)
@@ -249,6 +256,121 @@ class TorrentMetadataPayload(ChannelNodePayload):
                 + (f"&tr={self.tracker_info}" if self.tracker_info else ""))
 
 
+class LazyField:
+    """
+    Descriptor for a field that is stored in its wire format until it is first read.
+
+    The decoded value is stored in the instance dictionary, which takes precedence over this (non-data) descriptor.
+    Therefore, the value is decoded at most once and later reads and writes are plain attribute accesses.
+    """
+
+    def __init__(self, decode: Callable[[Any], Any]) -> None:
+        """
+        Create a new lazy field that uses the given function to convert the wire format.
+        """
+        self.decode = decode
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        """
+        Remember the name of the field.
+        """
+        self.name = name
+        self.raw_name = "_raw_" + name
+
+    def __get__(self, instance: object | None, owner: type | None = None) -> Any:  # noqa: ANN401
+        """
+        Decode the value on first access.
+        """
+        if instance is None:
+            return self
+        value = instance.__dict__[self.name] = self.decode(instance.__dict__[self.raw_name])
+        return value
+
+
+def _decode_utf8(value: memoryview) -> str:
+    """
+    Decode a UTF-8 string from the given buffer.
+    """
+    return str(value, "utf-8")
+
+
+class LazyTorrentMetadataPayload(TorrentMetadataPayload):
+    """
+    A TorrentMetadataPayload that is read straight from a received buffer.
+
+    The fixed-size fields are decoded in one go, the date and strings are only decoded when they are first accessed,
+    and the signature is checked against the received bytes instead of a repacked copy. Most received payloads are
+    duplicates, so their strings are never decoded at all.
+    """
+
+    FIXED_FORMAT = struct.Struct(">HH64sQQQ20sQI")
+    LENGTH_FORMAT = struct.Struct(">I")
+
+    torrent_date = LazyField(int2time)
+    title = LazyField(_decode_utf8)
+    tags = LazyField(_decode_utf8)
+    tracker_info = LazyField(_decode_utf8)
+
+    @classmethod
+    def from_buffer(cls: type[Self], data: memoryview, offset: int = 0) -> tuple[Self, int]:
+        """
+        Read a signed payload from the given buffer (at the given offset) and return it with the offset after it.
+        """
+        start = offset
+        (metadata_type, reserved_flags, public_key, id_, origin_id, timestamp, infohash, size,
+         torrent_date) = cls.FIXED_FORMAT.unpack_from(data, offset)
+        offset += cls.FIXED_FORMAT.size
+        unpack_length = cls.LENGTH_FORMAT.unpack_from
+
+        title_length, = unpack_length(data, offset)
+        title_offset = offset + 4
+        offset = title_offset + title_length
+
+        tags_length, = unpack_length(data, offset)
+        tags_offset = offset + 4
+        offset = tags_offset + tags_length
+
+        tracker_info_length, = unpack_length(data, offset)
+        tracker_info_offset = offset + 4
+        offset = tracker_info_offset + tracker_info_length
+
+        payload = cls.__new__(cls)
+        payload.__dict__.update({
+            "metadata_type": metadata_type,
+            "reserved_flags": reserved_flags,
+            "public_key": public_key,
+            "id_": id_,
+            "origin_id": origin_id,
+            "timestamp": timestamp,
+            "infohash": infohash,
+            "size": size,
+            "_raw_torrent_date": torrent_date,
+            "_raw_title": data[title_offset: title_offset + title_length],
+            "_raw_tags": data[tags_offset: tags_offset + tags_length],
+            "_raw_tracker_info": data[tracker_info_offset: tracker_info_offset + tracker_info_length],
+            "_serialized": data[start: offset],
+            "signature": bytes(data[offset: offset + SIGNATURE_SIZE])
+        })
+        return payload, offset + SIGNATURE_SIZE
+
+    def __setattr__(self, name: str, value: Any) -> None:  # noqa: ANN401
+        """
+        Forget the received bytes when the payload is modified.
+        """
+        if name in self.names:
+            self.__dict__["_serialized"] = None
+        self.__dict__[name] = value
+
+    def serialized(self) -> bytes:
+        """
+        Pack this serializable, or return the bytes it was read from if it was not modified.
+        """
+        received = self.__dict__.get("_serialized")
+        if received is None:
+            return super().serialized()
+        return bytes(received)
+
+
 @vp_compile
 class ChannelMetadataPayload(TorrentMetadataPayload):
     """
@@ -288,6 +410,9 @@ class HealthItemsPayload(VariablePayload):
     format_list = ["varlenI"]
     names = ["data"]
 
+    LENGTH_FORMAT = struct.Struct(">I")
+    ITEM_PATTERN = re.compile(rb"(\d+),(\d+),(\d+)(?:,[^;]*)?;|([^;]*);")
+
     data: bytes
 
     def serialize(self) -> bytes:
@@ -301,9 +426,12 @@ class HealthItemsPayload(VariablePayload):
         """
         Unpack this payload from the given data buffer.
         """
-        data = default_serializer.unpack_serializable(cls, data)[0].data
-        items = data.split(b";")[:-1]
-        return [cls.parse_health_data_item(item) for item in items]
+        length, = cls.LENGTH_FORMAT.unpack_from(data)
+        # Only complete items (terminated by a semicolon) are parsed, the remainder is ignored.
+        end = data.rfind(b";", 4, 4 + length) + 1
+        return [(int(seeders), int(leechers), int(last_check)) if seeders
+                else cls.parse_health_data_item(other)
+                for seeders, leechers, last_check, other in cls.ITEM_PATTERN.findall(data, 4, end)]
 
     @classmethod
     def parse_health_data_item(cls: type[Self], item: bytes) -> tuple[int, int, int]:
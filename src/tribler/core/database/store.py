@@ -6,6 +6,7 @@ import os.path
 import re
 import sqlite3
 import threading
+import zlib
 from asyncio import get_running_loop
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -19,6 +20,7 @@ from pony import orm
 from pony.orm import Database, db_session, desc, left_join, raw_sql, select  # noqa: F401 (desc is used by pony!)
 from pony.orm.dbproviders.sqlite import keep_exception
 
+from tribler.core.database import compression
 from tribler.core.database.orm_bindings import misc, torrent_metadata, tracker_state
 from tribler.core.database.orm_bindings import torrent_state as torrent_state_
 from tribler.core.database.orm_bindings.torrent_metadata import NULL_KEY_SUBST
@@ -32,6 +34,7 @@ from tribler.core.database.serialization import (
     TorrentMetadataPayload,
     read_payload_with_offset,
 )
+from tribler.core.database.writer import DatabaseWriter
 from tribler.core.torrent_checker.healthdataclasses import HealthInfo
 
 if TYPE_CHECKING:
@@ -43,6 +46,7 @@ if TYPE_CHECKING:
 
     from tribler.core.database.augmenter import AugmentedSearch
     from tribler.core.database.orm_bindings.torrent_metadata import TorrentMetadata
+    from tribler.core.database.orm_bindings.torrent_state import TorrentState
     from tribler.core.notifier import Notifier
 
 
@@ -126,13 +130,34 @@ sql_create_partial_index_torrentstate_last_check = """
     WHERE has_data = 1;
 """
 
+# Catch-up pages are sorted by seeders: walking this index in order avoids sorting the whole table for every page
+sql_create_partial_index_torrentstate_seeders = """
+    CREATE INDEX IF NOT EXISTS idx_torrentstate__seeders__partial
+    ON TorrentState (seeders, last_check)
+    WHERE has_data = 1;
+"""
+
+WARM_UP_CHUNK_SIZE = 1000  # Number of b-tree entries that are read per warm-up step
+
+# The b-trees that are hit by the first searches after startup, mapped to a keyset-paginated query that reads them in
+# index order and to the lower bound to start reading from. Missing b-trees (e.g., the partial index) are skipped.
+sql_warm_up_queries = {
+    "FtsIndex_data": ("SELECT id, block FROM FtsIndex_data WHERE id > ? ORDER BY id LIMIT ?", -1),
+    "idx_torrentstate__last_check__partial": ("""
+        SELECT last_check FROM TorrentState INDEXED BY idx_torrentstate__last_check__partial
+        WHERE has_data = 1 AND last_check > ? ORDER BY last_check LIMIT ?""", -1),
+    "idx_channelnode__infohash": ("""
+        SELECT infohash FROM ChannelNode INDEXED BY idx_channelnode__infohash
+        WHERE infohash > ? ORDER BY infohash LIMIT ?""", b""),
+}
+
 
 class MetadataStore:
     """
     Storage of metadata for channels and torrents.
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0915
             self,
             db_filename: str,
             private_key: PrivateKey,
@@ -154,6 +179,9 @@ class MetadataStore:
         self.batch_size = 10  # reasonable number, a little bit more than typically fits in a single UDP packet
         self.reference_timedelta = timedelta(milliseconds=100)
         self.sleep_on_external_thread = 0.05  # sleep this amount of seconds between batches executed on external thread
+        self.write_generation = 0  # Changes whenever torrents are added to or changed in the database
+        self.write_generation_lock = threading.Lock()  # The writer thread and run_threaded also change the generation
+        self.writer = DatabaseWriter(self)
 
         # Before we start binding and initializing, do a quick integrity check. We remove the existing db if this fails.
         # See https://github.com/Tribler/tribler/issues/8815 for the reasons behind this behavior.
@@ -218,6 +246,7 @@ class MetadataStore:
         if create_db:
             with db_session(ddl=True):
                 self.db.execute(sql_create_fts_table)
+                self.db.execute(sql_create_partial_index_torrentstate_seeders)
                 self.create_fts_triggers()
                 self.create_torrentstate_triggers()
 
@@ -331,6 +360,7 @@ class MetadataStore:
         Disconnect the connection to the database.
         """
         self._shutting_down = True
+        self.writer.shutdown()
         self.db.disconnect()
 
     async def run_threaded(self, func: Callable, *args: Any, **kwargs) -> Any:  # noqa: ANN401
@@ -353,16 +383,58 @@ class MetadataStore:
 
         return await get_running_loop().run_in_executor(None, wrapper)
 
-    async def process_compressed_mdblob_threaded(self, compressed_data: bytes, **kwargs) -> list[ProcessingResult]:
+    def warm_up(self, chunk_size: int = WARM_UP_CHUNK_SIZE, external_thread: bool = False) -> float:
         """
-        Decompress the given data in a thread and return a list of uncompressed results.
+        Read the b-trees of the FTS index and the health and infohash indices, so that they are in the page cache
+        when the first search comes in. Databases that were created before the catch-up index existed get it first.
+
+        Every chunk is read in its own db_session, so that writers can still get the database lock in between.
+
+        :param chunk_size: the number of b-tree entries to read per chunk.
+        :param external_thread: if this is set to True, we sleep between chunks to keep the warm-up low-priority.
+        :return: the number of seconds it took to warm up the database.
         """
-        try:
-            return await self.run_threaded(self.process_compressed_mdblob, compressed_data, **kwargs)
-        except Exception as e:
-            self._logger.exception("DB transaction error when tried to process compressed mdblob: %s: %s",
-                                   e.__class__.__name__, str(e), exc_info=e)
-            return []
+        start_time = time()
+        with db_session:
+            existing = {name for (name, ) in self.db.get_connection().execute("SELECT name FROM sqlite_master")}
+        if "idx_torrentstate__seeders__partial" not in existing and not self._shutting_down:
+            # Building the index of a large database takes a while, which is why it is not done at startup
+            with db_session(ddl=True):
+                self.db.execute(sql_create_partial_index_torrentstate_seeders)
+            self._logger.info("Created the catch-up index in %f seconds", time() - start_time)
+
+        entries_read = 0
+        for name, (query, start) in sql_warm_up_queries.items():
+            if name not in existing:
+                self._logger.debug("Skipping warm-up of missing b-tree %s", name)
+                continue
+            lower_bound = start
+            while not self._shutting_down:
+                with db_session:
+                    rows = self.db.get_connection().execute(query, (lower_bound, chunk_size)).fetchall()
+                entries_read += len(rows)
+                if len(rows) < chunk_size:
+                    break
+                lower_bound = rows[-1][0]
+                if external_thread:
+                    sleep(self.sleep_on_external_thread)
+
+        time_to_warm = time() - start_time
+        self._logger.info("Warmed up %d database entries in %f seconds", entries_read, time_to_warm)
+        return time_to_warm
+
+    async def warm_up_threaded(self, chunk_size: int = WARM_UP_CHUNK_SIZE) -> float:
+        """
+        Warm up the database in a thread and return the number of seconds it took.
+        """
+        return await self.run_threaded(self.warm_up, chunk_size, external_thread=True)
+
+    async def process_compressed_mdblob_threaded(self, compressed_data: bytes,
+                                                 skip_personal_metadata_payload: bool = True) -> list[ProcessingResult]:
+        """
+        Decompress the given data in the writer thread and return a list of uncompressed results.
+        """
+        return await self.writer.process(compressed_data, skip_personal_metadata_payload)
 
     def process_compressed_mdblob(self, compressed_data: bytes,
                                   skip_personal_metadata_payload: bool = True) -> list[ProcessingResult]:
@@ -370,10 +442,13 @@ class MetadataStore:
         Decompress the given data and return a list of uncompressed results.
         """
         try:
-            with LZ4FrameDecompressor() as decompressor:
-                decompressed_data = decompressor.decompress(compressed_data)
-                unused_data = decompressor.unused_data
-        except RuntimeError as e:
+            if compression.is_dictionary_compressed(compressed_data):
+                decompressed_data, unused_data = compression.decompress(compressed_data)
+            else:
+                with LZ4FrameDecompressor() as decompressor:
+                    decompressed_data = decompressor.decompress(compressed_data)
+                    unused_data = decompressor.unused_data
+        except (RuntimeError, compression.UnknownDictionaryException, zlib.error) as e:
             self._logger.warning("Unable to decompress mdblob: %s", str(e))
             return []
 
@@ -388,6 +463,15 @@ class MetadataStore:
         return self.process_squashed_mdblob(decompressed_data, health_info=health_info,
                                             skip_personal_metadata_payload=skip_personal_metadata_payload)
 
+    def increment_write_generation(self) -> None:
+        """
+        Register that torrents were added or changed, which invalidates cached query results.
+
+        Health updates do not count: they are too frequent and cached results only live for a few seconds anyway.
+        """
+        with self.write_generation_lock:
+            self.write_generation += 1
+
     def process_torrent_health(self, health: HealthInfo) -> bool:
         """
         Adds or updates information about a torrent health for the torrent with the specified infohash value.
@@ -418,7 +502,7 @@ class MetadataStore:
                                   last_check=health.last_check, tracker_id=0, self_checked=False)
         return add
 
-    def process_squashed_mdblob(self, chunk_data: bytes, external_thread: bool = False,  # noqa: C901
+    def process_squashed_mdblob(self, chunk_data: bytes, external_thread: bool = False,  # noqa: C901, PLR0912
                                 health_info: list[tuple[int, int, int]] | None = None,
                                 skip_personal_metadata_payload: bool = True) -> list[ProcessingResult]:
         """
@@ -436,8 +520,9 @@ class MetadataStore:
         """
         offset = 0
         payload_list = []
-        while offset < len(chunk_data):
-            payload, offset = read_payload_with_offset(chunk_data, offset)
+        buffer = memoryview(chunk_data)
+        while offset < len(buffer):
+            payload, offset = read_payload_with_offset(buffer, offset)
             if payload and isinstance(payload, TorrentMetadataPayload):
                 # Silently ignore deprecated payloads
                 payload_list.append(payload)
@@ -460,8 +545,12 @@ class MetadataStore:
 
             # We separate the sessions to minimize database locking.
             with db_session(immediate=True):
+                batch_results = []
                 for payload in batch:
-                    result.extend(self.process_payload(payload, skip_personal_metadata_payload))
+                    batch_results.extend(self.process_payload(payload, skip_personal_metadata_payload))
+            result.extend(batch_results)
+            if any(r.obj_state in (ObjState.NEW_OBJECT, ObjState.UPDATED_LOCAL_VERSION) for r in batch_results):
+                self.increment_write_generation()
 
             # Batch size adjustment
             batch_end_time = datetime.now() - batch_start_time  # noqa: DTZ005
@@ -510,7 +599,8 @@ class MetadataStore:
 
         # Process unsigned torrents
         if payload.public_key == NULL_KEY:
-            node = self.TorrentMetadata.add_ffa_from_dict(payload.to_dict())
+            metadata = self.decode_payload(payload)
+            node = self.TorrentMetadata.add_ffa_from_dict(metadata) if metadata else None
             if node:
                 return [ProcessingResult(data=node.to_simple_dict(),
                                          obj_state=ObjState.NEW_OBJECT,
@@ -525,11 +615,27 @@ class MetadataStore:
                                      rowid=node.rowid)]
 
         # Process signed torrents
-        obj = self.TorrentMetadata.from_payload(payload)
+        metadata = self.decode_payload(payload)
+        if metadata is None:
+            return []
+        obj = self.TorrentMetadata.from_dict(metadata)
         return [ProcessingResult(data=obj.to_simple_dict(),
                                  obj_state=ObjState.NEW_OBJECT,
                                  rowid=obj.rowid)]
 
+    def decode_payload(self, payload: TorrentMetadataPayload) -> dict | None:
+        """
+        Get the fields of a received payload, or None if they cannot be decoded.
+
+        Received payloads decode their strings and date on first access, so a malformed entry only shows here. It
+        should not abort the other entries of the batch it was received in.
+        """
+        try:
+            return payload.to_dict()
+        except (UnicodeDecodeError, OverflowError) as e:
+            self._logger.warning("Ignoring malformed payload: %s", e)
+            return None
+
     @db_session
     def get_num_torrents(self) -> int:
         """
@@ -802,6 +908,42 @@ class MetadataStore:
         """
         return (select(max(obj.rowid) for obj in cast("TorrentMetadata", self.TorrentMetadata)).get() or 0)
 
+    async def get_catch_up_entries_threaded(self, checked_after: int, count: int, cursor: tuple[int, int] | None = None
+                                            ) -> tuple[list[TorrentMetadata], tuple[int, int] | None]:
+        """
+        Retrieve a page of catch-up entries in a thread.
+        """
+        return await self.run_threaded(self.get_catch_up_entries, checked_after, count, cursor)
+
+    @db_session
+    def get_catch_up_entries(self, checked_after: int, count: int, cursor: tuple[int, int] | None = None
+                             ) -> tuple[list[TorrentMetadata], tuple[int, int] | None]:
+        """
+        Get a page of the torrents of which the health was checked after the given time, the most seeded first.
+
+        :param checked_after: the (exclusive) lower bound of the last health check time.
+        :param count: the maximum number of torrents to return.
+        :param cursor: the seeders and rowid of the last torrent of the previous page, or None for the first page.
+        :return: the torrents and the cursor of the next page, which is None if there are no more torrents.
+        """
+        seeders, rowid = cursor if cursor is not None else (2 ** 63 - 1, 0)  # noqa: RUF059 (used in the query)
+        # The CROSS JOIN makes SQLite walk the torrent states by seeders, instead of sorting all torrents
+        result = cast("list[TorrentMetadata]", self.TorrentMetadata.select_by_sql("""
+            SELECT ChannelNode.* FROM TorrentState CROSS JOIN ChannelNode ON ChannelNode.health == TorrentState.rowid
+            WHERE TorrentState.has_data == 1
+              AND TorrentState.last_check > $checked_after
+              AND (TorrentState.seeders < $seeders OR (TorrentState.seeders == $seeders AND ChannelNode.rowid > $rowid))
+              AND ChannelNode.metadata_type == $REGULAR_TORRENT
+            ORDER BY TorrentState.seeders DESC, ChannelNode.rowid
+            LIMIT $count
+        """))
+        for entry in result:
+            # Load the health inside the db_session, to be able to serialize it later
+            entry.to_simple_dict()
+        next_cursor = ((cast("TorrentState", result[-1].health).seeders, cast("int", result[-1].rowid))
+                       if len(result) == count else None)
+        return result, next_cursor
+
     fts_keyword_search_re = re.compile(r"\w+", re.UNICODE)
 
     def get_auto_complete_terms(self, text: str, max_terms: int) -> list[str]:
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import logging
+from asyncio import AbstractEventLoop, Future, Semaphore, get_running_loop
+from dataclasses import dataclass
+from queue import Empty, SimpleQueue
+from threading import Thread
+from typing import TYPE_CHECKING, TypedDict
+
+from pony.orm import db_session
+
+if TYPE_CHECKING:
+    from tribler.core.database.store import MetadataStore, ProcessingResult
+
+WRITE_QUEUE_SIZE = 64  # Max number of blobs that are queued for the writer thread
+MAX_WAITING_WRITES = 256  # Max number of blobs that wait for room in the queue, more are dropped
+MAX_COALESCED_BLOBS = 16  # Max number of blobs to write in a single transaction
+
+
+class WriterStatistics(TypedDict):
+    """
+    The statistics of a database writer.
+    """
+
+    queued: int
+    waiting: int
+    processed: int
+    transactions: int
+    largest_transaction: int
+    dropped: int
+
+
+@dataclass
+class WriteJob:
+    """
+    A compressed blob of a single packet that should be written to the database.
+    """
+
+    compressed_data: bytes
+    skip_personal_metadata_payload: bool
+    future: Future[list[ProcessingResult]]
+    loop: AbstractEventLoop
+
+
+class DatabaseWriter:
+    """
+    Write the metadata that we receive from the network to the database from a single, dedicated thread.
+
+    The blobs of many packets are coalesced into a single transaction, instead of having every packet compete for the
+    SQLite write lock on its own. The queue is bounded: when it is full, callers wait for room and, if too many are
+    waiting already, blobs are dropped.
+    """
+
+    def __init__(self, store: MetadataStore, queue_size: int = WRITE_QUEUE_SIZE,
+                 max_waiting: int = MAX_WAITING_WRITES, max_coalesced: int = MAX_COALESCED_BLOBS) -> None:
+        """
+        Create a new writer, its thread is started when the first blob comes in.
+
+        :param store: the metadata store to write to.
+        :param queue_size: the maximum number of queued blobs.
+        :param max_waiting: the maximum number of blobs that wait for room in the queue.
+        :param max_coalesced: the maximum number of blobs to write in a single transaction.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.store = store
+        self.max_waiting = max_waiting
+        self.max_coalesced = max_coalesced
+
+        self.jobs: SimpleQueue[WriteJob | None] = SimpleQueue()
+        self.slots = Semaphore(queue_size)
+        self.thread: Thread | None = None
+
+        self.queued = 0
+        self.waiting = 0
+        self.processed = 0
+        self.transactions = 0
+        self.largest_transaction = 0
+        self.dropped = 0
+
+    async def process(self, compressed_data: bytes,
+                      skip_personal_metadata_payload: bool = True) -> list[ProcessingResult]:
+        """
+        Queue the given compressed blob and return its processing results once it has been written.
+        """
+        if self.waiting >= self.max_waiting:
+            self.dropped += 1
+            self.logger.warning("Dropping mdblob, the database writer is overloaded")
+            return []
+        self.waiting += 1
+        try:
+            await self.slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        if self.thread is None:
+            self.thread = Thread(target=self.run, name="DatabaseWriter", daemon=True)
+            self.thread.start()
+        loop = get_running_loop()
+        job = WriteJob(compressed_data, skip_personal_metadata_payload, loop.create_future(), loop)
+        self.queued += 1
+        self.jobs.put(job)
+        return await job.future
+
+    def _complete(self, job: WriteJob, results: list[ProcessingResult]) -> None:
+        """
+        Hand the results of a job to its caller and make room for the next blob, on the event loop thread.
+        """
+        self.queued -= 1
+        self.slots.release()
+        if not job.future.done():
+            job.future.set_result(results)
+
+    def run(self) -> None:
+        """
+        Write batches of queued jobs until the writer is shut down.
+        """
+        try:
+            stopped = False
+            while not stopped:
+                job = self.jobs.get()
+                if job is None:
+                    break
+                batch = [job]
+                while len(batch) < self.max_coalesced:
+                    try:
+                        job = self.jobs.get_nowait()
+                    except Empty:
+                        break
+                    if job is None:
+                        stopped = True
+                        break
+                    batch.append(job)
+                self.write(batch)
+        finally:
+            self.store.db.disconnect()
+
+    def write(self, batch: list[WriteJob]) -> None:
+        """
+        Process the given jobs in a single transaction and send the results of every job to its own caller.
+
+        If the transaction fails, the jobs are retried in separate transactions, so that a single bad blob does not
+        cost us the others.
+        """
+        generation = self.store.write_generation
+        try:
+            with db_session(immediate=True):
+                results = [self.store.process_compressed_mdblob(job.compressed_data,
+                                                                job.skip_personal_metadata_payload)
+                           for job in batch]
+        except Exception as e:
+            if len(batch) > 1:
+                self.logger.warning("Retrying %d mdblobs separately after: %s: %s", len(batch),
+                                    e.__class__.__name__, str(e))
+            results = [self.write_single(job) for job in batch]
+        else:
+            self.transactions += 1
+            self.largest_transaction = max(self.largest_transaction, len(batch))
+            self.bump_write_generation(generation)
+
+        self.processed += len(batch)
+        for job, job_results in zip(batch, results, strict=True):
+            try:
+                job.loop.call_soon_threadsafe(self._complete, job, job_results)
+            except RuntimeError:
+                self.logger.debug("Event loop closed before the mdblob results could be delivered")
+
+    def write_single(self, job: WriteJob) -> list[ProcessingResult]:
+        """
+        Process a single job in its own transaction.
+        """
+        generation = self.store.write_generation
+        try:
+            with db_session(immediate=True):
+                results = self.store.process_compressed_mdblob(job.compressed_data, job.skip_personal_metadata_payload)
+        except Exception as e:
+            self.logger.exception("DB transaction error when tried to process compressed mdblob: %s: %s",
+                                  e.__class__.__name__, str(e), exc_info=e)
+            return []
+        self.transactions += 1
+        self.bump_write_generation(generation)
+        return results
+
+    def bump_write_generation(self, generation: int) -> None:
+        """
+        Change the write generation again after a commit, if the transaction changed it.
+
+        Queries that ran between the first change and the commit may have read the old data and should not be cached
+        under the new generation.
+        """
+        if self.store.write_generation != generation:
+            self.store.increment_write_generation()
+
+    def shutdown(self, timeout: float = 5) -> None:
+        """
+        Stop the writer thread after it wrote the blobs that are already queued.
+        """
+        if self.thread is not None:
+            self.jobs.put(None)
+            self.thread.join(timeout)
+            self.thread = None
+
+    def get_statistics(self) -> WriterStatistics:
+        """
+        Get the current state and counters of this writer.
+        """
+        return WriterStatistics(
+            queued=self.queued,
+            waiting=self.waiting,
+            processed=self.processed,
+            transactions=self.transactions,
+            largest_transaction=self.largest_transaction,
+            dropped=self.dropped
+        )
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import math
+import time
 from asyncio import Future
 from binascii import hexlify
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, TypedDict, cast
 
 import libtorrent as lt
 from ipv8.taskmanager import TaskManager
@@ -13,6 +14,21 @@ from tribler.core.torrent_checker.healthdataclasses import HealthInfo
 if TYPE_CHECKING:
     from collections.abc import Awaitable
 
+DHT_PACKET_ALERTS = int(lt.alert.category_t.dht_log_notification)  # The alert category of dht_pkt_alert
+SCRAPE_QUERY_MARKER = b"6:scrapei1e"  # Every bencoded BEP33 get_peers query contains this
+SCRAPE_RESPONSE_MARKER = b"4:BFsd"  # Every bencoded BEP33 get_peers response contains this
+
+
+class DHTPacketStatistics(TypedDict):
+    """
+    The statistics of the DHT packets that were inspected for BEP33 messages.
+    """
+
+    packets: int
+    decoded: int
+    processing_time: float
+    processing_time_per_packet: float
+
 
 class DHTHealthManager(TaskManager):
     """
@@ -32,6 +48,10 @@ class DHTHealthManager(TaskManager):
         self.outstanding: dict[str, bytes] = {}  # Map from transaction_id to infohash
         self.lt_session = lt_session
 
+        self.packets = 0
+        self.decoded_packets = 0
+        self.processing_time = 0.0
+
     def get_health(self, infohash: bytes, timeout: float = 15) -> Awaitable[HealthInfo]:
         """
         Lookup the health of a given infohash.
@@ -42,6 +62,8 @@ class DHTHealthManager(TaskManager):
         if infohash in self.lookup_futures:
             return self.lookup_futures[infohash]
 
+        if not self.lookup_futures:
+            self.set_packet_alerts(True)
         lookup_future: Future[HealthInfo] = Future()
         self.lookup_futures[infohash] = lookup_future
         self.bf_seeders[infohash] = bytearray(256)
@@ -76,6 +98,19 @@ class DHTHealthManager(TaskManager):
             self.lookup_futures[infohash].set_result(health)
 
         self.lookup_futures.pop(infohash, None)
+        if not self.lookup_futures:
+            self.set_packet_alerts(False)
+
+    def set_packet_alerts(self, enabled: bool) -> None:
+        """
+        Enable or disable the dht_pkt alerts of our session.
+
+        Every DHT packet that the session sends or receives produces an alert, so we only ask for them while we have
+        lookups running.
+        """
+        alert_mask = self.lt_session.get_settings()["alert_mask"]
+        alert_mask = alert_mask | DHT_PACKET_ALERTS if enabled else alert_mask & ~DHT_PACKET_ALERTS
+        self.lt_session.apply_settings({"alert_mask": alert_mask})
 
     @staticmethod
     def combine_bloomfilters(bf1: bytearray, bf2: bytearray) -> bytearray:
@@ -87,10 +122,9 @@ class DHTHealthManager(TaskManager):
         :return: A bytearray with the combined bloomfilter.
         """
         final_bf_len = min(len(bf1), len(bf2))
-        final_bf = bytearray(final_bf_len)
-        for bf_index in range(final_bf_len):
-            final_bf[bf_index] = bf1[bf_index] | bf2[bf_index]
-        return final_bf
+        # OR all bits at once, as big integers, instead of byte by byte
+        combined = int.from_bytes(bf1[:final_bf_len], "big") | int.from_bytes(bf2[:final_bf_len], "big")
+        return bytearray(combined.to_bytes(final_bf_len, "big"))
 
     @staticmethod
     def get_size_from_bloomfilter(bf: bytearray) -> int:
@@ -100,20 +134,7 @@ class DHTHealthManager(TaskManager):
         :param bf: The bloom filter of which we estimate the size.
         :return: A rounded integer, approximating the number of items in the filter.
         """
-
-        def tobits(s: bytes) -> list[int]:
-            result = []
-            for num in s:
-                bits = bin(num)[2:]
-                bits = "00000000"[len(bits):] + bits
-                result.extend([int(b) for b in bits])
-            return result
-
-        bits_array = tobits(bytes(bf))
-        total_zeros = 0
-        for bit in bits_array:
-            if bit == 0:
-                total_zeros += 1
+        total_zeros = len(bf) * 8 - int.from_bytes(bf, "big").bit_count()
 
         if total_zeros == 0:
             return 6000  # The maximum capacity of the bloom filter used in BEP33
@@ -152,3 +173,49 @@ class DHTHealthManager(TaskManager):
 
         self.bf_seeders[infohash] = DHTHealthManager.combine_bloomfilters(self.bf_seeders[infohash], bf_seeds)
         self.bf_peers[infohash] = DHTHealthManager.combine_bloomfilters(self.bf_peers[infohash], bf_peers)
+
+    def process_packet(self, alert: lt.dht_pkt_alert) -> None:
+        """
+        Inspect a DHT packet that our session sent or received for BEP33 queries and responses.
+
+        Decoding is expensive and almost all packets are irrelevant, so packets without a BEP33 key are skipped first.
+        """
+        start = time.perf_counter()
+        self.packets += 1
+        pkt_buf = alert.pkt_buf
+        if SCRAPE_QUERY_MARKER in pkt_buf or SCRAPE_RESPONSE_MARKER in pkt_buf:
+            self.decoded_packets += 1
+            self.process_decoded_packet(alert, cast("dict[bytes, Any]", lt.bdecode(pkt_buf)))
+        self.processing_time += time.perf_counter() - start
+
+    def process_decoded_packet(self, alert: lt.dht_pkt_alert, decoded: dict[bytes, Any] | None) -> None:
+        """
+        Register the outstanding BEP33 queries and the received BEP33 bloom filters of a decoded DHT packet.
+        """
+        if not decoded:
+            return
+
+        # Unfortunately, the Python bindings don't have a direction attribute.
+        # So, we'll have to resort to using the string representation of the alert instead.
+        incoming = str(alert).startswith("<==")
+
+        # We are sending a raw DHT message - keep track of the outstanding request.
+        if not incoming and decoded.get(b"y") == b"q" \
+                and decoded.get(b"q") == b"get_peers" and decoded[b"a"].get(b"scrape") == 1:
+            self.requesting_bloomfilters(decoded[b"t"], decoded[b"a"][b"info_hash"])
+
+        # We received a raw DHT message - check whether it is a BEP33 message.
+        if incoming and b"r" in decoded and b"BFsd" in decoded[b"r"] and b"BFpe" in decoded[b"r"]:
+            self.received_bloomfilters(decoded[b"t"], bytearray(decoded[b"r"][b"BFsd"]),
+                                       bytearray(decoded[b"r"][b"BFpe"]))
+
+    def get_statistics(self) -> DHTPacketStatistics:
+        """
+        Get the counters and the processing time of the inspected DHT packets.
+        """
+        return DHTPacketStatistics(
+            packets=self.packets,
+            decoded=self.decoded_packets,
+            processing_time=self.processing_time,
+            processing_time_per_packet=self.processing_time / self.packets if self.packets else 0.0
+        )
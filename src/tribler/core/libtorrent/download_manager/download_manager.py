@@ -67,6 +67,25 @@ class MetainfoLookup:
     pending: int
 
 
+@dataclasses.dataclass
+class DHTPeerLookup:
+    """
+    The peers that a DHT lookup found so far, and a future that is set when enough peers were found.
+    """
+
+    max_peers: int
+    peers: set[tuple[str, int]] = dataclasses.field(default_factory=set)
+    done: Future[None] = dataclasses.field(default_factory=Future)
+
+    def add_peers(self, peers: list[tuple[str, int]]) -> None:
+        """
+        Add peers from a DHT reply, finishing the lookup when enough peers were found.
+        """
+        self.peers.update(peers)
+        if len(self.peers) >= self.max_peers and not self.done.done():
+            self.done.set_result(None)
+
+
 class MetainfoLookupResult(TypedDict):
     """
     The result of a MetainfoLookup, stored in the metainfo_cache.
@@ -140,10 +159,12 @@ class DownloadManager(TaskManager):
         """
         Dictionary that maps infohashes to cached metainfo items
         """
+        self.dht_peer_lookups: dict[bytes, DHTPeerLookup] = {}
 
         self.default_alert_mask = lt.alert.category_t.error_notification | lt.alert.category_t.status_notification | \
                                   lt.alert.category_t.storage_notification | lt.alert.category_t.performance_warning | \
-                                  lt.alert.category_t.tracker_notification | lt.alert.category_t.debug_notification
+                                  lt.alert.category_t.tracker_notification | lt.alert.category_t.debug_notification | \
+                                  lt.alert.category_t.dht_operation_notification
         self.state_cb_count = 0
         self.queued_write_bytes = -1
 
@@ -518,24 +539,35 @@ class DownloadManager(TaskManager):
             self.session_stats[hops].update(ss_alert.values)
 
         elif alert_type == "dht_pkt_alert" and self.dht_health_manager is not None:
-            # Unfortunately, the Python bindings don't have a direction attribute.
-            # So, we'll have to resort to using the string representation of the alert instead.
-            incoming = str(alert).startswith("<==")
-            decoded = cast("dict[bytes, Any]", lt.bdecode(cast("lt.dht_pkt_alert", alert).pkt_buf))
-            if not decoded:
-                return
+            self.dht_health_manager.process_packet(cast("lt.dht_pkt_alert", alert))
+
+        elif alert_type == "dht_get_peers_reply_alert":
+            reply_alert = cast("lt.dht_get_peers_reply_alert", alert)
+            if lookup := self.dht_peer_lookups.get(reply_alert.info_hash.to_bytes()):
+                lookup.add_peers(reply_alert.peers())
+
+    async def get_dht_peers(self, infohash: bytes, timeout: float, max_peers: int,
+                            hops: int = 0) -> set[tuple[str, int]]:
+        """
+        Look up the peers of a torrent in the DHT, without joining its swarm.
 
-            # We are sending a raw DHT message - notify the DHTHealthManager of the outstanding request.
-            if not incoming and decoded.get(b"y") == b"q" \
-                    and decoded.get(b"q") == b"get_peers" and decoded[b"a"].get(b"scrape") == 1:
-                self.dht_health_manager.requesting_bloomfilters(decoded[b"t"],
-                                                                decoded[b"a"][b"info_hash"])
-
-            # We received a raw DHT message - decode it and check whether it is a BEP33 message.
-            if incoming and b"r" in decoded and b"BFsd" in decoded[b"r"] and b"BFpe" in decoded[b"r"]:
-                self.dht_health_manager.received_bloomfilters(decoded[b"t"],
-                                                              bytearray(decoded[b"r"][b"BFsd"]),
-                                                              bytearray(decoded[b"r"][b"BFpe"]))
+        :param infohash: The (binary, v1) infohash to lookup peers for.
+        :param timeout: How long to wait for DHT replies, in seconds.
+        :param max_peers: The number of peers after which we stop waiting.
+        :param hops: The number of anonymization hops of the session to perform the lookup with.
+        :return: The addresses of the peers that were found.
+        """
+        lookup = self.dht_peer_lookups.get(infohash)
+        if lookup is None:
+            lookup = self.dht_peer_lookups[infohash] = DHTPeerLookup(max_peers)
+            (await self.get_session(hops)).dht_get_peers(lt.sha1_hash(infohash))
+        try:
+            await wait_for(shield(lookup.done), timeout)
+        except TimeoutError:
+            pass
+        finally:
+            self.dht_peer_lookups.pop(infohash, None)
+        return lookup.peers
 
     async def get_metainfo(self, infohash: bytes, timeout: float = 7, hops: int | None = -1,  # noqa: C901,PLR0912,PLR0915
                            health_check: bool = False, url: str | None = None) -> MetainfoLookupResult | None:
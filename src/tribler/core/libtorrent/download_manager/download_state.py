@@ -269,6 +269,22 @@ class DownloadState:
         seeds = self.lt_status.list_seeds
         return seeds, total - seeds
 
+    def get_swarm_size(self) -> tuple[int, int]:
+        """
+        Returns the number of seeders and leechers in the swarm, as far as we know.
+
+        The trackers tell us the size of the whole swarm, while we only know a part of it through our peers. We take
+        the largest of both.
+
+        :return: A tuple (num seeders, num leechers)
+        """
+        if not self.lt_status or self.get_status() not in [DownloadStatus.DOWNLOADING, DownloadStatus.SEEDING]:
+            return 0, 0
+
+        seeds, peers = self.get_num_seeds_peers()
+        # The tracker counts are -1 if no tracker told us yet
+        return max(seeds, self.lt_status.num_complete), max(peers, self.lt_status.num_incomplete)
+
     def get_pieces_complete(self) -> list[bool]:
         """
         Returns a list of booleans indicating whether we have completely
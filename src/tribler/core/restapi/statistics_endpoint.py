@@ -17,7 +17,13 @@ if TYPE_CHECKING:
     from ipv8.messaging.interfaces.statistics_endpoint import StatisticsEndpoint as IPv8StatsEndpoint
 
     from tribler.core.content_discovery.community import ContentDiscoveryCommunity
+    from tribler.core.content_discovery.response_cache import ResponseCacheStatistics
+    from tribler.core.content_discovery.scheduler import SchedulerStatistics
+    from tribler.core.content_discovery.send_queue import SendQueueStatistics
+    from tribler.core.database.writer import WriterStatistics
     from tribler.core.session import Session
+    from tribler.core.torrent_checker.bulk_scheduler import BulkSchedulerStatistics
+    from tribler.core.torrent_checker.torrent_checker import HealthCheckStatistics
 
 
 class Socks5StatsDict(TypedDict):
@@ -67,6 +73,12 @@ class TriblerStatsDict(TypedDict):
     endpoint_version: NotRequired[str | None]
     socks5_sessions: NotRequired[list[Socks5StatsDict]]
     libtorrent: NotRequired[LibtorrentStatsDict]
+    remote_queries: NotRequired[SchedulerStatistics]
+    remote_query_cache: NotRequired[ResponseCacheStatistics]
+    response_sends: NotRequired[SendQueueStatistics]
+    db_writer: NotRequired[WriterStatistics]
+    bulk_health_checks: NotRequired[BulkSchedulerStatistics]
+    health_checks: NotRequired[HealthCheckStatistics]
 
 
 class StatisticsEndpoint(RESTEndpoint):
@@ -118,10 +130,18 @@ class StatisticsEndpoint(RESTEndpoint):
 
         if self.session and self.content_discovery_community:
             stats_dict["peers"] = len(self.content_discovery_community.get_peers())
+            stats_dict["remote_queries"] = self.content_discovery_community.query_scheduler.get_statistics()
+            stats_dict["remote_query_cache"] = self.content_discovery_community.response_cache.get_statistics()
+            stats_dict["response_sends"] = self.content_discovery_community.send_queue.get_statistics()
 
         if self.session and self.session.mds:
             stats_dict.update({"db_size": self.session.mds.get_db_file_size(),
-                               "num_torrents": self.session.mds.get_num_torrents()})
+                               "num_torrents": self.session.mds.get_num_torrents(),
+                               "db_writer": self.session.mds.writer.get_statistics()})
+
+        if self.session and self.session.torrent_checker:
+            stats_dict["bulk_health_checks"] = self.session.torrent_checker.bulk_scheduler.get_statistics()
+            stats_dict["health_checks"] = self.session.torrent_checker.get_statistics()
 
         if self.session and self.session.download_manager:
             lt_stats: LibtorrentStatsDict = LibtorrentStatsDict(
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import random
+from bisect import bisect_left, insort
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from tribler.core.torrent_checker.healthdataclasses import HealthInfo
+
+
+class AliveTorrentIndex:
+    """
+    The health of the torrents that had seeders when we last checked them.
+
+    The torrents are kept sorted by popularity (seeders + leechers) and in an array for random sampling, so that
+    neither needs a scan over all torrents.
+    """
+
+    def __init__(self, health_infos: Iterable[HealthInfo] = ()) -> None:
+        """
+        Create a new index with the given health info.
+        """
+        self.health: dict[bytes, HealthInfo] = {}
+        self.by_popularity: list[tuple[int, bytes]] = []  # Sorted (negated popularity, infohash) pairs
+        self.infohashes: list[bytes] = []
+        self.positions: dict[bytes, int] = {}  # The index of each infohash in the infohashes list
+
+        for health in health_infos:
+            self.update(health)
+
+    def __len__(self) -> int:
+        """
+        Get the number of alive torrents.
+        """
+        return len(self.health)
+
+    def __iter__(self) -> Iterator[HealthInfo]:
+        """
+        Iterate over the health info of all alive torrents.
+        """
+        return iter(self.health.values())
+
+    def __contains__(self, infohash: bytes) -> bool:
+        """
+        Check if the torrent with the given infohash is alive.
+        """
+        return infohash in self.health
+
+    @staticmethod
+    def _popularity_key(health: HealthInfo) -> tuple[int, bytes]:
+        """
+        Get the sort key of the given health info: the most popular torrents come first.
+        """
+        return -(health.seeders + health.leechers), health.infohash
+
+    def update(self, health: HealthInfo) -> None:
+        """
+        Replace the health info of a torrent, removing the torrent if it no longer has seeders.
+        """
+        self.remove(health.infohash)
+        if health.seeders <= 0:
+            return
+        self.health[health.infohash] = health
+        insort(self.by_popularity, self._popularity_key(health))
+        self.positions[health.infohash] = len(self.infohashes)
+        self.infohashes.append(health.infohash)
+
+    def remove(self, infohash: bytes) -> None:
+        """
+        Remove the torrent with the given infohash, if it is in the index.
+        """
+        health = self.health.pop(infohash, None)
+        if health is None:
+            return
+        del self.by_popularity[bisect_left(self.by_popularity, self._popularity_key(health))]
+        # Move the last infohash into the freed position, so that removal does not shift the array.
+        position = self.positions.pop(infohash)
+        last = self.infohashes.pop()
+        if last != infohash:
+            self.infohashes[position] = last
+            self.positions[last] = position
+
+    def sample(self, count: int) -> list[HealthInfo]:
+        """
+        Get the health info of (at most) the given number of random alive torrents.
+        """
+        return [self.health[infohash] for infohash in random.sample(self.infohashes, min(count, len(self.infohashes)))]
+
+    def most_popular(self, count: int) -> list[HealthInfo]:
+        """
+        Get the health info of (at most) the given number of most popular alive torrents.
+        """
+        return [self.health[infohash] for _, infohash in self.by_popularity[:count]]
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, TypedDict, cast
+
+from pony.orm import db_session, select
+
+from tribler.core.content_discovery.scheduler import TokenBucket
+from tribler.core.libtorrent.trackers import is_valid_url
+from tribler.core.torrent_checker.healthdataclasses import HEALTH_FRESHNESS_SECONDS
+from tribler.core.torrent_checker.tracker_manager import MAX_TRACKER_FAILURES
+
+if TYPE_CHECKING:
+    from tribler.core.database.orm_bindings.torrent_state import TorrentState
+    from tribler.core.torrent_checker.healthdataclasses import HealthInfo
+    from tribler.core.torrent_checker.torrent_checker import TorrentChecker
+    from tribler.core.torrent_checker.torrentchecker_session import TrackerSession
+
+MAX_CONCURRENT_SESSIONS = 16  # Max number of tracker sessions that run at the same time
+MAX_PACKETS_PER_SECOND = 20  # Max number of packets that we send to trackers per second, in the long run
+MAX_PACKET_BURST = 40  # Max number of packets that we send to trackers at once
+STALE_TORRENTS_PER_REFILL = 5000  # Max number of (tracker, stale torrent) pairs to load from the database at once
+IDLE_REFILL_INTERVAL = 300  # How long to wait before looking for stale torrents again, if there were none
+RETRY_INTERVAL = 900  # How long to wait before selecting a torrent again, if its check did not update it
+BULK_SESSION_TIMEOUT = 20  # The timeout of a single bulk scrape
+MAX_REVIVAL_PROBES = 10  # Max number of dead trackers to probe per refill
+
+
+class BulkSchedulerStatistics(TypedDict):
+    """
+    The statistics of a bulk health scheduler.
+    """
+
+    trackers: int
+    pending: int
+    running: int
+    sessions: int
+    failed_sessions: int
+    packets: int
+    updated: int
+
+
+class BulkHealthScheduler:
+    """
+    Refresh the health of stale torrents in bulk, with full-size scrapes per tracker.
+
+    Stale torrents are loaded from the database in large batches and grouped by tracker in memory. The trackers take
+    turns: every tracker gets at most one running session, every session scrapes as many torrents as fit in a single
+    request, and sessions are only started if the global concurrency and packet budgets allow it.
+    """
+
+    def __init__(self, checker: TorrentChecker, max_sessions: int = MAX_CONCURRENT_SESSIONS,
+                 packets_per_second: float = MAX_PACKETS_PER_SECOND, burst: float = MAX_PACKET_BURST,
+                 refill_size: int = STALE_TORRENTS_PER_REFILL) -> None:
+        """
+        Create a new scheduler for the given torrent checker.
+
+        :param checker: the torrent checker to create sessions with and to report the health to.
+        :param max_sessions: the maximum number of tracker sessions that run at the same time.
+        :param packets_per_second: the maximum number of packets to send per second, in the long run.
+        :param burst: the maximum number of packets to send at once.
+        :param refill_size: the maximum number of stale torrents to load from the database at once.
+        """
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self.checker = checker
+        self.max_sessions = max_sessions
+        self.refill_size = refill_size
+        self.bucket = TokenBucket(burst, packets_per_second, time.monotonic())
+
+        self.pending: OrderedDict[str, deque[bytes]] = OrderedDict()  # The stale infohashes by tracker url
+        self.selected: OrderedDict[bytes, float] = OrderedDict()  # When we last selected an infohash for a check
+        self.busy_trackers: set[str] = set()
+        self.next_refill = 0.0
+
+        self.sessions = 0
+        self.failed_sessions = 0
+        self.packets = 0
+        self.updated = 0
+
+    def load_stale_torrents(self, now: float) -> tuple[list[tuple[str, bytes]], dict[str, bytes]]:
+        """
+        Load the stale torrents with their trackers and a probe torrent for dead trackers, on a worker thread.
+
+        :return: the (tracker url, infohash) pairs of the stale torrents, oldest first, and the probe torrents by url.
+        """
+        with db_session:
+            stale = select((tracker.url, torrent.infohash, torrent.last_check)
+                           for torrent in cast("TorrentState", self.checker.mds.TorrentState)
+                           for tracker in torrent.trackers
+                           if torrent.last_check < now - HEALTH_FRESHNESS_SECONDS  # Includes never checked torrents
+                           and tracker.alive and tracker.failures < MAX_TRACKER_FAILURES)
+            # The torrents that were never checked or checked the longest time ago come first
+            torrents = [(url, infohash) for url, infohash, _ in stale.order_by(3).limit(self.refill_size)]
+
+            # Probe some dead trackers with a single torrent, a successful probe revives them
+            probes = {}
+            for url in self.checker.tracker_manager.get_trackers_to_revive(MAX_REVIVAL_PROBES):
+                probe = select(torrent.infohash for torrent in cast("TorrentState", self.checker.mds.TorrentState)
+                               for tracker in torrent.trackers if tracker.url == url).first()
+                if probe is not None:
+                    probes[url] = probe
+        return torrents, probes
+
+    async def refill(self) -> int:
+        """
+        Load stale torrents from the database and group them by tracker.
+
+        Torrents that were selected recently are skipped: their tracker may not have answered. Torrents that we download
+        are skipped as well: their health comes from the download. Every torrent is only queued for a single tracker.
+        Dead trackers are only queued a single torrent, as a probe, once their backoff expired.
+
+        :return: the number of torrents that were added.
+        """
+        now = time.time()
+        torrents, probes = await self.checker.mds.run_threaded(self.load_stale_torrents, now)
+
+        while self.selected and next(iter(self.selected.values())) < now - RETRY_INTERVAL:
+            self.selected.popitem(last=False)
+        blacklist = self.checker.tracker_manager.blacklist
+        added = 0
+        for url, infohash in torrents:
+            if infohash in self.selected or infohash in self.checker.downloading or url in blacklist \
+                    or not is_valid_url(url):
+                continue
+            self.selected[infohash] = now
+            self.pending.setdefault(url, deque()).append(infohash)
+            added += 1
+        for url, infohash in probes.items():
+            if url not in self.pending and url not in self.busy_trackers:
+                self.pending[url] = deque([infohash])
+                added += 1
+        self._logger.info("Queued %d stale torrents for %d trackers", added, len(self.pending))
+        return added
+
+    async def refill_after_idle(self) -> None:
+        """
+        Load stale torrents, and do not look for them again for a while if there are none or if loading them fails.
+        """
+        self.next_refill = time.monotonic() + IDLE_REFILL_INTERVAL
+        if await self.refill():
+            self.next_refill = 0.0
+
+    async def schedule(self) -> int:
+        """
+        Start as many tracker sessions as the concurrency and packet budgets allow.
+
+        :return: the number of started sessions.
+        """
+        if not self.pending and time.monotonic() >= self.next_refill:
+            await self.refill_after_idle()
+
+        started = 0
+        for url in list(self.pending):
+            if len(self.busy_trackers) >= self.max_sessions:
+                break
+            if url in self.busy_trackers:
+                continue
+            if not self.checker.tracker_scores.allow(url):
+                # The tracker failed too often recently, its torrents are selected again later
+                del self.pending[url]
+                continue
+            # A UDP scrape costs a connect and a scrape packet, an HTTP scrape costs a single request
+            cost = 2 if url.startswith("udp") else 1
+            if not self.bucket.consume(cost, time.monotonic()):
+                break
+            session = self.checker.create_session_for_request(url, timeout=BULK_SESSION_TIMEOUT)
+            if session is None:
+                break
+            infohashes = self.pending[url]
+            while infohashes and len(session.infohash_list) < session.max_infohashes:
+                session.add_infohash(infohashes.popleft())
+            if infohashes:
+                self.pending.move_to_end(url)
+            else:
+                del self.pending[url]
+
+            self.busy_trackers.add(url)
+            self.sessions += 1
+            self.packets += cost
+            started += 1
+            self.checker.register_anonymous_task("Bulk health check", self.check, url, session)
+        return started
+
+    async def check(self, url: str, session: TrackerSession) -> None:
+        """
+        Scrape the given tracker session and store the health of its torrents.
+        """
+        try:
+            response = await self.checker.get_tracker_response(session)
+        except Exception:
+            self.failed_sessions += 1
+            info = self.checker.tracker_manager.get_tracker_info(url)
+            if info is None or not info["is_alive"]:
+                # Do not queue more torrents for a tracker that died, they are selected again for another tracker
+                self.pending.pop(url, None)
+            return
+        finally:
+            self.busy_trackers.discard(url)
+
+        updated = await self.checker.mds.run_threaded(self.store_health, response.torrent_health_list)
+        for health in updated:
+            self.checker.check_schedule.update(health)
+        self.updated += len(updated)
+
+    def store_health(self, health_list: list[HealthInfo]) -> list[HealthInfo]:
+        """
+        Store the health that replaces the health in the database, on a worker thread.
+
+        Unlike the health of single checks, bulk results are not sent to the GUI and not added to the checked torrents
+        that we gossip: there are far too many of them.
+
+        :return: the stored health.
+        """
+        stored = []
+        with db_session:
+            for health in health_list:
+                if not health.is_valid() or not health.self_checked:
+                    continue
+                torrent_state = self.checker.mds.TorrentState.get_for_update(infohash=health.infohash)
+                if torrent_state and health.should_replace(torrent_state.to_health()):
+                    self.checker.set_torrent_health(torrent_state, health)
+                    stored.append(health)
+        return stored
+
+    def get_statistics(self) -> BulkSchedulerStatistics:
+        """
+        Get the current state and counters of this scheduler.
+        """
+        return BulkSchedulerStatistics(
+            trackers=len(self.pending),
+            pending=sum(len(infohashes) for infohashes in self.pending.values()),
+            running=len(self.busy_trackers),
+            sessions=self.sessions,
+            failed_sessions=self.failed_sessions,
+            packets=self.packets,
+            updated=self.updated
+        )
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import heapq
+import math
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from tribler.core.torrent_checker.healthdataclasses import HEALTH_FRESHNESS_SECONDS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from tribler.core.torrent_checker.healthdataclasses import HealthInfo
+
+MIN_CHECK_INTERVAL = 15 * 60  # The shortest time between two checks of the same torrent
+MAX_CHECK_INTERVAL = 7 * 24 * 3600  # The longest time between two checks of the same torrent
+DEAD_TORRENT_SLOWDOWN = 6  # How much later torrents without seeders and leechers are checked again
+INTEREST_LIFETIME = 3600  # How long a torrent counts as interesting after it was shown to the user
+INTEREST_SPEEDUP = 8  # How much sooner interesting torrents are checked again
+VOLATILITY_SPEEDUP = 3  # How much sooner torrents of which the health always changes are checked again
+VOLATILITY_ALPHA = 0.3  # The weight of the latest change in the moving average of the volatility
+MAX_SCHEDULED_TORRENTS = 50000  # Max number of torrents to keep a schedule for
+EVICTED_FRACTION = 0.1  # The fraction of the torrents to forget at once when the schedule is full
+
+
+@dataclass
+class ScheduledTorrent:
+    """
+    What we know about a torrent to decide when to check it again.
+    """
+
+    infohash: bytes
+    last_check: int = 0
+    popularity: int = 0
+    volatility: float = 0.0  # Moving average of the relative change in popularity between checks
+    interest: float = 0.0  # When the torrent was last shown to the user
+    next_check: float = 0.0
+
+
+class HealthCheckSchedule:
+    """
+    A min-heap of torrents, ordered by when their health should be checked next.
+
+    The time of the next check is computed from the popularity of a torrent, the age of its last check, how much its
+    health changed between checks and whether it was recently shown to the user. Rescheduling a torrent pushes a new
+    heap item and leaves the old one behind, which is skipped when it is popped: every decision is O(log n).
+    """
+
+    def __init__(self, max_size: int = MAX_SCHEDULED_TORRENTS) -> None:
+        """
+        Create a new, empty, schedule.
+
+        :param max_size: the maximum number of torrents to keep a schedule for.
+        """
+        self.max_size = max_size
+        self.torrents: dict[bytes, ScheduledTorrent] = {}
+        self.heap: list[tuple[float, bytes]] = []
+
+    def __len__(self) -> int:
+        """
+        Get the number of scheduled torrents.
+        """
+        return len(self.torrents)
+
+    def __contains__(self, infohash: bytes) -> bool:
+        """
+        Check if the torrent with the given infohash is scheduled.
+        """
+        return infohash in self.torrents
+
+    @staticmethod
+    def get_check_interval(torrent: ScheduledTorrent, now: float) -> float:
+        """
+        Get the time between the last check and the next check of the given torrent.
+        """
+        if torrent.popularity:
+            interval = HEALTH_FRESHNESS_SECONDS / (1 + math.log2(1 + torrent.popularity))
+        else:
+            interval = HEALTH_FRESHNESS_SECONDS * DEAD_TORRENT_SLOWDOWN
+        interval /= 1 + VOLATILITY_SPEEDUP * torrent.volatility
+        if now - torrent.interest < INTEREST_LIFETIME:
+            interval /= INTEREST_SPEEDUP
+        return min(MAX_CHECK_INTERVAL, max(MIN_CHECK_INTERVAL, interval))
+
+    def schedule(self, torrent: ScheduledTorrent, next_check: float) -> None:
+        """
+        Move the given torrent to the given time in the schedule.
+        """
+        torrent.next_check = next_check
+        heapq.heappush(self.heap, (next_check, torrent.infohash))
+        if len(self.heap) > 2 * len(self.torrents) + 64:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Drop the heap items of torrents that have been rescheduled since.
+        """
+        self.heap = [(torrent.next_check, infohash) for infohash, torrent in self.torrents.items()]
+        heapq.heapify(self.heap)
+
+    def reschedule(self, torrent: ScheduledTorrent, now: float) -> None:
+        """
+        Compute the next check of the given torrent and move it there in the schedule.
+        """
+        self.schedule(torrent, torrent.last_check + self.get_check_interval(torrent, now))
+
+    def update(self, health: HealthInfo, now: float | None = None) -> None:
+        """
+        Reschedule a torrent after its health was checked.
+        """
+        now = time.time() if now is None else now
+        torrent = self.torrents.get(health.infohash)
+        popularity = health.seeders + health.leechers
+        if torrent is None:
+            if not self.make_room(now):
+                return
+            torrent = self.torrents[health.infohash] = ScheduledTorrent(health.infohash, popularity=popularity)
+        elif torrent.last_check:
+            change = abs(popularity - torrent.popularity) / max(popularity, torrent.popularity, 1)
+            torrent.volatility = (1 - VOLATILITY_ALPHA) * torrent.volatility + VOLATILITY_ALPHA * change
+        torrent.popularity = popularity
+        torrent.last_check = health.last_check
+        self.reschedule(torrent, now)
+
+    def make_room(self, now: float) -> bool:
+        """
+        Forget the least popular torrents that were not shown to the user recently, if the schedule is full.
+
+        A batch of torrents is forgotten at once, so that the scan over all torrents is rare.
+
+        :return: whether there is room for another torrent.
+        """
+        if len(self.torrents) < self.max_size:
+            return True
+        candidates = [torrent for torrent in self.torrents.values() if now - torrent.interest >= INTEREST_LIFETIME]
+        evicted = heapq.nsmallest(max(1, int(self.max_size * EVICTED_FRACTION)), candidates,
+                                  key=lambda torrent: (torrent.popularity, -torrent.next_check))
+        for torrent in evicted:
+            del self.torrents[torrent.infohash]
+        return len(self.torrents) < self.max_size
+
+    def remove(self, infohash: bytes) -> None:
+        """
+        Stop scheduling the torrent with the given infohash, its heap items are skipped from now on.
+        """
+        self.torrents.pop(infohash, None)
+
+    def add_interest(self, infohashes: Iterable[bytes], now: float | None = None) -> None:
+        """
+        Check the given torrents sooner, because they were shown to the user.
+
+        Torrents that are not scheduled yet are added, without a previous check, so they are checked first. They are
+        added even if the schedule is full of torrents that were shown to the user as well.
+        """
+        now = time.time() if now is None else now
+        for infohash in infohashes:
+            torrent = self.torrents.get(infohash)
+            if torrent is None:
+                self.make_room(now)
+                torrent = self.torrents[infohash] = ScheduledTorrent(infohash)
+            elif now - torrent.interest < INTEREST_LIFETIME:
+                torrent.interest = now
+                continue
+            torrent.interest = now
+            self.reschedule(torrent, now)
+
+    def pop_due(self, count: int, now: float | None = None) -> list[bytes]:
+        """
+        Get the torrents that should be checked now, most overdue first.
+
+        The returned torrents are scheduled again after the shortest interval, in case their check fails to update
+        them.
+        """
+        now = time.time() if now is None else now
+        due: list[bytes] = []
+        while self.heap and self.heap[0][0] <= now and len(due) < count:
+            next_check, infohash = heapq.heappop(self.heap)
+            torrent = self.torrents.get(infohash)
+            if torrent is None or torrent.next_check != next_check:
+                continue  # Rescheduled since
+            due.append(infohash)
+            self.schedule(torrent, now + MIN_CHECK_INTERVAL)
+        return due
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import struct
+import time
+from typing import TYPE_CHECKING, TypedDict, cast
+
+from tribler.core.socks5.client import Socks5Client, Socks5Error
+from tribler.core.torrent_checker.healthdataclasses import HealthInfo
+
+if TYPE_CHECKING:
+    from tribler.core.libtorrent.download_manager.download_manager import DownloadManager
+
+MAX_SWARM_PROBES = 4  # Max number of swarms that we probe at the same time
+MAX_PROBED_PEERS = 20  # Max number of peers that we connect to for a single probe
+SWARM_PROBE_TIMEOUT = 20  # seconds, the hard limit on the duration of a probe, including waiting for a free slot
+MAX_DHT_PEERS = 200  # Max number of peers that we collect from the DHT for a single probe
+DHT_LOOKUP_SHARE = 0.5  # The fraction of the probe time that we spend on the DHT lookup
+MAX_PEER_MESSAGES = 4  # Max number of messages that we read from a peer while waiting for its pieces
+MAX_PEER_MESSAGE_SIZE = 1 << 17  # Bitfields of torrents with up to a million pieces fit
+
+PROTOCOL_HEADER = b"\x13BitTorrent protocol"
+RESERVED_BYTES = b"\x00\x00\x00\x00\x00\x10\x00\x04"  # Extension protocol (BEP10) and fast extension (BEP6)
+HANDSHAKE_SIZE = len(PROTOCOL_HEADER) + len(RESERVED_BYTES) + 20 + 20
+MESSAGE_HAVE = 4
+MESSAGE_BITFIELD = 5
+MESSAGE_HAVE_ALL = 14
+MESSAGE_HAVE_NONE = 15
+
+
+class SwarmProberStatistics(TypedDict):
+    """
+    The statistics of a swarm prober.
+    """
+
+    probes: int
+    running: int
+    peers_contacted: int
+    peers_answered: int
+
+
+def is_complete_bitfield(bitfield: bytes) -> bool:
+    """
+    Check if a bitfield, of which we do not know the number of pieces, has all pieces.
+
+    The spare bits at the end of a bitfield are zero, so a complete bitfield is all ones, followed by zeros in the last
+    byte.
+    """
+    if not bitfield or bitfield[:-1].count(0xFF) != len(bitfield) - 1:
+        return False
+    last = bitfield[-1]
+    return last != 0 and (last | (last - 1)) & 0xFF == 0xFF
+
+
+class SwarmProber:
+    """
+    Estimate the health of a swarm from its peers, without downloading its metadata.
+
+    A probe looks up the peers of a torrent in the DHT and connects to a sample of them. Each peer that completes the
+    handshake tells us which pieces it has, which makes it a seeder or a leecher. The seed ratio of the sample is then
+    applied to all distinct peers that the DHT returned.
+    """
+
+    def __init__(self, download_manager: DownloadManager, max_probes: int = MAX_SWARM_PROBES,
+                 max_peers: int = MAX_PROBED_PEERS, timeout: float = SWARM_PROBE_TIMEOUT) -> None:
+        """
+        Create a new prober.
+
+        :param download_manager: the download manager to perform DHT lookups with.
+        :param max_probes: the max number of probes to run at the same time, others wait for a free slot.
+        :param max_peers: the max number of peers to connect to for a single probe.
+        :param timeout: the hard limit on the duration of a probe, in seconds.
+        """
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self.download_manager = download_manager
+        self.max_peers = max_peers
+        self.timeout = timeout
+        self.slots = asyncio.Semaphore(max_probes)
+        self.peer_id = b"-TL0000-" + os.urandom(6).hex().encode()
+
+        self.probes = 0
+        self.running = 0
+        self.peers_contacted = 0
+        self.peers_answered = 0
+
+    async def probe(self, infohash: bytes, hops: int = 0, proxy: tuple | None = None) -> HealthInfo | None:
+        """
+        Estimate the number of seeders and leechers of the given torrent.
+
+        :param hops: the number of hops of the session to perform the DHT lookup with.
+        :param proxy: the SOCKS5 proxy to connect to peers through, or None to connect to them directly.
+        :return: the health of the torrent, or None if no peers were found in time.
+        """
+        deadline = time.monotonic() + self.timeout
+        try:
+            async with asyncio.timeout(self.timeout), self.slots:
+                self.probes += 1
+                self.running += 1
+                try:
+                    return await self.probe_swarm(infohash, deadline, hops, proxy)
+                finally:
+                    self.running -= 1
+        except TimeoutError:
+            self._logger.info("Probing swarm %s timed out", infohash.hex())
+            return None
+
+    async def probe_swarm(self, infohash: bytes, deadline: float, hops: int = 0,
+                          proxy: tuple | None = None) -> HealthInfo | None:
+        """
+        Look up the peers of the given torrent and ask a sample of them which pieces they have.
+        """
+        lookup_time = (deadline - time.monotonic()) * DHT_LOOKUP_SHARE
+        peers = await self.download_manager.get_dht_peers(infohash, lookup_time, MAX_DHT_PEERS, hops)
+        if not peers:
+            return None
+
+        sample = random.sample(sorted(peers), min(self.max_peers, len(peers)))
+        self.peers_contacted += len(sample)
+        # Stop waiting for peers a little before the deadline, so the answers that did come in are not lost
+        peer_timeout = deadline - time.monotonic() - 1
+        results = await asyncio.gather(*[self.probe_peer(infohash, peer, peer_timeout, proxy) for peer in sample])
+        answers = [is_seeder for is_seeder in results if is_seeder is not None]
+        self.peers_answered += len(answers)
+
+        seeders = round(len(peers) * answers.count(True) / len(answers)) if answers else 0
+        self._logger.info("Probed swarm %s: %d peers, %d of %d sampled peers answered", infohash.hex(),
+                          len(peers), len(answers), len(sample))
+        return HealthInfo(infohash, seeders=seeders, leechers=len(peers) - seeders, last_check=int(time.time()),
+                          self_checked=True)
+
+    async def open_connection(self, address: tuple[str, int], proxy: tuple | None
+                              ) -> tuple[asyncio.StreamReader, asyncio.StreamWriter | asyncio.WriteTransport]:
+        """
+        Connect to a peer, directly or through a SOCKS5 proxy.
+
+        :return: the reader of the incoming data and the writer to send data with and close.
+        """
+        if proxy is None:
+            return await asyncio.open_connection(*address)
+        reader = asyncio.StreamReader()
+        client = Socks5Client(proxy, lambda data, _: reader.feed_data(data))
+        try:
+            await client.connect_tcp(address)
+        except Socks5Error as e:
+            if client.transport is not None:
+                client.transport.close()
+            raise OSError(e) from e
+        return reader, cast("asyncio.WriteTransport", client.transport)
+
+    async def probe_peer(self, infohash: bytes, address: tuple[str, int], timeout: float,
+                         proxy: tuple | None = None) -> bool | None:
+        """
+        Perform a handshake with a peer and read which pieces it has.
+
+        :return: whether the peer is a seeder, or None if it did not tell us in time.
+        """
+        writer = None
+        try:
+            async with asyncio.timeout(max(timeout, 0)):
+                reader, writer = await self.open_connection(address, proxy)
+                writer.write(PROTOCOL_HEADER + RESERVED_BYTES + infohash + self.peer_id)
+                handshake = await reader.readexactly(HANDSHAKE_SIZE)
+                if not handshake.startswith(PROTOCOL_HEADER) or handshake[28:48] != infohash:
+                    return None
+                for _ in range(MAX_PEER_MESSAGES):
+                    length, = struct.unpack(">I", await reader.readexactly(4))
+                    if length == 0:
+                        continue  # Keep-alive
+                    if length > MAX_PEER_MESSAGE_SIZE:
+                        return None
+                    message = await reader.readexactly(length)
+                    if message[0] == MESSAGE_BITFIELD:
+                        return is_complete_bitfield(message[1:])
+                    if message[0] == MESSAGE_HAVE_ALL:
+                        return True
+                    if message[0] in (MESSAGE_HAVE_NONE, MESSAGE_HAVE):
+                        return False  # Peers without pieces may skip the bitfield and send haves later
+                return None
+        except (OSError, TimeoutError, asyncio.IncompleteReadError):
+            return None
+        finally:
+            if writer is not None:
+                writer.close()
+
+    def get_statistics(self) -> SwarmProberStatistics:
+        """
+        Get the counters of this prober.
+        """
+        return SwarmProberStatistics(
+            probes=self.probes,
+            running=self.running,
+            peers_contacted=self.peers_contacted,
+            peers_answered=self.peers_answered
+        )
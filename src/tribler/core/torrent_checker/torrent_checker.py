@@ -7,7 +7,7 @@ import time
 from asyncio import CancelledError, DatagramTransport
 from binascii import hexlify
 from collections import defaultdict
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, TypedDict, cast
 
 from ipv8.taskmanager import TaskManager
 from pony.orm import db_session, desc, select
@@ -15,26 +15,35 @@ from pony.utils import between
 
 from tribler.core.libtorrent.trackers import MalformedTrackerURLException, is_valid_url
 from tribler.core.notifier import Notification, Notifier
+from tribler.core.torrent_checker.alive_index import AliveTorrentIndex
+from tribler.core.torrent_checker.bulk_scheduler import BulkHealthScheduler
+from tribler.core.torrent_checker.check_schedule import MAX_SCHEDULED_TORRENTS, HealthCheckSchedule
 from tribler.core.torrent_checker.healthdataclasses import HEALTH_FRESHNESS_SECONDS, HealthInfo, TrackerResponse
+from tribler.core.torrent_checker.swarm_prober import SwarmProber
 from tribler.core.torrent_checker.torrentchecker_session import (
+    MAX_INFOHASHES_IN_UDP_SCRAPE,
+    HttpSessionPool,
     TrackerSession,
     UdpSocketManager,
     create_tracker_session,
 )
 from tribler.core.torrent_checker.tracker_manager import MAX_TRACKER_FAILURES, TrackerManager
+from tribler.core.torrent_checker.tracker_scoreboard import TrackerScoreboard
 
 if TYPE_CHECKING:
+    from tribler.core.database.orm_bindings.torrent_state import TorrentState
     from tribler.core.database.orm_bindings.tracker_state import TrackerState
     from tribler.core.database.store import MetadataStore
     from tribler.core.libtorrent.download_manager.download_manager import DownloadManager
     from tribler.tribler_config import TriblerConfigManager
 
-TRACKER_SELECTION_INTERVAL = 1  # The interval for querying a random tracker
+TRACKER_SELECTION_INTERVAL = 1  # The interval for starting bulk tracker checks
 TORRENT_SELECTION_INTERVAL = 10  # The interval for checking the health of a random torrent
+DOWNLOAD_HEALTH_INTERVAL = 300  # The interval for collecting the health of the torrents that we download or seed
 MIN_TORRENT_CHECK_INTERVAL = 900  # How much time we should wait before checking a torrent again
+FRESH_HEALTH_INTERVAL = 60  # How long our own check result is returned, even if a check is forced
 TORRENT_CHECK_RETRY_INTERVAL = 30  # Interval when the torrent was successfully checked for the last time
 MAX_TORRENTS_CHECKED_PER_SESSION = 5  # Maximum simultaneous health checks.
-SWARM_HEALTH_CHECK_TIMEOUT = 240  # Number of seconds to spend in a swarm when doing a health check.
 
 TORRENT_SELECTION_POOL_SIZE = 5  # How many torrents to check (popular or random) during periodic check
 TORRENTS_CHECKED_RETURN_SIZE = 240  # Estimated torrents checked on default 4 hours idle run
@@ -52,6 +61,18 @@ def aggregate_responses_for_infohash(infohash: bytes, responses: list[TrackerRes
     return result
 
 
+class HealthCheckStatistics(TypedDict):
+    """
+    The statistics of the health checks of single torrents.
+    """
+
+    checks: int
+    cache_hits: int
+    coalesced: int
+    running: int
+    downloading: int
+
+
 class TorrentChecker(TaskManager):
     """
     A class to check the health of torrents.
@@ -80,17 +101,39 @@ class TorrentChecker(TaskManager):
         self._should_stop = False
         self.sessions: dict[str, list[TrackerSession]] = defaultdict(list)
         self.socket_mgr = UdpSocketManager()
+        self.http_pool = HttpSessionPool()
         self.udp_transport: DatagramTransport | None = None
 
         # We keep track of the results of popular torrents checked by you.
         # The content_discovery community gossips this information around.
         self._torrents_checked: dict[bytes, HealthInfo] | None = None
+        self._alive_torrents: AliveTorrentIndex | None = None
+        self._swarm_prober: SwarmProber | None = None
+
+        self.tracker_scores = TrackerScoreboard()
+        self.bulk_scheduler = BulkHealthScheduler(self)
+        # When to check the health of the torrents that we know, the most urgent ones first
+        self.check_schedule = HealthCheckSchedule()
+
+        # The running health checks of single torrents, which concurrent requests for the same torrent share
+        self.health_checks: dict[bytes, asyncio.Future[HealthInfo]] = {}
+        self.checks = 0
+        self.cache_hits = 0
+        self.coalesced_checks = 0
+        # The torrents of which our downloads keep us informed of the health, which we do not check separately
+        self.downloading: set[bytes] = set()
 
     async def initialize(self) -> None:
         """
         Start all the looping tasks for the checker and creata socket.
         """
+        self.register_task("load check schedule", self.load_check_schedule)
         self.register_task("check local torrents", self.check_local_torrents, interval=TORRENT_SELECTION_INTERVAL)
+        self.register_task("check downloading torrents", self.check_downloading_torrents,
+                           interval=DOWNLOAD_HEALTH_INTERVAL)
+        if self.config.get("torrent_checker/bulk_checks"):
+            self.register_task("check stale torrents in bulk", self.bulk_scheduler.schedule,
+                               interval=TRACKER_SELECTION_INTERVAL)
         await self.create_socket_or_schedule()
 
     async def listen_on_udp(self) -> DatagramTransport:
@@ -126,6 +169,7 @@ class TorrentChecker(TaskManager):
             self.udp_transport = None
 
         await self.shutdown_task_manager()
+        await self.http_pool.close()
 
     async def check_random_tracker(self) -> None:
         """
@@ -149,7 +193,9 @@ class TorrentChecker(TaskManager):
             torrents = select(ts for ts in tracker.torrents
                               if ts.has_data == 1  # The condition had to be written this way for the index to work
                               and ts.last_check + dynamic_interval < int(time.time()))
-            infohashes = [t.infohash for t in torrents[:MAX_TORRENTS_CHECKED_PER_SESSION]]
+            # A single UDP scrape packet fits many infohashes, so fill it instead of sending more packets later
+            limit = MAX_INFOHASHES_IN_UDP_SCRAPE if url.startswith("udp") else MAX_TORRENTS_CHECKED_PER_SESSION
+            infohashes = [t.infohash for t in torrents[:limit]]
 
         if len(infohashes) == 0:
             # We have no torrent to recheck for this tracker. Still update the last_check for this tracker.
@@ -197,11 +243,13 @@ class TorrentChecker(TaskManager):
             exception_str = str(e).replace("\n]", "]")
             self._logger.warning("Got session error for the tracker: %s\n%s", session.tracker_url, exception_str)
             self.tracker_manager.update_tracker_info(session.tracker_url, False)
+            self.tracker_scores.record_failure(session.tracker_url, exception_str)
             raise e  # noqa: TRY201
         finally:
             await self.clean_session(session)
 
         t2 = time.time()
+        self.tracker_scores.record_success(session.tracker_url, t2 - t1)
         self._logger.info("Got response from %s in %f seconds: %s", session.__class__.__name__, round(t2 - t1, 3),
                           str(result))
 
@@ -219,6 +267,27 @@ class TorrentChecker(TaskManager):
             self._logger.info("Initially loaded self-checked torrents:\n%s", lines)
         return self._torrents_checked
 
+    @property
+    def alive_torrents(self) -> AliveTorrentIndex:
+        """
+        Get the checked torrents that had seeders, indexed by popularity and for random sampling.
+        """
+        if self._alive_torrents is None:
+            self._alive_torrents = AliveTorrentIndex(self.torrents_checked.values())
+        return self._alive_torrents
+
+    @property
+    def swarm_prober(self) -> SwarmProber:
+        """
+        Get the prober that estimates the health of torrents that trackers do not know, limited by our config.
+        """
+        if self._swarm_prober is None:
+            self._swarm_prober = SwarmProber(self.download_manager,
+                                             max_probes=self.config.get("torrent_checker/max_swarm_probes"),
+                                             max_peers=self.config.get("torrent_checker/max_probed_peers"),
+                                             timeout=self.config.get("torrent_checker/swarm_probe_timeout"))
+        return self._swarm_prober
+
     @db_session
     def load_torrents_checked_from_db(self) -> dict[bytes, HealthInfo]:
         """
@@ -240,43 +309,70 @@ class TorrentChecker(TaskManager):
         return result
 
     @db_session
-    def torrents_to_check(self) -> list:
+    def load_check_schedule_from_db(self) -> list[HealthInfo]:
         """
-        Two categories of torrents are selected (popular & old). From the pool of selected torrents, a certain
-        number of them are submitted for health check. The torrents that are within the freshness window are
-        excluded from the selection considering the health information is still fresh.
-
-        1. Popular torrents (50%)
-        The indicator for popularity here is considered as the seeder count with direct proportionality
-        assuming more seeders -> more popular. There could be other indicators to be introduced later.
-
-        2. Old torrents (50%)
-        By old torrents, we refer to those checked quite farther in the past, sorted by the last_check value.
+        Load the health of the torrents to schedule checks for, the most popular ones first.
         """
-        last_fresh_time = time.time() - HEALTH_FRESHNESS_SECONDS
-        popular_torrents = list(self.mds.TorrentState.select(
+        checked_torrents = self.mds.TorrentState.select(
             lambda g: g.has_data == 1  # The condition had to be written this way for the partial index to work
-            and g.last_check < last_fresh_time
-        ).order_by(lambda g: (desc(g.seeders), g.last_check)).limit(TORRENT_SELECTION_POOL_SIZE))
+        ).order_by(lambda g: desc(g.seeders)).limit(MAX_SCHEDULED_TORRENTS)
+        return [torrent.to_health() for torrent in checked_torrents]
 
-        old_torrents = list(self.mds.TorrentState.select(
-            lambda g: g.has_data == 1  # The condition had to be written this way for the partial index to work
-            and g.last_check < last_fresh_time
-        ).order_by(lambda g: (g.last_check, desc(g.seeders))).limit(TORRENT_SELECTION_POOL_SIZE))
+    async def load_check_schedule(self) -> None:
+        """
+        Schedule the next health check of the torrents in the database.
+        """
+        health_infos = await self.mds.run_threaded(self.load_check_schedule_from_db)
+        now = time.time()
+        for health in health_infos:
+            if health.infohash not in self.check_schedule:
+                self.check_schedule.update(health, now)
+        self._logger.info("Scheduled the health checks of %d torrents", len(self.check_schedule))
+
+    def torrents_to_check(self) -> list[bytes]:
+        """
+        Get the torrents of which the health check is due, the most overdue first.
 
-        selected_torrents = popular_torrents + old_torrents
-        return random.sample(selected_torrents, min(TORRENT_SELECTION_POOL_SIZE, len(selected_torrents)))
+        How often a torrent is checked depends on its popularity, how much its health changed between previous
+        checks and whether it was recently shown to the user.
+        """
+        return [infohash for infohash in self.check_schedule.pop_due(TORRENT_SELECTION_POOL_SIZE)
+                if infohash not in self.downloading]
 
-    async def check_local_torrents(self) -> tuple[list, list]:
+    async def check_local_torrents(self) -> tuple[list[bytes], list[HealthInfo]]:
         """
-        Perform a full health check on a few popular and old torrents in the database.
+        Perform a full health check on the torrents in the database that are due for one.
         """
         selected_torrents = self.torrents_to_check()
         self._logger.info("Check %d local torrents", len(selected_torrents))
-        results = await asyncio.gather(*[self.check_torrent_health(t.infohash) for t in selected_torrents])
+        results = await asyncio.gather(*[self.check_torrent_health(infohash) for infohash in selected_torrents])
         self._logger.info("Results for local torrents check: %s", str(results))
         return selected_torrents, results
 
+    def check_downloading_torrents(self) -> list[HealthInfo]:
+        """
+        Update the health of the torrents that we download or seed, from what their trackers and peers told libtorrent.
+
+        Libtorrent already announces these torrents to their trackers, so they are skipped by our own health checks.
+        Anonymous and hidden downloads are left out: we gossip our own health checks, which would give them away.
+        """
+        now = int(time.time())
+        downloading = set()
+        results = []
+        for download in self.download_manager.get_downloads():
+            if download.hidden or download.config.get_hops() > 0:
+                continue
+            seeders, leechers = download.get_state().get_swarm_size()
+            if seeders == 0 and leechers == 0:
+                continue
+            health = HealthInfo(download.get_def().infohash, seeders, leechers, last_check=now, self_checked=True)
+            downloading.add(health.infohash)
+            self.update_torrent_health(health)
+            results.append(health)
+        self.downloading = downloading
+        self._logger.info("Results for downloading torrents check: %s", str(results))
+        return results
+
     def get_next_tracker(self) -> TrackerState | None:
         """
         Return the next unchecked tracker.
@@ -314,30 +410,66 @@ class TorrentChecker(TaskManager):
         """
         Check the health of a torrent with a given infohash.
 
+        Concurrent checks of the same torrent share a single check: later callers await the result of the first one.
+
         :param infohash: Torrent infohash.
         :param timeout: The timeout to use in the performed requests
         :param scrape_now: Flag whether we want to force scraping immediately
         """
+        if cached := self.get_cached_health(infohash, scrape_now):
+            self.cache_hits += 1
+            return cached
+
+        check = self.health_checks.get(infohash)
+        if check is not None:
+            self._logger.info("Joining the running health check for the torrent: %s", hexlify(infohash).decode())
+            self.coalesced_checks += 1
+        else:
+            self.checks += 1
+            check = self.register_anonymous_task("Check torrent health", self._check_torrent_health, infohash, timeout)
+            self.health_checks[infohash] = check
+            check.add_done_callback(lambda _: self.health_checks.pop(infohash, None))
+        # Callers that stop waiting, like a timed out request, should not cancel the check for the others
+        return await asyncio.shield(check)
+
+    def get_cached_health(self, infohash: bytes, scrape_now: bool = False) -> HealthInfo | None:
+        """
+        Get the health of a torrent from the database, if it was checked recently enough to skip a new check.
+
+        Our own checks of the last minute are returned even if a check is forced.
+        """
+        with db_session:
+            torrent_state = self.mds.TorrentState.get(infohash=infohash)
+            if not torrent_state:
+                return None
+            time_diff = time.time() - torrent_state.last_check
+            recent = time_diff < MIN_TORRENT_CHECK_INTERVAL and not scrape_now
+            fresh = time_diff < FRESH_HEALTH_INTERVAL and torrent_state.self_checked
+            if recent or fresh:
+                self._logger.info("Time interval too short, not doing torrent health check for %s",
+                                  hexlify(infohash).decode())
+                return torrent_state.to_health()
+        return None
+
+    async def _check_torrent_health(self, infohash: bytes, timeout: float) -> HealthInfo:
+        """
+        Check the health of a torrent with a given infohash, by contacting its trackers or by joining its swarm.
+        """
         infohash_hex = hexlify(infohash).decode()
         self._logger.info("Check health for the torrent: %s", infohash_hex)
-        tracker_set = []
+        tracker_set = set()
 
-        # We first check whether the torrent is already in the database and checked before
         with db_session:
             torrent_state = self.mds.TorrentState.get(infohash=infohash)
             if torrent_state:
-                last_check = torrent_state.last_check
-                time_diff = time.time() - last_check
-                if time_diff < MIN_TORRENT_CHECK_INTERVAL and not scrape_now:
-                    self._logger.info("Time interval too short, not doing torrent health check for %s", infohash_hex)
-                    return torrent_state.to_health()
-
-                # get torrent's tracker list from DB
                 tracker_set = self.get_valid_trackers_of_torrent(torrent_state.infohash)
                 self._logger.info("Trackers for %s: %s", infohash_hex, str(tracker_set))
 
         coroutines = []
         for tracker_url in tracker_set:
+            if not self.tracker_scores.allow(tracker_url):
+                self._logger.info("Skipping tracker %s, it failed too often recently", tracker_url)
+                continue
             if session := self.create_session_for_request(tracker_url, timeout=timeout):
                 session.add_infohash(infohash)
                 coroutines.append(self.get_tracker_response(session))
@@ -347,30 +479,64 @@ class TorrentChecker(TaskManager):
         health = aggregate_responses_for_infohash(infohash, cast("list[TrackerResponse]", successful_responses))
 
         if health.seeders == 0 and health.leechers == 0:
-            self._logger.info("Contacting trackers yielded no results, joining swarm %s", infohash_hex)
-            if metainfo := await self.download_manager.get_metainfo(infohash,timeout=SWARM_HEALTH_CHECK_TIMEOUT,
-                                                                    health_check=True):
-                health = HealthInfo(infohash, seeders=metainfo.get("seeders", 0), leechers=metainfo.get("leechers", 0),
-                                    last_check=int(time.time()), self_checked=True)
+            self._logger.info("Contacting trackers yielded no results, probing swarm %s", infohash_hex)
+            health = await self.probe_swarm(infohash) or health
 
         self.update_torrent_health(health)
         return health
 
-    def create_session_for_request(self, tracker_url: str, timeout: float = 20) -> TrackerSession | None:
+    def get_statistics(self) -> HealthCheckStatistics:
         """
-        Create a tracker session for a given url.
+        Get the counters of the health checks of single torrents.
         """
-        self._logger.debug("Creating a session for the request: %s", tracker_url)
+        return HealthCheckStatistics(
+            checks=self.checks,
+            cache_hits=self.cache_hits,
+            coalesced=self.coalesced_checks,
+            running=len(self.health_checks),
+            downloading=len(self.downloading)
+        )
+
+    def get_proxy(self) -> tuple[str, int] | None:
+        """
+        Get the SOCKS5 proxy for the number of hops in our config, or None if we should not use hops.
 
+        :raises ValueError: if the required number of hops is not available.
+        """
         required_hops = self.config.get("libtorrent/download_defaults/number_hops")
         actual_hops = len(self.socks_listen_ports or [])
         if required_hops > actual_hops:
-            self._logger.warning("Dropping the request. Required amount of hops not reached. "
-                                 "Required hops: %d. Actual hops: %d", required_hops, actual_hops)
-            return None
+            msg = f"Required amount of hops not reached. Required hops: {required_hops}. Actual hops: {actual_hops}"
+            raise ValueError(msg)
         listen_ports = cast("list[int]", self.socks_listen_ports)  # Guaranteed by check above
-        proxy = ("127.0.0.1", listen_ports[required_hops - 1]) if required_hops > 0 else None
-        session = create_tracker_session(tracker_url, timeout, proxy, self.socket_mgr)
+        return ("127.0.0.1", listen_ports[required_hops - 1]) if required_hops > 0 else None
+
+    async def probe_swarm(self, infohash: bytes) -> HealthInfo | None:
+        """
+        Estimate the health of a torrent from its peers, over the number of hops in our config.
+        """
+        try:
+            proxy = self.get_proxy()
+        except ValueError as e:
+            self._logger.warning("Not probing swarm. %s", e)
+            return None
+        return await self.swarm_prober.probe(infohash, self.config.get("libtorrent/download_defaults/number_hops"),
+                                             proxy)
+
+    def create_session_for_request(self, tracker_url: str, timeout: float = 20) -> TrackerSession | None:
+        """
+        Create a tracker session for a given url.
+        """
+        self._logger.debug("Creating a session for the request: %s", tracker_url)
+
+        try:
+            proxy = self.get_proxy()
+        except ValueError as e:
+            self._logger.warning("Dropping the request. %s", e)
+            return None
+        # Do not wait longer for a tracker than it usually takes to respond, with a margin
+        timeout = self.tracker_scores.get_timeout(tracker_url, timeout)
+        session = create_tracker_session(tracker_url, timeout, proxy, self.socket_mgr, self.http_pool)
         self._logger.info("Tracker session has been created: %s", str(session))
         self.sessions[tracker_url].append(session)
         return session
@@ -409,6 +575,7 @@ class TorrentChecker(TaskManager):
             torrent_state = self.mds.TorrentState.get_for_update(infohash=health.infohash)
             if not torrent_state:
                 self._logger.warning("Unknown torrent: %s", hexlify(health.infohash).decode())
+                self.check_schedule.remove(health.infohash)
                 return False
 
             prev_health = torrent_state.to_health()
@@ -417,16 +584,24 @@ class TorrentChecker(TaskManager):
                 self.notify(prev_health)  # to update UI state from "Checking..."
                 return False
 
-            # Store the tracker where we got the health information from in the database.
-            # The tracker_id defaults to 0, indicating we obtained the health information using get_metainfo.
-            tracker_id = next((tr.rowid for tr in torrent_state.trackers if tr.url == health.tracker), 0)
-            torrent_state.set(seeders=health.seeders, leechers=health.leechers, last_check=health.last_check,
-                              tracker_id=tracker_id, self_checked=True)
+            self.set_torrent_health(torrent_state, health)
 
+        self.check_schedule.update(health)
         self.torrents_checked[health.infohash] = health
+        self.alive_torrents.update(health)
         self.notify(health)
         return True
 
+    def set_torrent_health(self, torrent_state: TorrentState, health: HealthInfo) -> None:
+        """
+        Store the given health in the given torrent state, this should be called in a db_session.
+        """
+        # Store the tracker where we got the health information from in the database.
+        # The tracker_id defaults to 0, indicating we obtained the health information using get_metainfo.
+        tracker_id = next((tr.rowid for tr in torrent_state.trackers if tr.url == health.tracker), 0)
+        torrent_state.set(seeders=health.seeders, leechers=health.leechers, last_check=health.last_check,
+                          tracker_id=tracker_id, self_checked=True)
+
     def notify(self, health: HealthInfo) -> None:
         """
         Send a health update to the GUI.
@@ -8,10 +8,11 @@ import time
 from abc import ABCMeta, abstractmethod
 from asyncio import DatagramProtocol, Future, Task, ensure_future, get_event_loop
 from asyncio import timeout as asynctimeout
+from collections import OrderedDict
 from typing import TYPE_CHECKING, Any, NoReturn, cast
 
 import libtorrent as lt
-from aiohttp import ClientResponseError, ClientSession, ClientTimeout
+from aiohttp import ClientResponseError, ClientSession, ClientTimeout, TCPConnector
 from ipv8.taskmanager import TaskManager
 
 from tribler.core.libtorrent.trackers import add_url_params, parse_tracker_url
@@ -32,6 +33,16 @@ TRACKER_ACTION_SCRAPE = 2
 UDP_TRACKER_INIT_CONNECTION_ID = 0x41727101980
 
 MAX_INFOHASHES_IN_SCRAPE = 60
+MAX_INFOHASHES_IN_UDP_SCRAPE = 74  # The most that fits in a single UDP scrape request (BEP15)
+UDP_CONNECTION_ID_LIFETIME = 55  # seconds, BEP15 allows 60 seconds, we keep a margin for the round trip
+
+MAX_HTTP_CONNECTIONS = 32  # Max number of open connections to HTTP trackers, per proxy
+MAX_HTTP_CONNECTIONS_PER_HOST = 2  # Max number of open connections to a single HTTP tracker
+HTTP_KEEPALIVE_TIMEOUT = 60  # seconds, how long an idle connection to an HTTP tracker is kept open
+HTTP_DNS_CACHE_TTL = 600  # seconds, how long the address of an HTTP tracker is cached
+MULTI_SCRAPE_REJECTIONS = (400, 414)  # The HTTP status codes of trackers that reject a scrape of multiple infohashes
+SINGLE_SCRAPE_EXPIRY = 24 * 3600  # seconds, after which we try to scrape multiple infohashes from a tracker again
+MAX_SINGLE_SCRAPE_TRACKERS = 1000  # Max number of trackers to remember that they reject scrapes of multiple infohashes
 
 
 class TrackerSession(TaskManager):
@@ -41,6 +52,8 @@ class TrackerSession(TaskManager):
 
     __meta__ = ABCMeta
 
+    max_infohashes = MAX_INFOHASHES_IN_SCRAPE
+
     def __init__(self, tracker_type: str, tracker_url: str, tracker_address: tuple[str, int], announce_page: str,
                  timeout: float) -> None:
         """
@@ -92,7 +105,7 @@ class TrackerSession(TaskManager):
         """
         assert not self.is_initiated, "Must not add request to an initiated session."
         assert not self.has_infohash(infohash), "Must not add duplicate requests"
-        if len(self.infohash_list) < MAX_INFOHASHES_IN_SCRAPE:
+        if len(self.infohash_list) < self.max_infohashes:
             self.infohash_list.append(infohash)
 
     def failed(self, msg: str | None = None) -> NoReturn:
@@ -121,14 +134,22 @@ class HttpTrackerSession(TrackerSession):
     """
 
     def __init__(self, tracker_url: str, tracker_address: tuple[str, int], announce_page: str, timeout: float,
-                 proxy: tuple | None) -> None:
+                 proxy: tuple | None, session_pool: HttpSessionPool | None = None) -> None:
         """
         Create a new HTTP tracker session.
+
+        :param session_pool: the pool of connections to share with other sessions, or None to use a private connection.
         """
         super().__init__("http", tracker_url, tracker_address, announce_page, timeout)
-        self.session = ClientSession(connector=Socks5Connector(proxy) if proxy else None,
-                                     raise_for_status=True,
-                                     timeout=ClientTimeout(total=self.timeout))
+        self.session_pool = session_pool
+        if session_pool is None:
+            self.session = ClientSession(connector=Socks5Connector(proxy) if proxy else None,
+                                         raise_for_status=True,
+                                         timeout=ClientTimeout(total=self.timeout))
+        else:
+            self.session = session_pool.get_session(proxy)
+            if not session_pool.supports_multi_scrape(tracker_url):
+                self.max_infohashes = 1
 
     async def connect_to_tracker(self) -> TrackerResponse:
         """
@@ -139,28 +160,53 @@ class HttpTrackerSession(TrackerSession):
         #       which has some sort of 'key' as parameter, so we need to use the add_url_params
         #       utility function to handle such cases.
 
-        url = add_url_params("http://{}:{}{}".format(self.tracker_address[0], self.tracker_address[1],
-                              self.announce_page.replace("announce", "scrape")),
-                             {"info_hash": self.infohash_list})
-
         # no more requests can be appended to this session
         self.is_initiated = True
         self.last_contact = int(time.time())
 
         try:
-            self._logger.debug("%s HTTP SCRAPE message sent: %s", self, url)
-            async with self.session, self.session.get(url.encode("ascii").decode()) as response:
-                body = await response.read()
+            body = await self.scrape()
         except UnicodeEncodeError:
             raise
         except ClientResponseError as e:
             self._logger.warning("%s HTTP SCRAPE error response code %s", self, e.status)
-            self.failed(msg=f"error code {e.status}")
+            if self.session_pool is None or len(self.infohash_list) == 1 or e.status not in MULTI_SCRAPE_REJECTIONS:
+                self.failed(msg=f"error code {e.status}")
+            body = await self.retry_single_scrape()
         except Exception as e:
             self.failed(msg=str(e))
 
         return self.process_scrape_response(body)
 
+    async def scrape(self) -> bytes:
+        """
+        Send a scrape request for our infohashes and return the body of the response.
+        """
+        url = add_url_params("http://{}:{}{}".format(self.tracker_address[0], self.tracker_address[1],
+                              self.announce_page.replace("announce", "scrape")),
+                             {"info_hash": self.infohash_list})
+        self._logger.debug("%s HTTP SCRAPE message sent: %s", self, url)
+        async with self.session.get(url.encode("ascii").decode(),
+                                    timeout=ClientTimeout(total=self.timeout)) as response:
+            return await response.read()
+
+    async def retry_single_scrape(self) -> bytes:
+        """
+        Scrape only our first infohash, after the tracker rejected a scrape of all of them.
+
+        If the tracker answers, it does not support scraping multiple infohashes and our other infohashes are left to
+        later sessions, of a single infohash each. If it does not, the tracker is failing for another reason.
+        """
+        self.infohash_list = self.infohash_list[:1]
+        try:
+            body = await self.scrape()
+        except ClientResponseError as e:
+            self.failed(msg=f"error code {e.status}")
+        except Exception as e:
+            self.failed(msg=str(e))
+        cast("HttpSessionPool", self.session_pool).reject_multi_scrape(self.tracker_url)
+        return body
+
     def process_scrape_response(self, body: bytes | None) -> TrackerResponse:
         """
         This function handles the response body of an HTTP result from an HTTP tracker.
@@ -204,11 +250,77 @@ class HttpTrackerSession(TrackerSession):
     async def cleanup(self) -> None:
         """
         Cleans the session by cancelling all deferreds and closing sockets.
+
+        The connections of a pooled session are left open, to be reused by later sessions.
         """
-        await self.session.close()
+        if self.session_pool is None:
+            await self.session.close()
         await super().cleanup()
 
 
+class HttpSessionPool:
+    """
+    The HTTP sessions that are shared between HTTP tracker sessions, one per proxy.
+
+    Sharing a session keeps connections to trackers alive and caches their addresses between scrapes, instead of
+    opening a new connection, with a new DNS lookup and TLS handshake, for every scrape.
+    """
+
+    def __init__(self, max_connections: int = MAX_HTTP_CONNECTIONS,
+                 max_connections_per_host: int = MAX_HTTP_CONNECTIONS_PER_HOST) -> None:
+        """
+        Create a new, empty, pool.
+        """
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.sessions: dict[tuple | None, ClientSession] = {}
+        # The trackers that rejected a scrape of multiple infohashes and when they did so, the oldest first
+        self.single_scrape_trackers: OrderedDict[str, float] = OrderedDict()
+
+    def get_session(self, proxy: tuple | None) -> ClientSession:
+        """
+        Get the shared session for the given proxy, creating it if it does not exist yet.
+        """
+        session = self.sessions.get(proxy)
+        if session is None or session.closed:
+            if proxy:
+                connector: TCPConnector = Socks5Connector(proxy, limit=self.max_connections,
+                                                          limit_per_host=self.max_connections_per_host,
+                                                          keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT)
+            else:
+                connector = TCPConnector(limit=self.max_connections, limit_per_host=self.max_connections_per_host,
+                                         keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT, ttl_dns_cache=HTTP_DNS_CACHE_TTL)
+            session = self.sessions[proxy] = ClientSession(connector=connector, raise_for_status=True)
+        return session
+
+    def supports_multi_scrape(self, tracker_url: str) -> bool:
+        """
+        Whether we can scrape multiple infohashes at once from the given tracker.
+        """
+        rejected = self.single_scrape_trackers.get(tracker_url)
+        if rejected is not None and rejected < time.time() - SINGLE_SCRAPE_EXPIRY:
+            del self.single_scrape_trackers[tracker_url]
+            return True
+        return rejected is None
+
+    def reject_multi_scrape(self, tracker_url: str) -> None:
+        """
+        Scrape a single infohash at a time from the given tracker, for a while.
+        """
+        self.single_scrape_trackers[tracker_url] = time.time()
+        self.single_scrape_trackers.move_to_end(tracker_url)
+        if len(self.single_scrape_trackers) > MAX_SINGLE_SCRAPE_TRACKERS:
+            self.single_scrape_trackers.popitem(last=False)
+
+    async def close(self) -> None:
+        """
+        Close all sessions and their connections.
+        """
+        for session in self.sessions.values():
+            await session.close()
+        self.sessions.clear()
+
+
 class UdpSocketManager(DatagramProtocol):
     """
     The UdpSocketManager ensures that the network packets are forwarded to the right UdpTrackerSession.
@@ -220,6 +332,8 @@ class UdpSocketManager(DatagramProtocol):
         """
         self._logger = logging.getLogger(self.__class__.__name__)
         self.tracker_sessions: dict[int, Future[bytes]] = {}
+        # The connection IDs that trackers gave us and when we got them, by tracker address and proxy
+        self.connection_ids: dict[tuple[tuple[str, int], tuple | None], tuple[int, float]] = {}
         self.transport: Socks5Client | None = None
         self.proxy_transports: dict[tuple, Socks5Client] = {}
 
@@ -281,8 +395,10 @@ class UdpTrackerSession(TrackerSession):
     and communication with the torrent checker by making use of Deferred (asynchronously).
     """
 
-    # A list of transaction IDs that have been used in order to avoid conflict.
-    _active_session_dict: dict[UdpTrackerSession, int] = {}
+    max_infohashes = MAX_INFOHASHES_IN_UDP_SCRAPE
+
+    # The sessions by the transaction IDs that they use, in order to avoid conflict.
+    _active_sessions: dict[int, UdpTrackerSession] = {}
 
     def __init__(self, tracker_url: str, tracker_address: tuple[str, int], announce_page: str,
                  timeout: float, proxy: tuple | None, socket_mgr: UdpSocketManager) -> None:
@@ -301,27 +417,30 @@ class UdpTrackerSession(TrackerSession):
 
         # prepare connection message
         self._connection_id = UDP_TRACKER_INIT_CONNECTION_ID
+        self.reused_connection_id = False
         self.action = TRACKER_ACTION_CONNECT
         self.generate_transaction_id()
 
     def generate_transaction_id(self) -> None:
         """
-        Generates a unique transaction id and stores this in the _active_session_dict set.
+        Generates a unique transaction id and stores this in the _active_sessions dict.
         """
+        if UdpTrackerSession._active_sessions.get(self.transaction_id) is self:
+            del UdpTrackerSession._active_sessions[self.transaction_id]
         while True:
             # make sure there is no duplicated transaction IDs
             transaction_id = random.randint(0, 2147483647)
-            if transaction_id not in UdpTrackerSession._active_session_dict.values():
-                UdpTrackerSession._active_session_dict[self] = transaction_id
+            if transaction_id not in UdpTrackerSession._active_sessions:
+                UdpTrackerSession._active_sessions[transaction_id] = self
                 self.transaction_id = transaction_id
                 break
 
     def remove_transaction_id(self) -> None:
         """
-        Removes an session and its corresponding id from the _active_session_dict set and the socket manager.
+        Removes an session and its corresponding id from the _active_sessions dict and the socket manager.
         """
-        if self in UdpTrackerSession._active_session_dict:
-            del UdpTrackerSession._active_session_dict[self]
+        if UdpTrackerSession._active_sessions.get(self.transaction_id) is self:
+            del UdpTrackerSession._active_sessions[self.transaction_id]
 
         # Checking for socket_mgr is a workaround for race condition
         # in Tribler Session startup/shutdown that sometimes causes
@@ -337,6 +456,43 @@ class UdpTrackerSession(TrackerSession):
         await super().cleanup()
         self.remove_transaction_id()
 
+    @property
+    def connection_key(self) -> tuple[tuple[str, int], tuple | None]:
+        """
+        The key of the connection ID of this tracker: a tracker binds connection IDs to our (proxy) address.
+        """
+        return self.tracker_address, self.proxy
+
+    def use_cached_connection_id(self) -> bool:
+        """
+        Skip the connect round trip if the tracker gave us a connection ID recently.
+
+        :return: whether a cached connection ID is used.
+        """
+        cached = self.socket_mgr.connection_ids.get(self.connection_key)
+        if cached is None:
+            return False
+        connection_id, received = cached
+        if time.time() - received >= UDP_CONNECTION_ID_LIFETIME:
+            del self.socket_mgr.connection_ids[self.connection_key]
+            return False
+        self._connection_id = connection_id
+        self.reused_connection_id = True
+        self.action = TRACKER_ACTION_SCRAPE
+        self.generate_transaction_id()
+        return True
+
+    async def reconnect(self) -> None:
+        """
+        Forget a cached connection ID that the tracker no longer accepts and get a new one.
+        """
+        self.socket_mgr.connection_ids.pop(self.connection_key, None)
+        self.reused_connection_id = False
+        self._connection_id = UDP_TRACKER_INIT_CONNECTION_ID
+        self.action = TRACKER_ACTION_CONNECT
+        self.generate_transaction_id()
+        await self.connect()
+
     async def connect_to_tracker(self) -> TrackerResponse:
         """
         Connects to the tracker and starts querying for seed and leech data.
@@ -362,7 +518,8 @@ class UdpTrackerSession(TrackerSession):
                     else:
                         infos = await self.register_anonymous_task("resolve", ensure_future(coro))
                     self.ip_address = infos[0][-1][0]
-                await self.connect()
+                if not self.use_cached_connection_id():
+                    await self.connect()
                 return await self.scrape()
         except TimeoutError:
             self.failed(msg="request timed out")
@@ -402,6 +559,7 @@ class UdpTrackerSession(TrackerSession):
 
         # update action and IDs
         self._connection_id = struct.unpack_from("!q", response, 8)[0]
+        self.socket_mgr.connection_ids[self.connection_key] = (self._connection_id, time.time())
         self.action = TRACKER_ACTION_SCRAPE
         self.generate_transaction_id()
         self.last_contact = int(time.time())
@@ -426,6 +584,11 @@ class UdpTrackerSession(TrackerSession):
 
         # check response
         action, transaction_id = struct.unpack_from("!ii", response, 0)
+        if action != self.action and transaction_id == self.transaction_id and self.reused_connection_id:
+            # The tracker may have dropped our connection ID earlier than expected, try once more with a new one
+            self._logger.info("%s Cached connection ID rejected, reconnecting", self)
+            await self.reconnect()
+            return await self.scrape()
         if action != self.action or transaction_id != self.transaction_id:
             # get error message
             errmsg_length = len(response) - 8
@@ -464,7 +627,8 @@ class UdpTrackerSession(TrackerSession):
 
 
 def create_tracker_session(tracker_url: str, timeout: float, proxy: tuple | None,
-                           socket_manager: UdpSocketManager) -> TrackerSession:
+                           socket_manager: UdpSocketManager,
+                           session_pool: HttpSessionPool | None = None) -> TrackerSession:
     """
     Creates a tracker session with the given tracker URL.
 
@@ -472,10 +636,11 @@ def create_tracker_session(tracker_url: str, timeout: float, proxy: tuple | None
     :param timeout: The timeout for the session.
     :param proxy: the proxy to use.
     :param socket_manager: the socket manager to use.
+    :param session_pool: the pool of HTTP connections to use.
     :return: The tracker session.
     """
     tracker_type, tracker_address, announce_page = parse_tracker_url(tracker_url)
 
     if tracker_type == "udp":
         return UdpTrackerSession(tracker_url, tracker_address, announce_page, timeout, proxy, socket_manager)
-    return HttpTrackerSession(tracker_url, tracker_address, announce_page, timeout, proxy)
+    return HttpTrackerSession(tracker_url, tracker_address, announce_page, timeout, proxy, session_pool)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import math
 import time
 from pathlib import Path
 from typing import TYPE_CHECKING, cast
@@ -8,13 +9,17 @@ from typing import TYPE_CHECKING, cast
 from pony.orm import count, db_session
 
 from tribler.core.libtorrent.trackers import get_uniformed_tracker_url
+from tribler.core.torrent_checker.tracker_scoreboard import BASE_BACKOFF, BREAKER_THRESHOLD, MAX_BACKOFF
 
 if TYPE_CHECKING:
     from tribler.core.database.orm_bindings.tracker_state import TrackerState
     from tribler.core.database.store import MetadataStore
 
 MAX_TRACKER_FAILURES = 5  # if a tracker fails this amount of times in a row, its 'is_alive' will be marked as 0 (dead).
+# Dead trackers are probed again after a backoff that doubles with every failure, see get_backoff
 TRACKER_RETRY_INTERVAL = 60  # A "dead" tracker will be retired every 60 seconds
+# The number of doublings after which the backoff reaches MAX_BACKOFF, more would overflow the database
+MAX_BACKOFF_DOUBLINGS = math.ceil(math.log2(MAX_BACKOFF / BASE_BACKOFF))
 
 
 class TrackerManager:
@@ -151,3 +156,23 @@ class TrackerManager:
         if not tracker:
             return None
         return tracker[0]
+
+    @db_session
+    def get_trackers_to_revive(self, limit: int) -> list[str]:
+        """
+        Get the dead trackers that we have not contacted for long enough to probe them again.
+
+        The time between two probes of a dead tracker doubles with every failed probe. A successful probe revives it.
+
+        :param limit: the maximum number of trackers to return.
+        :return: the URLs of the trackers to probe, the ones that were contacted the longest time ago first.
+        """
+        now = int(time.time())
+        blacklist = self.blacklist
+        # The backoff of get_backoff, written so that the database can filter on it: dead trackers are past the breaker
+        dead = self.TrackerState.select(
+            lambda g: not g.alive and g.url not in blacklist
+            and g.last_check + min(MAX_BACKOFF, BASE_BACKOFF * 2 ** min(g.failures - BREAKER_THRESHOLD,
+                                                                        MAX_BACKOFF_DOUBLINGS)) <= now
+        ).order_by(self.TrackerState.last_check)  # type: ignore[misc]
+        return [tracker.url for tracker in dead.limit(limit)]
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+MAX_SCORED_TRACKERS = 5000  # Maximum number of trackers to keep the score of
+SMOOTHING = 0.2  # The weight of a new latency or success sample
+BREAKER_THRESHOLD = 3  # Number of consecutive failures after which we stop contacting a tracker for a while
+BASE_BACKOFF = 60  # seconds, how long we stop contacting a tracker after it failed BREAKER_THRESHOLD times
+MAX_BACKOFF = 24 * 3600  # seconds, the longest time we stop contacting a tracker
+PROBE_TIMEOUT = 120  # seconds, after which we allow another probe if the result of the previous one never came in
+MIN_TIMEOUT = 3  # seconds, the shortest timeout we give a tracker
+MIN_TIMEOUT_SAMPLES = 3  # Number of successful checks before we adapt the timeout of a tracker
+TIMEOUT_DEVIATIONS = 4  # How many mean deviations of its latency we give a tracker on top of its mean latency
+
+
+def get_backoff(failures: int) -> float:
+    """
+    Get how long to stop contacting a tracker after the given number of consecutive failures.
+    """
+    if failures < BREAKER_THRESHOLD:
+        return 0
+    return min(MAX_BACKOFF, BASE_BACKOFF * 2 ** (failures - BREAKER_THRESHOLD))
+
+
+def classify_error(message: str) -> str:
+    """
+    Get the class of the given tracker session error message.
+    """
+    lowered = message.lower()
+    if "timed out" in lowered or "timeout" in lowered:
+        return "timeout"
+    if "name or service" in lowered or "nodename" in lowered or "getaddrinfo" in lowered:
+        return "dns"
+    if "error code" in lowered:
+        return "http"
+    if "invalid" in lowered or "mismatch" in lowered or "size" in lowered or "bdecode" in lowered:
+        return "protocol"
+    if "socket" in lowered or "connect" in lowered or "transport" in lowered:
+        return "network"
+    return "tracker"
+
+
+@dataclass
+class TrackerScore:
+    """
+    The check statistics of a single tracker.
+    """
+
+    checks: int = 0
+    successes: int = 0
+    consecutive_failures: int = 0
+    latency: float = 0.0  # seconds until the response of a successful check, moving average
+    latency_deviation: float = 0.0  # mean deviation of the latency, moving average
+    success_rate: float = 1.0  # fraction of successful checks, moving average
+    last_error: str = ""
+    last_check: float = 0.0
+    open_until: float = 0.0  # when we may probe the tracker again, after too many consecutive failures
+    probe_started: float = 0.0  # when we started the current probe, or zero if there is none
+
+    @property
+    def state(self) -> str:
+        """
+        The state of the circuit breaker of this tracker: "closed", "open" or "half-open".
+        """
+        if self.consecutive_failures < BREAKER_THRESHOLD:
+            return "closed"
+        return "half-open" if self.probe_started else "open"
+
+
+class TrackerScoreboard:
+    """
+    Keep track of how fast and how reliable trackers are, to adapt their timeouts and to back off from failing ones.
+
+    After too many consecutive failures, the circuit of a tracker opens: it is not contacted until its backoff expires.
+    Then, a single probe is allowed (half-open). If the probe succeeds, the circuit closes again. Otherwise, it opens
+    for twice as long.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create a new, empty, scoreboard.
+        """
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self.scores: dict[str, TrackerScore] = {}
+
+    def get(self, url: str) -> TrackerScore:
+        """
+        Get the score of the given tracker, creating it if it does not exist yet.
+        """
+        score = self.scores.get(url)
+        if score is None:
+            if len(self.scores) >= MAX_SCORED_TRACKERS:
+                del self.scores[min(self.scores, key=lambda u: self.scores[u].last_check)]
+            score = self.scores[url] = TrackerScore()
+        return score
+
+    def record_success(self, url: str, latency: float) -> None:
+        """
+        Register a successful check of the given tracker.
+        """
+        score = self.get(url)
+        score.checks += 1
+        score.successes += 1
+        score.last_check = time.time()
+        if score.successes == 1:
+            score.latency = latency
+            score.latency_deviation = latency / 2
+        else:
+            score.latency_deviation = ((1 - SMOOTHING) * score.latency_deviation
+                                       + SMOOTHING * abs(latency - score.latency))
+            score.latency = (1 - SMOOTHING) * score.latency + SMOOTHING * latency
+        score.success_rate = (1 - SMOOTHING) * score.success_rate + SMOOTHING
+        if score.consecutive_failures >= BREAKER_THRESHOLD:
+            self._logger.info("Tracker %s recovered after %d failures", url, score.consecutive_failures)
+        score.consecutive_failures = 0
+        score.open_until = 0.0
+        score.probe_started = 0.0
+
+    def record_failure(self, url: str, error: str) -> None:
+        """
+        Register a failed check of the given tracker, with its error message.
+        """
+        score = self.get(url)
+        score.checks += 1
+        score.last_check = time.time()
+        score.success_rate *= 1 - SMOOTHING
+        score.last_error = classify_error(error)
+        score.consecutive_failures += 1
+        score.probe_started = 0.0
+        if score.consecutive_failures >= BREAKER_THRESHOLD:
+            score.open_until = score.last_check + get_backoff(score.consecutive_failures)
+
+    def allow(self, url: str, now: float | None = None) -> bool:
+        """
+        Check if we may contact the given tracker now, starting a probe if its backoff expired.
+        """
+        score = self.scores.get(url)
+        if score is None or score.consecutive_failures < BREAKER_THRESHOLD:
+            return True
+        now = time.time() if now is None else now
+        if now < score.open_until:
+            return False
+        if score.probe_started and now - score.probe_started < PROBE_TIMEOUT:
+            return False  # Only a single probe at a time
+        score.probe_started = now
+        return True
+
+    def get_timeout(self, url: str, default: float) -> float:
+        """
+        Get the timeout for a check of the given tracker: a margin on top of its usual latency, at most the default.
+        """
+        score = self.scores.get(url)
+        if score is None or score.successes < MIN_TIMEOUT_SAMPLES:
+            return default
+        adapted = score.latency + TIMEOUT_DEVIATIONS * score.latency_deviation
+        return min(default, max(MIN_TIMEOUT, adapted))
+
+    def to_api_response(self) -> list[dict[str, Any]]:
+        """
+        Get the scores of all trackers, the most reliable ones first.
+        """
+        return [{"url": url, "state": score.state, **asdict(score)}
+                for url, score in sorted(self.scores.items(), key=lambda item: -item[1].success_rate)]
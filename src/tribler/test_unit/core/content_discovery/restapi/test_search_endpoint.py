@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from uuid import UUID
 
 from ipv8.keyvault.private.openssl import OpenSSLSK
@@ -7,11 +8,11 @@ from ipv8.peer import Peer
 from ipv8.peerdiscovery.network import Network
 from ipv8.test.base import TestBase
 from ipv8.test.mocking.endpoint import AutoMockEndpoint
-from ipv8.test.REST.rest_base import MockRequest, response_to_json
+from ipv8.test.REST.rest_base import BodyCapture, MockRequest, response_to_json
 
 from tribler.core.content_discovery.community import ContentDiscoveryCommunity
 from tribler.core.content_discovery.restapi.search_endpoint import SearchEndpoint
-from tribler.core.restapi.rest_endpoint import HTTP_BAD_REQUEST
+from tribler.core.restapi.rest_endpoint import HTTP_BAD_REQUEST, HTTP_NOT_FOUND
 
 
 class MockContentDiscoveryCommunity(ContentDiscoveryCommunity):
@@ -33,6 +34,25 @@ class MockContentDiscoveryCommunity(ContentDiscoveryCommunity):
         return UUID(int=1), [self.my_peer]
 
 
+class StreamResultsRequest(MockRequest):
+    """
+    A MockRequest that mimics StreamResultsRequests.
+    """
+
+    def __init__(self, request_uuid: str, query: dict | None = None) -> None:
+        """
+        Create a new StreamResultsRequest.
+        """
+        super().__init__(f"/api/search/remote/{request_uuid}/results", "GET", query,
+                         {"request_uuid": request_uuid}, BodyCapture())
+
+    def get_transmitted(self) -> bytes:
+        """
+        Get the received bytes from the writer.
+        """
+        return self._payload_writer.getvalue()
+
+
 class TestSearchEndpoint(TestBase):
     """
     Tests for the SearchEndpoint REST endpoint.
@@ -64,3 +84,52 @@ class TestSearchEndpoint(TestBase):
         self.assertEqual(200, response.status)
         self.assertEqual("00000000-0000-0000-0000-000000000001", response_body_json["request_uuid"])
         self.assertEqual(["5b16b30807cdcb11f8214a5eb762c0dc1931c503"], response_body_json["peers"])
+
+    async def test_stream_results_unknown(self) -> None:
+        """
+        Test if streaming the results of an unknown search returns the not found status.
+        """
+        endpoint = SearchEndpoint()
+        request = StreamResultsRequest("unknown")
+        request.context = [MockContentDiscoveryCommunity()]
+
+        response = await endpoint.stream_results(request)
+
+        self.assertEqual(HTTP_NOT_FOUND, response.status)
+
+    async def test_stream_results_ndjson(self) -> None:
+        """
+        Test if the results of a search are streamed as JSON lines until the search finishes.
+        """
+        endpoint = SearchEndpoint()
+        community = MockContentDiscoveryCommunity()
+        search_session = community.create_search_session("1", "ubuntu")
+        request = StreamResultsRequest("1")
+        request.context = [community]
+
+        search_session.add_results("01", [{"infohash": "aa", "name": "ubuntu"}])
+        search_session.finish()
+        await endpoint.stream_results(request)
+        lines = request.get_transmitted().splitlines()
+        await community.unload()
+
+        self.assertEqual(1, len(lines))
+        update = json.loads(lines[0])
+        self.assertTrue(update["finished"])
+        self.assertEqual(["aa"], [result["infohash"] for result in update["results"]])
+
+    async def test_stream_results_sse(self) -> None:
+        """
+        Test if the results of a search can be streamed as server-sent events.
+        """
+        endpoint = SearchEndpoint()
+        community = MockContentDiscoveryCommunity()
+        community.create_search_session("1", "ubuntu")
+        request = StreamResultsRequest("1", {"format": "sse"})
+        request.context = [community]
+
+        await community.unload()
+        await endpoint.stream_results(request)
+
+        self.assertTrue(request.get_transmitted().startswith(b"event: search_results\ndata: {"))
+        self.assertTrue(request.get_transmitted().endswith(b"\n\n"))
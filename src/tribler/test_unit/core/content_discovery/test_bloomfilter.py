@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from ipv8.test.base import TestBase
+
+from tribler.core.content_discovery.bloomfilter import MAX_FUNCTIONS, MIN_SIZE, BloomFilter
+
+
+class TestBloomFilter(TestBase):
+    """
+    Tests for the BloomFilter class.
+    """
+
+    def test_contains(self) -> None:
+        """
+        Test if added keys are in the filter.
+        """
+        keys = [bytes([i]) * 20 for i in range(100)]
+
+        bloom_filter = BloomFilter.create(keys, 1024, 42)
+
+        self.assertTrue(all(key in bloom_filter for key in keys))
+
+    def test_false_positives(self) -> None:
+        """
+        Test if few keys that were not added are in the filter.
+        """
+        bloom_filter = BloomFilter.create([i.to_bytes(20, "big") for i in range(500)], 1024, 42)
+
+        false_positives = sum(1 for i in range(500, 10500) if i.to_bytes(20, "big") in bloom_filter)
+
+        self.assertLess(false_positives, 300)
+
+    def test_create_size(self) -> None:
+        """
+        Test if the size of a filter is bounded.
+        """
+        self.assertEqual(MIN_SIZE, len(BloomFilter.create([], 1024, 0).to_bytes()))
+        self.assertEqual(125, len(BloomFilter.create([b"\x01"] * 100, 1024, 0).to_bytes()))
+        self.assertEqual(1024, len(BloomFilter.create([b"\x01"] * 10000, 1024, 0).to_bytes()))
+
+    def test_create_functions(self) -> None:
+        """
+        Test if the number of functions is bounded.
+        """
+        self.assertEqual(MAX_FUNCTIONS, BloomFilter.create([], 1024, 0).functions)
+        self.assertEqual(7, BloomFilter.create([b"\x01"] * 100, 1024, 0).functions)
+        self.assertEqual(1, BloomFilter.create([b"\x01"] * 100000, 1024, 0).functions)
+
+    def test_salt(self) -> None:
+        """
+        Test if filters with a different salt set different bits.
+        """
+        self.assertNotEqual(BloomFilter.create([b"\x01" * 20], 1024, 1).to_bytes(),
+                            BloomFilter.create([b"\x01" * 20], 1024, 2).to_bytes())
+
+    def test_from_bytes(self) -> None:
+        """
+        Test if a filter can be reconstructed from its bits, functions and salt.
+        """
+        original = BloomFilter.create([b"\x01" * 20, b"\x02" * 20], 1024, 42)
+
+        restored = BloomFilter(original.to_bytes(), original.functions, original.salt)
+
+        self.assertIn(b"\x01" * 20, restored)
+        self.assertIn(b"\x02" * 20, restored)
+        self.assertNotIn(b"\x03" * 20, restored)
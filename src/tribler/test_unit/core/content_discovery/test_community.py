@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 import os
 import sys
 from binascii import hexlify
@@ -13,19 +14,28 @@ from ipv8.test.mocking.endpoint import MockEndpointListener
 
 import tribler
 from tribler.core.content_discovery.community import (
+    CATCH_UP_CURSOR,
     HEALTH_REQUEST_RANDOM,
+    HEALTH_REQUEST_RECONCILE,
     ContentDiscoveryCommunity,
     ContentDiscoverySettings,
 )
 from tribler.core.content_discovery.payload import (
+    CatchUpRequestPayload,
+    CatchUpResponsePayload,
     HealthPayload,
+    HealthReconcilePayload,
     HealthRequestPayload,
+    RemoteSelectPayload,
     SelectResponsePayload,
     VersionRequest,
     VersionResponse,
 )
+from tribler.core.content_discovery.search import MAX_SEARCH_SESSIONS
+from tribler.core.database.compression import is_dictionary_compressed
 from tribler.core.database.orm_bindings.torrent_metadata import LZ4_EMPTY_ARCHIVE
 from tribler.core.database.serialization import REGULAR_TORRENT
+from tribler.core.database.store import ObjState
 from tribler.core.notifier import Notification, Notifier
 from tribler.core.torrent_checker.torrent_checker import TorrentChecker
 from tribler.core.torrent_checker.torrentchecker_session import HealthInfo
@@ -54,6 +64,7 @@ class MockTorrentChecker(TorrentChecker):
         Overwrite the default test value for torrents_checked.
         """
         self._torrents_checked = value
+        self._alive_torrents = None
 
 
 class TestContentDiscoveryCommunity(TestBase[ContentDiscoveryCommunity]):
@@ -75,7 +86,9 @@ class TestContentDiscoveryCommunity(TestBase[ContentDiscoveryCommunity]):
         """
         overwrite_settings = ContentDiscoverySettings(
             torrent_checker=MockTorrentChecker(),
-            metadata_store=Mock(get_entries_threaded=AsyncMock(), process_compressed_mdblob_threaded=AsyncMock())
+            catch_up=False,
+            metadata_store=Mock(get_entries_threaded=AsyncMock(), process_compressed_mdblob_threaded=AsyncMock(),
+                                get_catch_up_entries_threaded=AsyncMock(return_value=([], None)))
         )
         out = super().create_node(overwrite_settings, create_dht, enable_statistics)
         out.overlay.cancel_all_pending_tasks()
@@ -117,6 +130,380 @@ class TestContentDiscoveryCommunity(TestBase[ContentDiscoveryCommunity]):
         self.assertEqual(HEALTH_REQUEST_RANDOM, message.response_type)
         self.assertEqual(1, len(message.torrents))
 
+    async def test_catch_up_last_page(self) -> None:
+        """
+        Test if a catch-up finishes after the last page.
+        """
+        self.overlay(0).catch_up_finished = False
+        self.overlay(1).composition.metadata_store.get_catch_up_entries_threaded.return_value = ([
+            Mock(serialized=Mock(return_value=b"\x01" * 200), serialized_health=Mock(return_value=b";"))
+        ], None)
+
+        with self.assertReceivedBy(0, [CatchUpResponsePayload]) as responses:
+            self.overlay(0).start_catch_up()
+            await self.deliver_messages()
+        response, = responses
+
+        self.assertEqual(b"", response.cursor)
+        self.assertTrue(self.overlay(0).catch_up_finished)
+        self.assertEqual(1, self.overlay(0).catch_up_pages)
+        self.overlay(0).composition.metadata_store.process_compressed_mdblob_threaded.assert_called_with(
+            response.raw_blob
+        )
+
+    async def test_catch_up_next_page(self) -> None:
+        """
+        Test if the next catch-up page is requested from the cursor of the previous page.
+        """
+        self.overlay(0).catch_up_finished = False
+        self.overlay(1).composition.metadata_store.get_catch_up_entries_threaded.return_value = ([
+            Mock(serialized=Mock(return_value=b"\x01" * 200), serialized_health=Mock(return_value=b";"))
+        ], (5, 10))
+        self.overlay(0).start_catch_up()
+        await self.deliver_messages()
+        self.assertFalse(self.overlay(0).catch_up_finished)
+        self.assertTrue(self.overlay(0).is_pending_task_active("request_catch_up_page"))
+        self.overlay(0).cancel_pending_task("request_catch_up_page")
+        self.overlay(1).composition.metadata_store.get_catch_up_entries_threaded.return_value = ([], None)
+
+        with self.assertReceivedBy(1, [CatchUpRequestPayload]) as requests:
+            self.overlay(0).request_catch_up_page(self.peer(1))
+            await self.deliver_messages()
+        request, = requests
+
+        self.assertEqual(CATCH_UP_CURSOR.pack(5, 10), request.cursor)
+        self.assertEqual(((request.checked_after, 50, (5, 10)), {}),
+                         self.overlay(1).composition.metadata_store.get_catch_up_entries_threaded.call_args)
+
+    async def test_catch_up_packet_limit(self) -> None:
+        """
+        Test if the cursor of a page that does not fit in the packet limit points after the last entry that was sent.
+        """
+        self.overlay(1).composition.catch_up_max_packets = 1
+        self.overlay(1).composition.metadata_store.get_catch_up_entries_threaded.return_value = ([
+            Mock(serialized=Mock(return_value=os.urandom(1000)), serialized_health=Mock(return_value=b";"),
+                 health=Mock(seeders=10 - i), rowid=i) for i in range(3)
+        ], (8, 2))
+
+        with self.assertReceivedBy(0, [CatchUpResponsePayload]) as responses:
+            self.overlay(0).request_catch_up_page(self.peer(1))
+            await self.deliver_messages()
+        response, = responses
+
+        self.assertEqual(1, response.total)
+        self.assertEqual(CATCH_UP_CURSOR.pack(10, 0), response.cursor)
+
+    async def test_catch_up_invalid_cursor(self) -> None:
+        """
+        Test if catch-up requests with an invalid cursor are ignored.
+        """
+        with self.assertReceivedBy(0, []):
+            self.overlay(0).ez_send(self.peer(1), CatchUpRequestPayload(1, 0, 50, b"\x01", b""))
+            await self.deliver_messages()
+
+    async def test_catch_up_unrequested(self) -> None:
+        """
+        Test if catch-up responses that we did not ask for are not processed.
+        """
+        self.overlay(1).ez_send(self.peer(0), CatchUpResponsePayload(1, 0, 1, b"", LZ4_EMPTY_ARCHIVE))
+        await self.deliver_messages()
+
+        self.overlay(0).composition.metadata_store.process_compressed_mdblob_threaded.assert_not_called()
+
+    async def test_catch_up_timeout(self) -> None:
+        """
+        Test if a catch-up continues from the same cursor with another peer after a timeout.
+        """
+        self.overlay(0).catch_up_finished = False
+        self.overlay(0).catch_up_cursor = CATCH_UP_CURSOR.pack(5, 10)
+        self.overlay(0).endpoint.close()
+        self.overlay(0).start_catch_up()
+        request, = self.overlay(0).request_cache._identifiers.values()  # noqa: SLF001
+
+        self.overlay(0).request_cache.pop(request.prefix, request.number).on_timeout()
+
+        self.assertIn(self.mid(1), self.overlay(0).catch_up_failed_peers)
+        self.assertIsNone(self.overlay(0).catch_up_peer)
+        self.assertEqual(CATCH_UP_CURSOR.pack(5, 10), self.overlay(0).catch_up_cursor)
+
+    async def test_reconcile_missing(self) -> None:
+        """
+        Test if a reconciliation request is answered with the torrent health that the requester does not know.
+        """
+        self.torrent_checker(0).set_torrents_checked({})
+
+        with self.assertReceivedBy(0, [HealthPayload], message_filter=[HealthPayload]) as received:
+            self.overlay(0).reconcile_torrents_health()
+            await self.deliver_messages()
+        message, = received
+
+        self.assertEqual(HEALTH_REQUEST_RECONCILE, message.response_type)
+        self.assertEqual([(b"\x01" * 20, 1337)], [(t.infohash, t.timestamp) for t in message.torrents])
+
+    async def test_reconcile_known(self) -> None:
+        """
+        Test if a reconciliation request is answered without the torrent health that the requester already knows.
+        """
+        self.torrent_checker(0).set_torrents_checked({})
+        self.overlay(0).health_history.append(HealthInfo(b"\x01" * 20, 7, 42, 1337))
+
+        with self.assertReceivedBy(0, [HealthPayload], message_filter=[HealthPayload]) as received:
+            self.overlay(0).reconcile_torrents_health()
+            await self.deliver_messages()
+        message, = received
+
+        self.assertEqual([], message.torrents)
+
+    async def test_reconcile_fresher(self) -> None:
+        """
+        Test if a reconciliation request is answered with torrent health that is fresher than the known health.
+        """
+        self.torrent_checker(0).set_torrents_checked({})
+        self.overlay(0).health_history.append(HealthInfo(b"\x01" * 20, 7, 42, 1000))
+
+        with self.assertReceivedBy(0, [HealthPayload], message_filter=[HealthPayload]) as received:
+            self.overlay(0).reconcile_torrents_health()
+            await self.deliver_messages()
+        message, = received
+
+        self.assertEqual([(b"\x01" * 20, 1337)], [(t.infohash, t.timestamp) for t in message.torrents])
+
+    async def test_reconcile_invalid_filter(self) -> None:
+        """
+        Test if a reconciliation request with an invalid Bloom filter is ignored.
+        """
+        with self.assertReceivedBy(0, []):
+            self.overlay(0).ez_send(self.peer(1), HealthReconcilePayload(0, 0, b"\x00" * 8))
+            await self.deliver_messages()
+
+    async def test_reconcile_no_gossip(self) -> None:
+        """
+        Test if random torrent health is no longer gossiped to peers that reconcile health.
+        """
+        self.torrent_checker(0).set_torrents_checked({})
+        self.overlay(0).reconcile_torrents_health()
+        await self.deliver_messages()
+
+        with self.assertReceivedBy(1, []):
+            self.overlay(0).gossip_random_torrents_health()
+            await self.deliver_messages()
+
+    async def test_reconcile_request_no_gossip(self) -> None:
+        """
+        Test if random torrent health is no longer gossiped to peers that ask to reconcile health.
+        """
+        self.overlay(1).reconcile_torrents_health()
+        await self.deliver_messages()
+
+        with self.assertReceivedBy(1, []):
+            self.overlay(0).gossip_random_torrents_health()
+            await self.deliver_messages()
+
+    async def test_reconcile_disabled_gossip(self) -> None:
+        """
+        Test if random torrent health is gossiped to all peers when reconciliation is disabled.
+        """
+        self.overlay(0).composition.health_reconciliation = False
+        self.overlay(0).reconciling_peers.add(self.mid(1))
+
+        with self.assertReceivedBy(1, [HealthPayload], message_filter=[HealthPayload]):
+            self.overlay(0).gossip_random_torrents_health()
+            await self.deliver_messages()
+
+    async def test_reconcile_novelty_faster(self) -> None:
+        """
+        Test if reconciliation happens more often when it brings new torrent health.
+        """
+        self.torrent_checker(0).set_torrents_checked({})
+
+        self.overlay(0).reconcile_torrents_health()
+        await self.deliver_messages()
+
+        self.assertLess(self.overlay(0).reconcile_interval, self.overlay(0).composition.random_torrent_interval)
+
+    async def test_reconcile_no_novelty_slower(self) -> None:
+        """
+        Test if reconciliation happens less often when it brings nothing new.
+        """
+        self.torrent_checker(0).set_torrents_checked({})
+        self.overlay(0).health_history.append(HealthInfo(b"\x01" * 20, 7, 42, 1337))
+
+        self.overlay(0).reconcile_torrents_health()
+        await self.deliver_messages()
+
+        self.assertGreater(self.overlay(0).reconcile_interval, self.overlay(0).composition.random_torrent_interval)
+
+    def test_adapt_reconcile_interval_bounded(self) -> None:
+        """
+        Test if the reconciliation interval stays within its bounds.
+        """
+        for _ in range(20):
+            self.overlay(0).adapt_reconcile_interval(0)
+        slowest = self.overlay(0).reconcile_interval
+        for _ in range(20):
+            self.overlay(0).adapt_reconcile_interval(10)
+
+        self.assertEqual(self.overlay(0).composition.reconcile_max_interval, slowest)
+        self.assertEqual(self.overlay(0).composition.reconcile_min_interval, self.overlay(0).reconcile_interval)
+
+    def send_health(self, infohashes: list[bytes]) -> None:
+        """
+        Let node 1 send health info of the given (unknown) infohashes to node 0.
+        """
+        health_infos = [HealthInfo(infohash, 7, 42, 1337) for infohash in infohashes]
+        self.overlay(1).ez_send(self.peer(0), HealthPayload.create(HEALTH_REQUEST_RANDOM, health_infos))
+
+    async def test_resolve_single(self) -> None:
+        """
+        Test if a single unknown infohash from health info is resolved with a lookup by infohash.
+        """
+        self.overlay(0).composition.resolve_window = 0.01
+
+        with self.assertReceivedBy(1, [RemoteSelectPayload], message_filter=[RemoteSelectPayload]) as received:
+            self.send_health([b"\x02" * 20])
+            await self.deliver_messages()
+        message, = received
+        query = self.overlay(1).parse_parameters(message.json)
+
+        self.assertEqual(b"\x02" * 20, query["infohash"])
+        self.assertEqual(1, query["last"])
+
+    async def test_resolve_batch(self) -> None:
+        """
+        Test if unknown infohashes of multiple health payloads are resolved with a single select.
+        """
+        self.overlay(0).composition.resolve_window = 0.01
+
+        with self.assertReceivedBy(1, [RemoteSelectPayload], message_filter=[RemoteSelectPayload]) as received:
+            self.send_health([b"\x02" * 20, b"\x03" * 20])
+            self.send_health([b"\x03" * 20, b"\x04" * 20])
+            await self.deliver_messages()
+        message, = received
+        query = self.overlay(1).parse_parameters(message.json)
+
+        self.assertEqual({b"\x02" * 20, b"\x03" * 20, b"\x04" * 20}, query["infohash_set"])
+        self.assertEqual(3, query["last"])
+        self.assertEqual({}, self.overlay(0).pending_resolves)
+
+    async def test_resolve_batch_full(self) -> None:
+        """
+        Test if unknown infohashes are resolved right away when a batch is full.
+        """
+        self.overlay(0).composition.max_resolve_batch = 2
+        self.overlay(0).resolve_infohashes(self.peer(1), {b"\x02" * 20, b"\x03" * 20})
+
+        with self.assertReceivedBy(1, [RemoteSelectPayload]) as received:
+            await self.deliver_messages()
+        message, = received
+
+        self.assertEqual({b"\x02" * 20, b"\x03" * 20}, self.overlay(1).parse_parameters(message.json)["infohash_set"])
+        self.assertFalse(self.overlay(0).is_pending_task_active(f"resolve_infohashes_{hexlify(self.mid(1)).decode()}"))
+
+    async def test_resolve_batch_remote(self) -> None:
+        """
+        Test if a batched select is answered with a lookup of all infohashes.
+        """
+        self.overlay(0).pending_resolves[self.peer(1)] = {b"\x02" * 20, b"\x03" * 20}
+        self.overlay(0).flush_resolves(self.peer(1))
+
+        with self.assertReceivedBy(0, [SelectResponsePayload]):
+            await self.deliver_messages()
+
+        get_entries = self.overlay(1).composition.metadata_store.get_entries_threaded
+        self.assertEqual({b"\x02" * 20, b"\x03" * 20}, get_entries.call_args.kwargs["infohash_set"])
+
+    def test_resolve_batch_timeout(self) -> None:
+        """
+        Test if the infohashes of a batch are resolved one by one if a peer does not answer the batch.
+        """
+        request = Mock(peer=self.peer(1), peer_responded=False, request_kwargs={"infohash_set": [b"\x02" * 20,
+                                                                                                 b"\x03" * 20]})
+        self.overlay(0).send_remote_select = Mock()
+
+        self.overlay(0)._on_batch_query_timeout(request)  # noqa: SLF001
+
+        self.assertEqual([b"\x02" * 20, b"\x03" * 20],
+                         [call.kwargs["infohash"] for call in self.overlay(0).send_remote_select.call_args_list])
+
+    async def test_remote_select_scored(self) -> None:
+        """
+        Test if a response to a select request is recorded in the peer scoreboard.
+        """
+        self.overlay(0).send_remote_select(self.peer(1), txt_filter="ubuntu*")
+        await self.deliver_messages()
+        score = self.overlay(0).peer_scoreboard.get(self.peer(1))
+
+        self.assertEqual(1, score.requests)
+        self.assertEqual(1, score.responses)
+        self.assertEqual(1, score.packets)
+
+    async def test_remote_select_timeout_scored(self) -> None:
+        """
+        Test if a select request without a response lowers the reliability of a peer.
+        """
+        request = self.overlay(0).send_remote_select(self.peer(1), txt_filter="ubuntu*")
+
+        self.overlay(0)._on_query_timeout(request)  # noqa: SLF001
+
+        self.assertEqual(1, self.overlay(0).peer_scoreboard.get(self.peer(1)).timeouts)
+        self.assertLess(self.overlay(0).peer_scoreboard.get(self.peer(1)).reliability, 1.0)
+
+    async def test_search_request_prefers_scored_peers(self) -> None:
+        """
+        Test if search requests are sent to the best scoring peers.
+        """
+        self.add_node_to_experiment(self.create_node())
+        await self.introduce_nodes()
+        self.overlay(0).composition.max_query_peers = 1
+        self.overlay(0).peer_scoreboard.exploration = 0
+        self.overlay(0).peer_scoreboard.record_packet(self.peer(2), 10, 0.1)
+
+        _, peers = self.overlay(0).send_search_request(txt_filter="ubuntu*")
+
+        self.assertEqual([self.mid(2)], [p.mid for p in peers])
+
+    async def test_search_request_session(self) -> None:
+        """
+        Test if the results of a search request are merged in a search session.
+        """
+        result = Mock(data={"infohash": "01" * 20, "name": "ubuntu", "num_seeders": 1}, obj_state=ObjState.NEW_OBJECT)
+        self.overlay(0).composition.metadata_store.process_compressed_mdblob_threaded = AsyncMock(return_value=[result])
+
+        request_uuid, _ = self.overlay(0).send_search_request(txt_filter="ubuntu*")
+        await self.deliver_messages()
+        search_session = self.overlay(0).search_sessions[str(request_uuid)]
+        search_session.finish()
+
+        self.assertEqual(["01" * 20], [r["infohash"] for r in search_session.get_ranked_results()])
+        self.assertEqual({hexlify(self.mid(1)).decode()}, search_session.peers)
+
+    async def test_search_request_finished(self) -> None:
+        """
+        Test if the responses to a finished search are still processed, but no longer merged in its session.
+        """
+        result = Mock(data={"infohash": "01" * 20, "name": "ubuntu", "num_seeders": 1}, obj_state=ObjState.NEW_OBJECT)
+        self.overlay(0).composition.metadata_store.process_compressed_mdblob_threaded = AsyncMock(return_value=[result])
+        request_uuid, _ = self.overlay(0).send_search_request(txt_filter="ubuntu*")
+        search_session = self.overlay(0).search_sessions[str(request_uuid)]
+
+        search_session.finish()
+        await self.deliver_messages()
+
+        self.overlay(0).composition.metadata_store.process_compressed_mdblob_threaded.assert_called()
+        self.assertEqual([], search_session.get_ranked_results())
+
+    async def test_search_sessions_bounded(self) -> None:
+        """
+        Test if the oldest search session is finished and forgotten when there are too many.
+        """
+        oldest = self.overlay(0).create_search_session("0", "ubuntu")
+        for i in range(1, MAX_SEARCH_SESSIONS + 1):
+            self.overlay(0).create_search_session(str(i), "ubuntu")
+
+        self.assertEqual(MAX_SEARCH_SESSIONS, len(self.overlay(0).search_sessions))
+        self.assertNotIn("0", self.overlay(0).search_sessions)
+        self.assertTrue(oldest.finished)
+
     def test_get_alive_torrents(self) -> None:
         """
         Test if get_alive_checked_torrents returns a known alive torrent.
@@ -261,6 +648,126 @@ class TestContentDiscoveryCommunity(TestBase[ContentDiscoveryCommunity]):
 
         assert response.raw_blob == LZ4_EMPTY_ARCHIVE
 
+    async def test_remote_select_dictionary(self) -> None:
+        """
+        Test if a remote select is answered with a dictionary-compressed response, if both peers support it.
+        """
+        self.overlay(1).composition.metadata_store.get_entries_threaded.return_value = [
+            Mock(serialized=Mock(return_value=b"\x01" * 200), serialized_health=Mock(return_value=b";"))
+        ]
+
+        with self.assertReceivedBy(0, [SelectResponsePayload]) as responses:
+            self.overlay(0).send_remote_select(self.peer(1), txt_filter="ubuntu*")
+            await self.deliver_messages()
+        response, = responses
+
+        self.assertTrue(is_dictionary_compressed(response.raw_blob))
+        query = self.overlay(1).composition.metadata_store.get_entries_threaded.call_args.kwargs
+        self.assertNotIn("dictionaries", query)
+
+    async def test_remote_select_dictionary_unsupported(self) -> None:
+        """
+        Test if a remote select is answered with an LZ4-compressed response, if the querying peer does not ask for
+        dictionary compression.
+        """
+        self.overlay(0).composition.dictionary_compression = False
+        self.overlay(1).composition.metadata_store.get_entries_threaded.return_value = [
+            Mock(serialized=Mock(return_value=b"\x01" * 200), serialized_health=Mock(return_value=b";"))
+        ]
+
+        with self.assertReceivedBy(0, [SelectResponsePayload]) as responses:
+            self.overlay(0).send_remote_select(self.peer(1), txt_filter="ubuntu*")
+            await self.deliver_messages()
+        response, = responses
+
+        self.assertFalse(is_dictionary_compressed(response.raw_blob))
+
+    async def test_remote_select_rejected(self) -> None:
+        """
+        Test if a remote select that exceeds the budget of a peer receives an empty archive response.
+        """
+        self.overlay(1).query_scheduler.peer_budget = 0
+
+        with self.assertReceivedBy(0, [SelectResponsePayload]) as responses:
+            self.overlay(0).send_remote_select(self.peer(1), txt_filter="ubuntu*")
+            await self.deliver_messages()
+        response, = responses
+
+        self.assertEqual(LZ4_EMPTY_ARCHIVE, response.raw_blob)
+        self.assertEqual(1, self.overlay(1).query_scheduler.rejected)
+        self.overlay(1).composition.metadata_store.get_entries_threaded.assert_not_called()
+
+    async def test_remote_select_cached(self) -> None:
+        """
+        Test if an identical remote select is answered from the response cache.
+        """
+        self.overlay(1).composition.metadata_store.write_generation = 0
+        self.overlay(1).composition.metadata_store.get_entries_threaded.return_value = [
+            Mock(serialized=Mock(return_value=b"\x01" * 200), serialized_health=Mock(return_value=b";"))
+        ]
+
+        with self.assertReceivedBy(0, [SelectResponsePayload, SelectResponsePayload]) as responses:
+            self.overlay(0).send_remote_select(self.peer(1), txt_filter="ubuntu*")
+            await self.deliver_messages()
+            self.overlay(0).send_remote_select(self.peer(1), txt_filter="ubuntu*")
+            await self.deliver_messages()
+        first, second = responses
+
+        self.assertEqual(first.raw_blob, second.raw_blob)
+        self.assertEqual(1, self.overlay(1).composition.metadata_store.get_entries_threaded.call_count)
+        self.assertEqual(1, self.overlay(1).response_cache.get_statistics()["hits"])
+
+    async def test_remote_select_cached_rejected(self) -> None:
+        """
+        Test if an identical remote select is not answered from the response cache if it exceeds the peer budget.
+        """
+        self.overlay(1).composition.metadata_store.write_generation = 0
+        self.overlay(1).composition.metadata_store.get_entries_threaded.return_value = [
+            Mock(serialized=Mock(return_value=b"\x01" * 200), serialized_health=Mock(return_value=b";"))
+        ]
+
+        with self.assertReceivedBy(0, [SelectResponsePayload, SelectResponsePayload]) as responses:
+            self.overlay(0).send_remote_select(self.peer(1), txt_filter="ubuntu*")
+            await self.deliver_messages()
+            bucket = self.overlay(1).query_scheduler.buckets[self.mid(0)]
+            bucket.rate = bucket.tokens = 0
+            self.overlay(0).send_remote_select(self.peer(1), txt_filter="ubuntu*")
+            await self.deliver_messages()
+        _, second = responses
+
+        self.assertEqual(LZ4_EMPTY_ARCHIVE, second.raw_blob)
+        self.assertEqual(1, self.overlay(1).query_scheduler.rejected)
+
+    async def test_remote_select_cache_invalidated(self) -> None:
+        """
+        Test if a remote select is not answered from the response cache after the database changed.
+        """
+        self.overlay(1).composition.metadata_store.write_generation = 0
+        self.overlay(1).composition.metadata_store.get_entries_threaded.return_value = [
+            Mock(serialized=Mock(return_value=b"\x01" * 200), serialized_health=Mock(return_value=b";"))
+        ]
+
+        with self.assertReceivedBy(0, [SelectResponsePayload, SelectResponsePayload]):
+            self.overlay(0).send_remote_select(self.peer(1), txt_filter="ubuntu*")
+            await self.deliver_messages()
+            self.overlay(1).composition.metadata_store.write_generation = 1
+            self.overlay(0).send_remote_select(self.peer(1), txt_filter="ubuntu*")
+            await self.deliver_messages()
+
+        self.assertEqual(2, self.overlay(1).composition.metadata_store.get_entries_threaded.call_count)
+        self.assertEqual(1, self.overlay(1).response_cache.get_statistics()["invalidated"])
+
+    def test_estimate_query_cost(self) -> None:
+        """
+        Test if text searches are estimated to be more expensive than infohash lookups.
+        """
+        text_cost = self.overlay(0).estimate_query_cost({"txt_filter": "ubuntu*"})
+        browse_cost = self.overlay(0).estimate_query_cost({"sort_by": "HEALTH"})
+        lookup_cost = self.overlay(0).estimate_query_cost({"infohash": b"\x01" * 20})
+
+        self.assertLess(lookup_cost, browse_cost)
+        self.assertLess(browse_cost, text_cost)
+
     def test_sanitize_query(self) -> None:
         """
         Test if queries are properly sanitized.
@@ -286,6 +793,16 @@ class TestContentDiscoveryCommunity(TestBase[ContentDiscoveryCommunity]):
             field_in_hex = hexlify(field_in_b).decode()
             self.assertEqual(field_in_b, self.overlay(0).sanitize_query({field: field_in_hex})[field])
 
+    def test_sanitize_query_binary_set_fields(self) -> None:
+        """
+        Test if binary set fields are properly sanitized.
+        """
+        query = self.overlay(0).convert_to_json({"infohash_set": [b"\x01" * 20, b"\x02" * 20]})
+
+        sanitized = self.overlay(0).sanitize_query(json.loads(query))
+
+        self.assertEqual({b"\x01" * 20, b"\x02" * 20}, sanitized["infohash_set"])
+
     async def test_process_rpc_query_match_none(self) -> None:
         """
         Check if a correct query with no match in our database returns no result.
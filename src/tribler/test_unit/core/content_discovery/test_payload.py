@@ -4,6 +4,8 @@ from ipv8.test.base import TestBase
 
 from tribler.core.content_discovery.community import HEALTH_REQUEST_RANDOM
 from tribler.core.content_discovery.payload import (
+    CatchUpRequestPayload,
+    CatchUpResponsePayload,
     HealthFormat,
     HealthPayload,
     HealthRequestPayload,
@@ -138,3 +140,28 @@ class TestContentDiscoveryPayloads(TestBase):
         self.assertEqual(202, srp.msg_id)
         self.assertEqual(42, srp.id)
         self.assertEqual(b"foo", srp.raw_blob)
+
+    def test_catch_up_request_payload(self) -> None:
+        """
+        Test if CatchUpRequestPayload initializes correctly.
+        """
+        cup = CatchUpRequestPayload(42, 1337, 50, b"cursor", b"\x01")
+
+        self.assertEqual(6, cup.msg_id)
+        self.assertEqual(42, cup.id)
+        self.assertEqual(1337, cup.checked_after)
+        self.assertEqual(50, cup.count)
+        self.assertEqual(b"cursor", cup.cursor)
+        self.assertEqual(b"\x01", cup.dictionaries)
+
+    def test_catch_up_response_payload(self) -> None:
+        """
+        Test if CatchUpResponsePayload initializes correctly.
+        """
+        cup = CatchUpResponsePayload(42, 1, 2, b"cursor", b"foo")
+
+        self.assertEqual(7, cup.msg_id)
+        self.assertEqual(42, cup.id)
+        self.assertEqual((1, 2), (cup.index, cup.total))
+        self.assertEqual(b"cursor", cup.cursor)
+        self.assertEqual(b"foo", cup.raw_blob)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from ipv8.test.base import TestBase
+
+from tribler.core.content_discovery.response_cache import SelectResponseCache, query_key
+
+
+class TestSelectResponseCache(TestBase):
+    """
+    Tests for the SelectResponseCache class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a small cache.
+        """
+        super().setUp()
+        self.cache = SelectResponseCache(10, 2)
+
+    def test_query_key_canonical(self) -> None:
+        """
+        Test if the key of a query does not depend on the order of its keys or of its set values.
+        """
+        key1 = query_key({"first": 0, "infohash_set": {b"\x01", b"\x02"}}, 1)
+        key2 = query_key({"infohash_set": {b"\x02", b"\x01"}, "first": 0}, 1)
+
+        self.assertEqual(key1, key2)
+
+    def test_query_key_dictionary_version(self) -> None:
+        """
+        Test if the same query with a different compression gets a different key.
+        """
+        self.assertNotEqual(query_key({"first": 0}, None), query_key({"first": 0}, 1))
+
+    def test_get_hit(self) -> None:
+        """
+        Test if cached chunks are returned for the same write generation.
+        """
+        self.cache.put("key", [b"chunk"], 0)
+
+        self.assertEqual([b"chunk"], self.cache.get("key", 0))
+        self.assertEqual(1, self.cache.hits)
+
+    def test_get_miss(self) -> None:
+        """
+        Test if nothing is returned for an unknown key.
+        """
+        self.assertIsNone(self.cache.get("key", 0))
+        self.assertEqual(1, self.cache.misses)
+
+    def test_get_invalidated(self) -> None:
+        """
+        Test if cached chunks are dropped after a write to the database.
+        """
+        self.cache.put("key", [b"chunk"], 0)
+
+        self.assertIsNone(self.cache.get("key", 1))
+        self.assertEqual(1, self.cache.invalidated)
+        self.assertEqual(0, len(self.cache.entries))
+
+    def test_get_expired(self) -> None:
+        """
+        Test if cached chunks are dropped after their time to live.
+        """
+        self.cache.put("key", [b"chunk"], 0)
+
+        with patch("time.monotonic", return_value=self.cache.entries["key"].expires + 1):
+            self.assertIsNone(self.cache.get("key", 0))
+        self.assertEqual(1, self.cache.expired)
+
+    def test_put_evict_least_recently_used(self) -> None:
+        """
+        Test if the least recently used entry is dropped when the cache is full.
+        """
+        self.cache.put("key1", [b"chunk1"], 0)
+        self.cache.put("key2", [b"chunk2"], 0)
+        self.cache.get("key1", 0)
+        self.cache.put("key3", [b"chunk3"], 0)
+
+        self.assertEqual(["key1", "key3"], list(self.cache.entries))
+
+    def test_put_disabled(self) -> None:
+        """
+        Test if nothing is cached without a time to live.
+        """
+        self.cache.ttl = 0
+        self.cache.put("key", [b"chunk"], 0)
+
+        self.assertEqual(0, self.cache.get_statistics()["entries"])
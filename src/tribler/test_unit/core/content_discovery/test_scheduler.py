@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from asyncio import Event, ensure_future, sleep
+
+from ipv8.test.base import TestBase
+
+from tribler.core.content_discovery.scheduler import QueryScheduler, TokenBucket
+
+
+class TestTokenBucket(TestBase):
+    """
+    Tests for the TokenBucket class.
+    """
+
+    def test_consume(self) -> None:
+        """
+        Test if tokens can be consumed until the bucket is empty.
+        """
+        bucket = TokenBucket(3, 1, 0)
+
+        self.assertTrue(bucket.consume(2, 0))
+        self.assertFalse(bucket.consume(2, 0))
+        self.assertTrue(bucket.consume(1, 0))
+
+    def test_refill(self) -> None:
+        """
+        Test if tokens are refilled over time, up to the capacity.
+        """
+        bucket = TokenBucket(3, 1, 0)
+        bucket.consume(3, 0)
+
+        self.assertTrue(bucket.consume(2, 2))
+        self.assertFalse(bucket.is_full(3))
+        self.assertTrue(bucket.is_full(100))
+        self.assertEqual(3, bucket.tokens)
+
+
+class TestQueryScheduler(TestBase):
+    """
+    Tests for the QueryScheduler class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a scheduler with a single worker.
+        """
+        super().setUp()
+        self.scheduler = QueryScheduler(workers=1, queue_size=2, max_wait=10, peer_budget=4, peer_refill_rate=0)
+        self.blocker = Event()
+        self.order: list[str] = []
+
+    async def query(self, name: str) -> str:
+        """
+        A query that takes until the blocker is set.
+        """
+        await self.blocker.wait()
+        self.order.append(name)
+        return name
+
+    async def test_run(self) -> None:
+        """
+        Test if a query is run right away if a worker is available.
+        """
+        self.blocker.set()
+
+        result = await self.scheduler.run(b"\x01", 1, lambda: self.query("a"))
+
+        self.assertEqual("a", result)
+        self.assertEqual(1, self.scheduler.accepted)
+        self.assertEqual(1, self.scheduler.completed)
+        self.assertEqual(0, self.scheduler.running)
+
+    async def test_reject_budget(self) -> None:
+        """
+        Test if a query is rejected if the peer exceeded its budget.
+        """
+        self.blocker.set()
+
+        await self.scheduler.run(b"\x01", 3, lambda: self.query("a"))
+        result = await self.scheduler.run(b"\x01", 3, lambda: self.query("b"))
+
+        self.assertIsNone(result)
+        self.assertEqual(["a"], self.order)
+        self.assertEqual({"01": 1}, self.scheduler.get_statistics()["rejected_peers"])
+
+    async def test_reject_budget_other_peer(self) -> None:
+        """
+        Test if a query is not rejected if another peer exceeded its budget.
+        """
+        self.blocker.set()
+
+        await self.scheduler.run(b"\x01", 3, lambda: self.query("a"))
+        result = await self.scheduler.run(b"\x02", 3, lambda: self.query("b"))
+
+        self.assertEqual("b", result)
+
+    def test_charge(self) -> None:
+        """
+        Test if a query that is not run is charged to the budget of the peer.
+        """
+        self.assertTrue(self.scheduler.charge(b"\x01", 3))
+        self.assertFalse(self.scheduler.charge(b"\x01", 3))
+        self.assertEqual(0, self.scheduler.running)
+        self.assertEqual({"01": 1}, self.scheduler.get_statistics()["rejected_peers"])
+
+    async def test_queue(self) -> None:
+        """
+        Test if a query is queued while all workers are busy.
+        """
+        first = ensure_future(self.scheduler.run(b"\x01", 1, lambda: self.query("a")))
+        second = ensure_future(self.scheduler.run(b"\x02", 1, lambda: self.query("b")))
+        await sleep(0)
+
+        self.assertEqual(1, self.scheduler.get_statistics()["running"])
+        self.assertEqual(1, self.scheduler.get_statistics()["queued"])
+
+        self.blocker.set()
+
+        self.assertEqual("a", await first)
+        self.assertEqual("b", await second)
+        self.assertEqual(0, self.scheduler.get_statistics()["queued"])
+
+    async def test_reject_queue_full(self) -> None:
+        """
+        Test if a query is rejected if the queue is full.
+        """
+        futures = [ensure_future(self.scheduler.run(bytes([i]), 1, lambda i=i: self.query(str(i)))) for i in range(4)]
+        await sleep(0)
+        self.blocker.set()
+
+        self.assertEqual(["0", "1", "2", None], [await future for future in futures])
+        self.assertEqual(1, self.scheduler.rejected)
+
+    async def test_round_robin(self) -> None:
+        """
+        Test if peers with queued queries take turns.
+        """
+        self.scheduler.queue_size = 10
+        futures = [ensure_future(self.scheduler.run(peer, 1, lambda name=name: self.query(name)))
+                   for peer, name in [(b"\x01", "a1"), (b"\x01", "a2"), (b"\x01", "a3"), (b"\x02", "b1")]]
+        await sleep(0)
+        self.blocker.set()
+        for future in futures:
+            await future
+
+        self.assertEqual(["a1", "a2", "b1", "a3"], self.order)
+
+    async def test_expire(self) -> None:
+        """
+        Test if a queued query is dropped when it exceeds its deadline.
+        """
+        self.scheduler.max_wait = 0.01
+        first = ensure_future(self.scheduler.run(b"\x01", 1, lambda: self.query("a")))
+        second = ensure_future(self.scheduler.run(b"\x02", 1, lambda: self.query("b")))
+
+        self.assertIsNone(await second)
+        self.assertEqual(1, self.scheduler.expired)
+        self.assertEqual(0, self.scheduler.queued)
+
+        self.blocker.set()
+
+        self.assertEqual("a", await first)
+        self.assertEqual(["a"], self.order)
+
+    async def test_cancel_queued(self) -> None:
+        """
+        Test if a cancelled queued query is removed from the queue.
+        """
+        first = ensure_future(self.scheduler.run(b"\x01", 1, lambda: self.query("a")))
+        second = ensure_future(self.scheduler.run(b"\x02", 1, lambda: self.query("b")))
+        await sleep(0)
+
+        second.cancel()
+        await sleep(0)
+        self.blocker.set()
+
+        self.assertEqual("a", await first)
+        self.assertEqual(0, self.scheduler.queued)
+        self.assertEqual(0, self.scheduler.running)
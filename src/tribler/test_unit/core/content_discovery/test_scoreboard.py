@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from ipv8.keyvault.crypto import default_eccrypto
+from ipv8.peer import Peer
+from ipv8.test.base import TestBase
+
+from tribler.core.content_discovery.scoreboard import PeerScoreboard
+
+
+class TestPeerScoreboard(TestBase):
+    """
+    Tests for the PeerScoreboard class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a scoreboard without exploration and some peers.
+        """
+        super().setUp()
+        self.scoreboard = PeerScoreboard(exploration=0)
+        self.peers = [Peer(default_eccrypto.generate_key("curve25519")) for _ in range(4)]
+
+    def test_record_packet(self) -> None:
+        """
+        Test if response packets are recorded.
+        """
+        self.scoreboard.record_request(self.peers[0])
+        self.scoreboard.record_packet(self.peers[0], 3, 1.0)
+        self.scoreboard.record_packet(self.peers[0], 2)
+        score = self.scoreboard.get(self.peers[0])
+
+        self.assertEqual((1, 1, 2, 5), (score.requests, score.responses, score.packets, score.new_objects))
+        self.assertEqual(1.0, score.latency)
+        self.assertEqual(5.0, score.yield_per_request)
+
+    def test_record_latency_average(self) -> None:
+        """
+        Test if the latency is a moving average of the first packets.
+        """
+        self.scoreboard.record_packet(self.peers[0], 0, 1.0)
+        self.scoreboard.record_packet(self.peers[0], 0, 2.0)
+
+        self.assertAlmostEqual(1.3, self.scoreboard.get(self.peers[0]).latency)
+
+    def test_record_timeout(self) -> None:
+        """
+        Test if a timeout lowers the score of a peer.
+        """
+        self.scoreboard.record_request(self.peers[0])
+        self.scoreboard.record_request(self.peers[1])
+        self.scoreboard.record_packet(self.peers[0], 0, 1.0)
+        self.scoreboard.record_packet(self.peers[1], 0, 1.0)
+        self.scoreboard.record_timeout(self.peers[1])
+
+        self.assertEqual(1, self.scoreboard.get(self.peers[1]).timeouts)
+        self.assertLess(self.scoreboard.get(self.peers[1]).score, self.scoreboard.get(self.peers[0]).score)
+
+    def test_score_unmeasured(self) -> None:
+        """
+        Test if a peer that never answered does not outrank a peer that did.
+        """
+        self.scoreboard.record_request(self.peers[0])
+        self.scoreboard.record_request(self.peers[1])
+        self.scoreboard.record_packet(self.peers[0], 0, 5.0)
+
+        self.assertLess(self.scoreboard.get(self.peers[1]).score, self.scoreboard.get(self.peers[0]).score)
+        self.assertEqual([self.peers[0]], self.scoreboard.select(self.peers[:2], 1))
+
+    def test_record_timeout_latency(self) -> None:
+        """
+        Test if a timeout counts as a slow latency sample.
+        """
+        self.scoreboard.record_packet(self.peers[0], 0, 1.0)
+        self.scoreboard.record_timeout(self.peers[0])
+
+        self.assertAlmostEqual(3.7, self.scoreboard.get(self.peers[0]).latency)
+
+    def test_select_best(self) -> None:
+        """
+        Test if the fastest, most useful peers are selected.
+        """
+        self.scoreboard.record_packet(self.peers[0], 0, 3.0)
+        self.scoreboard.record_packet(self.peers[1], 0, 0.1)
+        self.scoreboard.record_packet(self.peers[2], 50, 1.0)
+
+        self.assertEqual([self.peers[2], self.peers[1]], self.scoreboard.select(self.peers, 2))
+
+    def test_select_explore(self) -> None:
+        """
+        Test if some peers are selected at random.
+        """
+        self.scoreboard.exploration = 0.5
+        self.scoreboard.record_packet(self.peers[0], 10, 0.1)
+
+        selected = self.scoreboard.select(self.peers, 2)
+
+        self.assertEqual(self.peers[0], selected[0])
+        self.assertIn(selected[1], self.peers[1:])
+
+    def test_select_unknown(self) -> None:
+        """
+        Test if peers without a score are selected if there are not enough peers with a score.
+        """
+        self.scoreboard.record_packet(self.peers[0], 10, 0.1)
+
+        selected = self.scoreboard.select(self.peers, 10)
+
+        self.assertEqual(self.peers[0], selected[0])
+        self.assertEqual(set(self.peers), set(selected))
+
+    def test_save_load(self) -> None:
+        """
+        Test if scores survive a restart.
+        """
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "scores.json"
+            scoreboard = PeerScoreboard(path)
+            scoreboard.record_request(self.peers[0])
+            scoreboard.record_packet(self.peers[0], 7, 0.5)
+            scoreboard.save()
+
+            restored = PeerScoreboard(path).scores[self.peers[0].mid]
+
+        self.assertEqual((1, 1, 7, 0.5), (restored.requests, restored.packets, restored.new_objects, restored.latency))
+
+    def test_load_corrupt(self) -> None:
+        """
+        Test if a corrupt score file is ignored.
+        """
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "scores.json"
+            path.write_text('{"zz": 1}')
+
+            scoreboard = PeerScoreboard(path)
+
+        self.assertEqual({}, scoreboard.scores)
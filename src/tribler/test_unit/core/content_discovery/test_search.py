@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from asyncio import sleep
+
+from ipv8.test.base import TestBase
+
+from tribler.core.content_discovery.search import SearchSession
+
+
+def create_result(infohash: str, name: str, seeders: int = 0, last_check: int = 0) -> dict:
+    """
+    Create a result as it is received from other peers.
+    """
+    return {"infohash": infohash, "name": name, "num_seeders": seeders, "num_leechers": 0,
+            "last_tracker_check": last_check, "created": 0}
+
+
+class TestSearchSession(TestBase):
+    """
+    Tests for the SearchSession class.
+    """
+
+    def create_session(self, **kwargs) -> SearchSession:
+        """
+        Create a search session for "ubuntu desktop".
+        """
+        return SearchSession("uuid", '"ubuntu" "desktop"', **kwargs)
+
+    async def test_merge(self) -> None:
+        """
+        Test if results of multiple peers are merged by infohash, keeping the most recent health.
+        """
+        session = self.create_session()
+        session.add_results("01", [create_result("aa", "ubuntu desktop", 1, 10)])
+        session.add_results("02", [create_result("aa", "ubuntu desktop", 5, 20)])
+        session.add_results("03", [create_result("aa", "ubuntu desktop", 3, 15)])
+        results = session.get_ranked_results()
+        session.finish()
+
+        self.assertEqual(1, len(results))
+        self.assertEqual(5, results[0]["num_seeders"])
+        self.assertEqual(3, session.create_update()["peers"])
+
+    async def test_rank(self) -> None:
+        """
+        Test if results are ordered by rank.
+        """
+        session = self.create_session()
+        session.add_results("01", [create_result("aa", "something else"), create_result("bb", "ubuntu desktop")])
+        results = session.get_ranked_results()
+        session.finish()
+
+        self.assertEqual(["bb", "aa"], [result["infohash"] for result in results])
+        self.assertGreater(results[0]["rank"], results[1]["rank"])
+
+    async def test_ignore_invalid(self) -> None:
+        """
+        Test if results without an infohash or a name are ignored.
+        """
+        session = self.create_session()
+        session.add_results("01", [{"name": "ubuntu"}, {"infohash": "aa"}])
+        session.finish()
+
+        self.assertEqual([], session.get_ranked_results())
+
+    async def test_coalesce_updates(self) -> None:
+        """
+        Test if updates are coalesced.
+        """
+        session = self.create_session(update_interval=0.05)
+        updates = session.subscribe()
+        session.add_results("01", [create_result("aa", "ubuntu desktop")])
+        session.add_results("02", [create_result("bb", "ubuntu desktop")])
+        await sleep(0.01)
+        session.add_results("03", [create_result("cc", "ubuntu desktop")])
+        await sleep(0.01)
+
+        self.assertEqual(0, len(updates.get_nowait()["results"]))  # The initial state
+        self.assertEqual(2, len(updates.get_nowait()["results"]))
+        self.assertTrue(updates.empty())
+
+        await sleep(0.06)
+        session.finish()
+
+        self.assertEqual(3, len(updates.get_nowait()["results"]))
+        self.assertTrue(updates.get_nowait()["finished"])
+
+    async def test_finish_target(self) -> None:
+        """
+        Test if a search finishes when enough good results are found.
+        """
+        session = self.create_session(target_results=2, good_rank=0.5)
+        updates = session.subscribe()
+        session.add_results("01", [create_result("aa", "ubuntu desktop"), create_result("bb", "something else")])
+        self.assertFalse(session.finished)
+
+        session.add_results("02", [create_result("cc", "ubuntu desktop")])
+
+        self.assertTrue(session.finished)
+        updates.get_nowait()
+        self.assertTrue(updates.get_nowait()["finished"])
+
+    async def test_finish_deadline(self) -> None:
+        """
+        Test if a search finishes when its deadline passes.
+        """
+        session = self.create_session(deadline=0.01)
+
+        await sleep(0.02)
+        session.add_results("01", [create_result("aa", "ubuntu desktop")])
+
+        self.assertTrue(session.finished)
+        self.assertEqual([], session.get_ranked_results())
+
+    async def test_subscribe_finished(self) -> None:
+        """
+        Test if subscribing to a finished search gives the final results.
+        """
+        session = self.create_session()
+        session.add_results("01", [create_result("aa", "ubuntu desktop")])
+        session.finish()
+
+        update = session.subscribe().get_nowait()
+
+        self.assertTrue(update["finished"])
+        self.assertEqual(1, len(update["results"]))
+        self.assertEqual([], session.subscribers)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from asyncio import sleep
+from unittest.mock import Mock
+
+from ipv8.test.base import TestBase
+
+from tribler.core.content_discovery.send_queue import PRIORITY_BULK, PRIORITY_HIGH, SendQueue
+
+
+class TestSendQueue(TestBase):
+    """
+    Tests for the SendQueue class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a send queue that can send two packets at once.
+        """
+        super().setUp()
+        self.send = Mock()
+        self.queue = SendQueue(self.send, 1000, 2, 2)
+        self.peer = Mock()
+
+    async def tearDown(self) -> None:
+        """
+        Cancel the pending drain.
+        """
+        self.queue.shutdown()
+        await super().tearDown()
+
+    async def test_send_burst(self) -> None:
+        """
+        Test if packets are sent right away, up to the burst size.
+        """
+        self.queue.send(self.peer, "packet1")
+        self.queue.send(self.peer, "packet2")
+        self.queue.send(self.peer, "packet3")
+
+        self.assertEqual(2, self.send.call_count)
+        self.assertEqual(1, len(self.queue))
+        self.assertEqual(1, self.queue.get_statistics()["paced"])
+
+    async def test_drain(self) -> None:
+        """
+        Test if queued packets are sent when the rate allows it.
+        """
+        for i in range(3):
+            self.queue.send(self.peer, f"packet{i}")
+
+        await sleep(0.01)
+
+        self.assertEqual(3, self.send.call_count)
+        self.assertEqual(0, len(self.queue))
+
+    async def test_drain_priority(self) -> None:
+        """
+        Test if queued high-priority packets are sent before queued bulk packets.
+        """
+        self.queue.bucket.tokens = 0
+        self.queue.send(self.peer, "bulk", PRIORITY_BULK)
+        self.queue.send(self.peer, "high", PRIORITY_HIGH)
+
+        await sleep(0.01)
+
+        self.assertEqual(["high", "bulk"], [c.args[1] for c in self.send.call_args_list])
+
+    async def test_drop_full(self) -> None:
+        """
+        Test if packets are dropped when the queue of their priority is full.
+        """
+        self.queue.bucket.tokens = 0
+        for i in range(3):
+            self.queue.send(self.peer, f"bulk{i}", PRIORITY_BULK)
+        sent = self.queue.send(self.peer, "high", PRIORITY_HIGH)
+
+        self.assertTrue(sent)
+        self.assertEqual(1, self.queue.dropped)
+        self.assertEqual(3, len(self.queue))
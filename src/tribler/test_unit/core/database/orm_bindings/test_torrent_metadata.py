@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from ipv8.test.base import TestBase
 
+from tribler.core.database.compression import decompress
 from tribler.core.database.orm_bindings.torrent_metadata import entries_to_chunk, infohash_to_id, tdef_to_metadata_dict
 from tribler.test_unit.core.libtorrent.mocks import FakeTDef
 
@@ -87,3 +88,41 @@ class TestTorrentMetadata(TestBase):
 
         self.assertEqual(1, last_index)
         self.assertEqual(7, health)
+
+    def test_entries_to_chunk_dictionary_last_index_no_fit(self) -> None:
+        """
+        Test if the last index of a dictionary-compressed chunk is correctly given if the data does not fit.
+        """
+        _, last_index = entries_to_chunk([MockTorrentMetadata(0, 99), MockTorrentMetadata(100, 199)], 1,
+                                         dictionary_version=1)
+
+        self.assertEqual(1, last_index)
+
+    def test_entries_to_chunk_dictionary_last_index_fit(self) -> None:
+        """
+        Test if the last index of a dictionary-compressed chunk is correctly given if the data does fit.
+        """
+        chunk, last_index = entries_to_chunk([MockTorrentMetadata(0, 99), MockTorrentMetadata(100, 199)], 400,
+                                             dictionary_version=1)
+
+        self.assertEqual(2, last_index)
+        self.assertEqual(bytes(range(99)) + bytes(range(100, 199)), decompress(chunk)[0])
+
+    def test_entries_to_chunk_dictionary_start_index(self) -> None:
+        """
+        Test if a dictionary-compressed chunk always includes the entry at the start index.
+        """
+        chunk, last_index = entries_to_chunk([MockTorrentMetadata(0, 99), MockTorrentMetadata(100, 199)], 1,
+                                             start_index=1, dictionary_version=1)
+
+        self.assertEqual(2, last_index)
+        self.assertEqual(bytes(range(100, 199)), decompress(chunk)[0])
+
+    def test_entries_to_chunk_dictionary_health(self) -> None:
+        """
+        Test if a dictionary-compressed chunk is followed by the health data.
+        """
+        chunk, _ = entries_to_chunk([MockTorrentMetadata(0, 99), MockTorrentMetadata(100, 199)], 1, 0, True,
+                                    dictionary_version=1)
+
+        self.assertEqual(b"\x00\x00\x00\x01\x07", decompress(chunk)[1])
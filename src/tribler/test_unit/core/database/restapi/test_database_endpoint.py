@@ -11,6 +11,8 @@ from multidict import MultiDict, MultiDictProxy
 from tribler.core.database.restapi.database_endpoint import DatabaseEndpoint, parse_bool
 from tribler.core.database.serialization import REGULAR_TORRENT
 from tribler.core.restapi.rest_endpoint import HTTP_BAD_REQUEST
+from tribler.core.torrent_checker.check_schedule import HealthCheckSchedule
+from tribler.core.torrent_checker.tracker_scoreboard import TrackerScoreboard
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -139,6 +141,32 @@ class TestDatabaseEndpoint(TestBase):
 
         self.assertNotIn("progress", metadata)
 
+    async def test_get_tracker_scores_no_checker(self) -> None:
+        """
+        Test if getting the tracker scores without a torrent checker gives no trackers.
+        """
+        endpoint = DatabaseEndpoint()
+
+        response = await endpoint.get_tracker_scores(MockRequest("/api/metadata/trackers"))
+        response_body_json = await response_to_json(response)
+
+        self.assertEqual([], response_body_json["trackers"])
+
+    async def test_get_tracker_scores(self) -> None:
+        """
+        Test if getting the tracker scores forwards the scoreboard of the torrent checker.
+        """
+        endpoint = DatabaseEndpoint()
+        endpoint.torrent_checker = Mock(tracker_scores=TrackerScoreboard())
+        endpoint.torrent_checker.tracker_scores.record_success("udp://tracker.com:1337", 1.0)
+
+        response = await endpoint.get_tracker_scores(MockRequest("/api/metadata/trackers"))
+        response_body_json = await response_to_json(response)
+
+        self.assertEqual("udp://tracker.com:1337", response_body_json["trackers"][0]["url"])
+        self.assertEqual("closed", response_body_json["trackers"][0]["state"])
+        self.assertEqual(1.0, response_body_json["trackers"][0]["latency"])
+
     async def test_local_search_bad_query(self) -> None:
         """
         Test if a bad value leads to a bad request status.
@@ -189,6 +217,24 @@ class TestDatabaseEndpoint(TestBase):
         self.assertEqual(None, response_body_json["sort_by"])
         self.assertEqual(True, response_body_json["sort_desc"])
 
+    async def test_local_search_add_interest(self) -> None:
+        """
+        Test if the torrents in the results of a local search are checked sooner.
+        """
+        endpoint = DatabaseEndpoint()
+        endpoint.torrent_checker = Mock(check_schedule=HealthCheckSchedule())
+        endpoint.mds = Mock(run_threaded=self.mds_run_now, get_total_count=Mock(), get_max_rowid=Mock(),
+                            query_with_augmenter=Mock(return_value=[
+                                Mock(to_simple_dict=Mock(return_value={"infohash": "01" * 20,
+                                                                       "type": REGULAR_TORRENT}))
+                            ]))
+        request = MockRequest("/api/metadata/search/local", query={"fts_text": ""})
+        request.context = [endpoint.mds]
+
+        await endpoint.local_search(request)
+
+        self.assertIn(b"\x01" * 20, endpoint.torrent_checker.check_schedule)
+
     async def test_local_search_include_total(self) -> None:
         """
         Test if performing a local search with requested total, includes a total.
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import zlib
+
+from ipv8.test.base import TestBase
+
+from tribler.core.database.compression import (
+    DICTIONARIES,
+    UnknownDictionaryException,
+    compress,
+    decompress,
+    is_dictionary_compressed,
+    select_dictionary_version,
+)
+from tribler.core.database.orm_bindings.torrent_metadata import LZ4_EMPTY_ARCHIVE
+
+
+class TestCompression(TestBase):
+    """
+    Tests for the dictionary compression logic.
+    """
+
+    def test_select_dictionary_version(self) -> None:
+        """
+        Test if the highest common dictionary version is selected.
+        """
+        self.assertEqual(max(DICTIONARIES), select_dictionary_version([*DICTIONARIES, 2 ** 32]))
+
+    def test_select_dictionary_version_none_common(self) -> None:
+        """
+        Test if no dictionary version is selected if there is no common version.
+        """
+        self.assertIsNone(select_dictionary_version([2 ** 32]))
+
+    def test_select_dictionary_version_illegal(self) -> None:
+        """
+        Test if no dictionary version is selected for illegal announcements.
+        """
+        self.assertIsNone(select_dictionary_version(None))
+        self.assertIsNone(select_dictionary_version("1"))
+        self.assertIsNone(select_dictionary_version(["1"]))
+
+    def test_compress_decompress(self) -> None:
+        """
+        Test if compressed data can be decompressed, even if it is followed by other data.
+        """
+        data = b"Big Buck Bunny (2008) 1080p BluRay x264-YIFY"
+
+        decompressed, unused_data = decompress(compress(data, 1) + b"\x00\x00\x00\x00")
+
+        self.assertEqual(data, decompressed)
+        self.assertEqual(b"\x00\x00\x00\x00", unused_data)
+
+    def test_compress_dictionary(self) -> None:
+        """
+        Test if the dictionary is used when compressing common strings.
+        """
+        data = b"Ubuntu 24.04 Desktop amd64 ISO"
+
+        self.assertLess(len(compress(data, 1)), len(zlib.compress(data, 9)))
+
+    def test_is_dictionary_compressed(self) -> None:
+        """
+        Test if dictionary-compressed data is recognized.
+        """
+        self.assertTrue(is_dictionary_compressed(compress(b"test", 1)))
+
+    def test_is_dictionary_compressed_lz4(self) -> None:
+        """
+        Test if LZ4-compressed data is not recognized as dictionary-compressed data.
+        """
+        self.assertFalse(is_dictionary_compressed(LZ4_EMPTY_ARCHIVE))
+
+    def test_is_dictionary_compressed_no_dictionary(self) -> None:
+        """
+        Test if zlib-compressed data without a dictionary is not recognized as dictionary-compressed data.
+        """
+        self.assertFalse(is_dictionary_compressed(zlib.compress(b"test")))
+
+    def test_decompress_unknown_dictionary(self) -> None:
+        """
+        Test if data that is compressed with an unknown dictionary raises an UnknownDictionaryException.
+        """
+        compressor = zlib.compressobj(zdict=b"unknown dictionary")
+
+        with self.assertRaises(UnknownDictionaryException):
+            decompress(compressor.compress(b"test") + compressor.flush())
+
+    def test_decompress_truncated(self) -> None:
+        """
+        Test if truncated data raises a zlib error.
+        """
+        with self.assertRaises(zlib.error):
+            decompress(compress(b"test" * 100, 1)[:-8])
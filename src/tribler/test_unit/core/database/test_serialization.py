@@ -8,6 +8,7 @@ from ipv8.test.base import TestBase
 from tribler.core.database.serialization import (
     REGULAR_TORRENT,
     HealthItemsPayload,
+    LazyTorrentMetadataPayload,
     SignedPayload,
     TorrentMetadataPayload,
     UnknownBlobTypeException,
@@ -69,6 +70,54 @@ class TestSerialization(TestBase):
         self.assertEqual(payload.tags, unserialized.tags)
         self.assertEqual(payload.tracker_info, unserialized.tracker_info)
 
+    def test_read_payload_with_offset_lazy(self) -> None:
+        """
+        Test if regular torrents are read as LazyTorrentMetadataPayloads that do not decode strings until accessed.
+        """
+        private_key = default_eccrypto.generate_key("curve25519")
+        payload = TorrentMetadataPayload(metadata_type=REGULAR_TORRENT, reserved_flags=0, public_key=b"\x00" * 64,
+                                         id_=7, origin_id=1337, timestamp=10, infohash=b"\x01" * 20, size=42,
+                                         torrent_date=int2time(0), title="t\u00e9st", tags="tags", tracker_info="")
+        payload.add_signature(private_key)
+        data = b"\xFF" + payload.serialized() + payload.signature + b"\xFF"
+
+        unserialized, offset = read_payload_with_offset(memoryview(data), 1)
+
+        self.assertIsInstance(unserialized, LazyTorrentMetadataPayload)
+        self.assertEqual(len(data) - 1, offset)
+        self.assertNotIn("title", vars(unserialized))
+        self.assertEqual(payload.to_dict(), unserialized.to_dict())
+        self.assertEqual("t\u00e9st", vars(unserialized)["title"])
+        self.assertTrue(unserialized.check_signature())
+
+    def test_lazy_payload_serialized_received(self) -> None:
+        """
+        Test if an unmodified LazyTorrentMetadataPayload serializes to the bytes it was read from.
+        """
+        payload = TorrentMetadataPayload(metadata_type=REGULAR_TORRENT, reserved_flags=0, public_key=b"\x00" * 64,
+                                         id_=7, origin_id=1337, timestamp=10, infohash=b"\x01" * 20, size=42,
+                                         torrent_date=int2time(0), title="test", tags="tags", tracker_info="")
+        serialized = payload.serialized()
+
+        unserialized, _ = LazyTorrentMetadataPayload.from_buffer(memoryview(serialized + payload.signature))
+
+        self.assertEqual(serialized, unserialized.serialized())
+
+    def test_lazy_payload_serialized_modified(self) -> None:
+        """
+        Test if a modified LazyTorrentMetadataPayload serializes its new values.
+        """
+        payload = TorrentMetadataPayload(metadata_type=REGULAR_TORRENT, reserved_flags=0, public_key=b"\x00" * 64,
+                                         id_=7, origin_id=1337, timestamp=10, infohash=b"\x01" * 20, size=42,
+                                         torrent_date=int2time(0), title="test", tags="tags", tracker_info="")
+        unserialized, _ = LazyTorrentMetadataPayload.from_buffer(memoryview(payload.serialized() + payload.signature))
+
+        unserialized.title = "other"
+        payload.title = "other"
+
+        self.assertEqual("other", unserialized.title)
+        self.assertEqual(payload.serialized(), unserialized.serialized())
+
     def test_signed_payload_sign(self) -> None:
         """
         Test if signing a SignedPayload and unpacking it, leads to the same payload.
@@ -188,3 +237,19 @@ class TestSerialization(TestBase):
         payload = HealthItemsPayload(b"-1,-1,-1;1,2,3;")
 
         self.assertEqual([(0, 0, 0), (1, 2, 3)], HealthItemsPayload.unpack(payload.serialize()))
+
+    def test_health_items_payload_extra_fields(self) -> None:
+        """
+        Test if HealthItemsPayload ignores fields after the first three.
+        """
+        payload = HealthItemsPayload(b"1,2,3,4,5;6,7,8;")
+
+        self.assertEqual([(1, 2, 3), (6, 7, 8)], HealthItemsPayload.unpack(payload.serialize()))
+
+    def test_health_items_payload_unterminated(self) -> None:
+        """
+        Test if HealthItemsPayload ignores a trailing item without a terminating semicolon.
+        """
+        payload = HealthItemsPayload(b"1,2,3;4,5,6")
+
+        self.assertEqual([(1, 2, 3)], HealthItemsPayload.unpack(payload.serialize() + b"7,8,9;"))
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import zlib
 from unittest.mock import Mock, call, patch
 
 from ipv8.community import Community, CommunitySettings
@@ -10,7 +11,13 @@ from pony.orm import db_session
 
 from tribler.core.database.orm_bindings.torrent_metadata import entries_to_chunk
 from tribler.core.database.serialization import NULL_KEY, int2time
-from tribler.core.database.store import MetadataStore, ObjState
+from tribler.core.database.store import (
+    MetadataStore,
+    ObjState,
+    sql_create_partial_index_torrentstate_last_check,
+    sql_warm_up_queries,
+)
+from tribler.core.torrent_checker.healthdataclasses import HealthInfo
 
 
 class MockCommunity(Community):
@@ -60,6 +67,38 @@ class TestMetadataStore(TestBase[MockCommunity]):
 
         self.assertEqual(titles, [d.data["name"] for d in uncompressed])
 
+    @db_session
+    def test_squash_mdblobs_write_generation(self) -> None:
+        """
+        Test if processing new entries changes the write generation and processing duplicates does not.
+        """
+        md_list = [
+            self.metadata_store.TorrentMetadata(title=f"test torrent {i}", infohash=bytes([i]) * 20,
+                                                torrent_date=int2time(i))
+            for i in range(10)
+        ]
+        chunk, _ = entries_to_chunk(md_list, chunk_size=999999999999999)
+        for d in md_list:
+            d.delete()
+
+        self.metadata_store.process_compressed_mdblob(chunk, skip_personal_metadata_payload=False)
+        generation = self.metadata_store.write_generation
+        self.metadata_store.process_compressed_mdblob(chunk, skip_personal_metadata_payload=False)
+
+        self.assertLess(0, generation)
+        self.assertEqual(generation, self.metadata_store.write_generation)
+
+    @db_session
+    def test_torrent_health_write_generation(self) -> None:
+        """
+        Test if health updates do not change the write generation, so that they do not invalidate cached queries.
+        """
+        self.metadata_store.process_torrent_health(HealthInfo(b"\x01" * 20, seeders=1, leechers=2))
+        self.metadata_store.process_torrent_health(HealthInfo(b"\x01" * 20, seeders=3, leechers=4))
+
+        self.assertEqual(3, self.metadata_store.TorrentState.get(infohash=b"\x01" * 20).seeders)
+        self.assertEqual(0, self.metadata_store.write_generation)
+
     @db_session
     def test_squash_mdblobs_multiple_chunks(self) -> None:
         """
@@ -86,6 +125,35 @@ class TestMetadataStore(TestBase[MockCommunity]):
         self.assertEqual(titles[:index], [d.data["name"] for d in uncompressed1])
         self.assertEqual(titles[index:], [d.data["name"] for d in uncompressed2])
 
+    @db_session
+    def test_squash_mdblobs_dictionary(self) -> None:
+        """
+        Test if dictionary-compressed mdblobs can be squashed and processed again.
+        """
+        md_list = [
+            self.metadata_store.TorrentMetadata(title=f"test torrent {i}", infohash=bytes([i]) * 20,
+                                                torrent_date=int2time(i))
+            for i in range(10)
+        ]
+        chunk, _ = entries_to_chunk(md_list, chunk_size=999999999999999, include_health=True, dictionary_version=1)
+        titles = [d.title for d in md_list]
+        for d in md_list:
+            d.delete()
+
+        uncompressed = self.metadata_store.process_compressed_mdblob(chunk, skip_personal_metadata_payload=False)
+
+        self.assertEqual(titles, [d.data["name"] for d in uncompressed])
+
+    @db_session
+    def test_process_unknown_dictionary_mdblob(self) -> None:
+        """
+        Test if an mdblob that is compressed with an unknown dictionary does not crash Tribler.
+        """
+        compressor = zlib.compressobj(zdict=b"unknown dictionary")
+
+        self.assertEqual([], self.metadata_store.process_compressed_mdblob(compressor.compress(b"test")
+                                                                           + compressor.flush()))
+
     @db_session
     def test_process_invalid_compressed_mdblob(self) -> None:
         """
@@ -199,6 +267,24 @@ class TestMetadataStore(TestBase[MockCommunity]):
         self.assertIsNotNone(self.metadata_store.TorrentMetadata.get(title=ffa_title))
         self.assertEqual([], self.metadata_store.process_payload(ffa_payload))
 
+    def test_process_squashed_mdblob_malformed(self) -> None:
+        """
+        Test if a received entry that cannot be decoded does not stop the other entries from being added.
+        """
+        with db_session:
+            malformed = self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"1" * 20,
+                                                                               "title": "abcabc"})
+            valid = self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"2" * 20, "title": "def"})
+            chunk_data = malformed.serialized().replace(b"abcabc", b"\xff\xfeabcd") + valid.serialized()
+            malformed.delete()
+            valid.delete()
+
+        results = self.metadata_store.process_squashed_mdblob(chunk_data)
+
+        self.assertEqual([ObjState.NEW_OBJECT], [result.obj_state for result in results])
+        with db_session:
+            self.assertIsNotNone(self.metadata_store.TorrentMetadata.get(title="def"))
+
     @db_session
     def test_ffa_with_tracker_info(self) -> None:
         """
@@ -222,6 +308,37 @@ class TestMetadataStore(TestBase[MockCommunity]):
         self.assertEqual(10, ordered2.size)
         self.assertEqual(1, ordered3.size)
 
+    @db_session
+    def test_get_catch_up_entries(self) -> None:
+        """
+        Test if catch-up entries are paged by popularity and skip torrents that were not checked recently.
+        """
+        for i, (seeders, last_check) in enumerate([(5, 100), (9, 100), (5, 100), (7, 10)]):
+            entry = self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": bytes([i]) * 20,
+                                                                            "title": str(i)})
+            entry.health.set(seeders=seeders, last_check=last_check)
+
+        page1, cursor1 = self.metadata_store.get_catch_up_entries(50, 2)
+        page2, cursor2 = self.metadata_store.get_catch_up_entries(50, 2, cursor1)
+
+        self.assertEqual(["1", "0", "2"], [entry.title for entry in page1 + page2])
+        self.assertEqual((5, page1[1].rowid), cursor1)
+        self.assertIsNone(cursor2)
+
+    @db_session
+    def test_get_catch_up_entries_index(self) -> None:
+        """
+        Test if catch-up pages walk the torrent states by seeders, instead of sorting the whole table.
+        """
+        plan = self.metadata_store.db.execute("""
+            EXPLAIN QUERY PLAN SELECT ChannelNode.rowid FROM TorrentState
+            CROSS JOIN ChannelNode ON ChannelNode.health == TorrentState.rowid
+            WHERE TorrentState.has_data == 1 AND TorrentState.last_check > 0 AND TorrentState.seeders < 10
+            ORDER BY TorrentState.seeders DESC, ChannelNode.rowid
+        """).fetchall()
+
+        self.assertIn("idx_torrentstate__seeders__partial", plan[0][3])
+
     @db_session
     def test_get_entries_query_deprecated(self) -> None:
         """
@@ -328,3 +445,87 @@ Multiple uses for byte 3460 of page 7294""", ), ("database disk image is malform
 
         with patch("sqlite3.connect", sqlite_connect_mock):
             self.assertTrue(self.metadata_store.fast_integrity_check(False))
+
+    def test_warm_up(self) -> None:
+        """
+        Test if the database can be warmed up in multiple chunks.
+        """
+        with db_session:
+            for i in range(10):
+                self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": bytes([i]) * 20,
+                                                                       "title": f"torrent {i}"})
+            self.metadata_store.db.execute(sql_create_partial_index_torrentstate_last_check)
+
+        with patch.object(self.metadata_store.db, "get_connection", wraps=self.metadata_store.db.get_connection) as gc:
+            time_to_warm = self.metadata_store.warm_up(chunk_size=3)
+
+        self.assertLessEqual(0, time_to_warm)
+        self.assertLessEqual(len(sql_warm_up_queries) + 1 + 3, gc.call_count)
+
+    def test_warm_up_missing_index(self) -> None:
+        """
+        Test if warming up skips b-trees that do not exist.
+        """
+        with db_session:
+            self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "torrent"})
+
+        with patch.object(self.metadata_store.db, "get_connection", wraps=self.metadata_store.db.get_connection) as gc:
+            self.metadata_store.warm_up()
+
+        self.assertEqual(1 + len(sql_warm_up_queries) - 1, gc.call_count)
+
+    def test_warm_up_create_catch_up_index(self) -> None:
+        """
+        Test if warming up creates the catch-up index of a database that was created without it.
+        """
+        with db_session:
+            self.metadata_store.db.execute("DROP INDEX idx_torrentstate__seeders__partial")
+
+        self.metadata_store.warm_up()
+
+        with db_session:
+            indices = [name for (name, ) in self.metadata_store.db.execute("SELECT name FROM sqlite_master")]
+        self.assertIn("idx_torrentstate__seeders__partial", indices)
+
+    def test_serialized_cached(self) -> None:
+        """
+        Test if the serialized form of a stored entry is cached.
+        """
+        with db_session:
+            md = self.metadata_store.TorrentMetadata(title="test torrent", infohash=b"\x01" * 20)
+        with db_session:
+            md = self.metadata_store.TorrentMetadata.get(rowid=md.rowid)
+            serialized = md.serialized()
+
+            with patch.object(md, "to_dict") as to_dict:
+                self.assertEqual(serialized, md.serialized())
+            to_dict.assert_not_called()
+
+    def test_serialized_cache_invalidated(self) -> None:
+        """
+        Test if the cached serialized form of an entry is dropped when the entry is updated.
+        """
+        with db_session:
+            md = self.metadata_store.TorrentMetadata(title="test torrent", infohash=b"\x01" * 20)
+        with db_session:
+            md = self.metadata_store.TorrentMetadata.get(rowid=md.rowid)
+            serialized = md.serialized()
+            md.tags = "tag1"
+        with db_session:
+            md = self.metadata_store.TorrentMetadata.get(rowid=md.rowid)
+
+            self.assertNotEqual(serialized, md.serialized())
+            self.assertIn(b"tag1", md.serialized())
+
+    def test_serialized_cache_unflushed(self) -> None:
+        """
+        Test if the cached serialized form of an entry is not used when the entry has changes that are not flushed.
+        """
+        with db_session:
+            md = self.metadata_store.TorrentMetadata(title="test torrent", infohash=b"\x01" * 20)
+        with db_session:
+            md = self.metadata_store.TorrentMetadata.get(rowid=md.rowid)
+            md.serialized()
+            md.tags = "tag1"
+
+            self.assertIn(b"tag1", md.serialized())
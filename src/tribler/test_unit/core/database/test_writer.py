@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from asyncio import get_running_loop
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from ipv8.keyvault.crypto import default_eccrypto
+from ipv8.test.base import TestBase
+from pony.orm import db_session
+
+from tribler.core.database.orm_bindings.torrent_metadata import entries_to_chunk
+from tribler.core.database.serialization import int2time
+from tribler.core.database.store import MetadataStore, ObjState
+from tribler.core.database.writer import WriteJob
+
+
+class TestDatabaseWriter(TestBase):
+    """
+    Tests for the DatabaseWriter class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a metadata store and some compressed blobs that it does not know the entries of.
+
+        The writer thread has its own connection, so the database cannot live in memory.
+        """
+        super().setUp()
+        self.temp_dir = TemporaryDirectory()
+        self.metadata_store = MetadataStore(str(Path(self.temp_dir.name) / "metadata.db"),
+                                            default_eccrypto.generate_key("curve25519"), disable_sync=True)
+        self.writer = self.metadata_store.writer
+        self.blobs = []
+        with db_session:
+            for i in range(3):
+                entry = self.metadata_store.TorrentMetadata(title=f"test torrent {i}", infohash=bytes([i]) * 20,
+                                                            torrent_date=int2time(i))
+                self.blobs.append(entries_to_chunk([entry], chunk_size=999999999999999)[0])
+                entry.delete()
+
+    async def tearDown(self) -> None:
+        """
+        Stop the writer thread and close the database.
+        """
+        self.metadata_store.shutdown()
+        self.temp_dir.cleanup()
+        await super().tearDown()
+
+    def create_job(self, blob: bytes) -> WriteJob:
+        """
+        Create a job for the given blob, without queueing it.
+        """
+        return WriteJob(blob, False, get_running_loop().create_future(), get_running_loop())
+
+    async def test_process(self) -> None:
+        """
+        Test if a blob is written by the writer thread.
+        """
+        result, = await self.writer.process(self.blobs[0], skip_personal_metadata_payload=False)
+
+        self.assertEqual(ObjState.NEW_OBJECT, result.obj_state)
+        self.assertEqual("test torrent 0", result.data["name"])
+        self.assertEqual(1, self.writer.get_statistics()["processed"])
+        self.assertEqual(0, self.writer.get_statistics()["queued"])
+
+    async def test_write_coalesced(self) -> None:
+        """
+        Test if multiple blobs are written in a single transaction and every job gets its own results.
+        """
+        jobs = [self.create_job(blob) for blob in self.blobs]
+        self.writer.queued = len(jobs)
+
+        self.writer.write(jobs)
+        results = [await job.future for job in jobs]
+
+        self.assertEqual(1, self.writer.transactions)
+        self.assertEqual(3, self.writer.largest_transaction)
+        self.assertEqual([f"test torrent {i}" for i in range(3)], [r.data["name"] for r, in results])
+
+    async def test_write_retry_separately(self) -> None:
+        """
+        Test if the other blobs of a failed transaction are still written.
+        """
+        jobs = [self.create_job(blob) for blob in self.blobs[:2]]
+        self.writer.queued = len(jobs)
+        process = self.metadata_store.process_compressed_mdblob
+
+        def fail_first(compressed_data: bytes, skip_personal_metadata_payload: bool) -> list:
+            if compressed_data == self.blobs[0]:
+                raise ValueError
+            return process(compressed_data, skip_personal_metadata_payload)
+
+        with patch.object(self.metadata_store, "process_compressed_mdblob", fail_first):
+            self.writer.write(jobs)
+        results = [await job.future for job in jobs]
+
+        self.assertEqual([], results[0])
+        self.assertEqual("test torrent 1", results[1][0].data["name"])
+
+    async def test_write_generation(self) -> None:
+        """
+        Test if writing new entries changes the write generation of the store.
+        """
+        await self.writer.process(self.blobs[0], skip_personal_metadata_payload=False)
+
+        self.assertLess(0, self.metadata_store.write_generation)
+
+    async def test_process_overloaded(self) -> None:
+        """
+        Test if blobs are dropped when too many blobs are waiting for room in the queue.
+        """
+        self.writer.max_waiting = 0
+
+        self.assertEqual([], await self.writer.process(self.blobs[0]))
+        self.assertEqual(1, self.writer.dropped)
+        self.assertIsNone(self.writer.thread)
+
+    async def test_shutdown(self) -> None:
+        """
+        Test if shutting down stops the writer thread.
+        """
+        await self.writer.process(self.blobs[0])
+        thread = self.writer.thread
+
+        self.writer.shutdown()
+
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(self.writer.thread)
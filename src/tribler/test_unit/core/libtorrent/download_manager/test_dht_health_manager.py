@@ -1,10 +1,13 @@
+import math
+import random
 from asyncio import Future
 from binascii import unhexlify
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock
 
 from ipv8.test.base import TestBase
+from libtorrent import bencode
 
-from tribler.core.libtorrent.download_manager.dht_health_manager import DHTHealthManager
+from tribler.core.libtorrent.download_manager.dht_health_manager import DHT_PACKET_ALERTS, DHTHealthManager
 
 
 class TestDHTHealthManager(TestBase):
@@ -26,7 +29,7 @@ class TestDHTHealthManager(TestBase):
         Create a mocked DHTHealthManager.
         """
         super().setUp()
-        self.manager = DHTHealthManager(lt_session=Mock())
+        self.manager = DHTHealthManager(lt_session=Mock(get_settings=Mock(return_value={"alert_mask": 1})))
 
     async def tearDown(self) -> None:
         """
@@ -52,6 +55,18 @@ class TestDHTHealthManager(TestBase):
         self.assertEqual(lookup_future, self.manager.get_health(b"a" * 20, timeout=0.01))
         await lookup_future
 
+    async def test_packet_alerts_gate(self) -> None:
+        """
+        Test if dht_pkt alerts are only enabled while there are lookups running.
+        """
+        lookup_future = self.manager.get_health(b"a" * 20, timeout=0.01)
+        enabled = self.manager.lt_session.apply_settings.call_args.args[0]
+        await lookup_future
+        disabled = self.manager.lt_session.apply_settings.call_args.args[0]
+
+        self.assertEqual({"alert_mask": 1 | DHT_PACKET_ALERTS}, enabled)
+        self.assertEqual({"alert_mask": 1}, disabled)
+
     async def test_combine_bloom_filters_equal(self) -> None:
         """
         Test if two bloom equal filters can be combined.
@@ -88,6 +103,30 @@ class TestDHTHealthManager(TestBase):
 
         self.assertEqual(6000, self.manager.get_size_from_bloomfilter(bf))
 
+    def test_get_size_from_bloom_filter_random(self) -> None:
+        """
+        Test if the size estimate of random bloom filters equals counting their zero bits one by one.
+        """
+        rng = random.Random(42)
+        m = 256 * 8
+        for _ in range(100):
+            bf = bytearray(rng.getrandbits(8) & rng.getrandbits(8) for _ in range(256))
+            zeros = sum(1 for byte in bf for i in range(8) if not byte >> i & 1)
+            expected = int(math.log(min(m - 1, zeros) / m) / (2 * math.log(1 - 1 / m))) if zeros else 6000
+
+            self.assertEqual(expected, self.manager.get_size_from_bloomfilter(bf))
+
+    def test_combine_bloom_filters_random(self) -> None:
+        """
+        Test if combining random bloom filters equals ORing them byte by byte, up to the shortest length.
+        """
+        rng = random.Random(42)
+        bf1 = bytearray(rng.randbytes(256))
+        bf2 = bytearray(rng.randbytes(200))
+        expected = bytearray(a | b for a, b in zip(bf1, bf2, strict=False))
+
+        self.assertEqual(expected, self.manager.combine_bloomfilters(bf1, bf2))
+
     def test_receive_bloomfilters_nothing(self) -> None:
         """
         Test if just receiving a transactions id does nothing to the bloom filter.
@@ -113,3 +152,49 @@ class TestDHTHealthManager(TestBase):
 
         self.assertEqual(bytearray(b"\xee" * 256), self.manager.bf_seeders[infohash])
         self.assertEqual(bytearray(b"\xff" * 256), self.manager.bf_peers[infohash])
+
+    def create_packet_alert(self, packet: dict, incoming: bool) -> MagicMock:
+        """
+        Create a fake dht_pkt alert for the given DHT message.
+        """
+        alert = MagicMock(pkt_buf=bencode(packet))
+        alert.__str__.return_value = "<== fake" if incoming else "==> fake"
+        return alert
+
+    def test_process_packet_skip(self) -> None:
+        """
+        Test if DHT packets without BEP33 keys are not decoded.
+        """
+        self.manager.process_packet(self.create_packet_alert({b"t": b"1", b"y": b"q", b"q": b"ping",
+                                                              b"a": {b"id": b"a" * 20}}, False))
+
+        self.assertEqual(1, self.manager.get_statistics()["packets"])
+        self.assertEqual(0, self.manager.get_statistics()["decoded"])
+
+    def test_process_packet_query(self) -> None:
+        """
+        Test if outgoing BEP33 queries for our lookups are registered.
+        """
+        self.manager.lookup_futures[b"a" * 20] = Future()
+
+        self.manager.process_packet(self.create_packet_alert({b"t": b"1", b"y": b"q", b"q": b"get_peers",
+                                                              b"a": {b"info_hash": b"a" * 20, b"scrape": 1}}, False))
+
+        self.assertEqual({b"1": b"a" * 20}, self.manager.outstanding)
+        self.assertEqual(1, self.manager.get_statistics()["decoded"])
+
+    def test_process_packet_response(self) -> None:
+        """
+        Test if incoming BEP33 responses to our queries are registered.
+        """
+        self.manager.lookup_futures[b"a" * 20] = Future()
+        self.manager.bf_seeders[b"a" * 20] = bytearray(256)
+        self.manager.bf_peers[b"a" * 20] = bytearray(256)
+        self.manager.requesting_bloomfilters(b"1", b"a" * 20)
+
+        self.manager.process_packet(self.create_packet_alert({b"t": b"1", b"y": b"r",
+                                                              b"r": {b"BFsd": b"\x01" * 256, b"BFpe": b"\x02" * 256}},
+                                                             True))
+
+        self.assertEqual(bytearray(b"\x01" * 256), self.manager.bf_seeders[b"a" * 20])
+        self.assertEqual(bytearray(b"\x02" * 256), self.manager.bf_peers[b"a" * 20])
@@ -270,6 +270,28 @@ class TestDownloadManager(TestBase):
 
         self.assertNotIn(b"\x00" * 20, self.manager.downloads)
 
+    async def test_get_dht_peers(self) -> None:
+        """
+        Test if the peers of DHT replies are collected until enough peers were found.
+        """
+        reply = type("dht_get_peers_reply_alert", (object,), {
+            "info_hash": Mock(to_bytes=Mock(return_value=b"\x01" * 20)),
+            "peers": lambda _: [("1.2.3.4", 5), ("1.2.3.4", 6)]
+        })
+        lookup = ensure_future(self.manager.get_dht_peers(b"\x01" * 20, timeout=10, max_peers=2))
+        await sleep(0)
+        self.manager.process_alert(reply())
+
+        self.assertEqual({("1.2.3.4", 5), ("1.2.3.4", 6)}, await lookup)
+        self.manager.ltsessions[0].result().dht_get_peers.assert_called_once()
+        self.assertEqual({}, self.manager.dht_peer_lookups)
+
+    async def test_get_dht_peers_timeout(self) -> None:
+        """
+        Test if the peers that were found so far are returned when a DHT lookup times out.
+        """
+        self.assertEqual(set(), await self.manager.get_dht_peers(b"\x01" * 20, timeout=0.01, max_peers=2))
+
     def test_set_proxy_settings(self) -> None:
         """
         Test if the proxy settings can be set.
@@ -216,3 +216,30 @@ class TestDownloadState(TestBase):
         download_state = DownloadState(download, Mock(), None)
 
         self.assertEqual([], download_state.get_files_completion())
+
+    def test_get_swarm_size_trackers(self) -> None:
+        """
+        Test if the swarm size that the trackers report is preferred over the peers that we know of.
+        """
+        lt_status = Mock(error="", moving_storage=False, paused=False, state=3, list_peers=5, list_seeds=2,
+                         num_complete=10, num_incomplete=20)
+
+        self.assertEqual((10, 20), DownloadState(Mock(), lt_status, None).get_swarm_size())
+
+    def test_get_swarm_size_peers(self) -> None:
+        """
+        Test if the peers that we know of are used if the trackers did not report the swarm size.
+        """
+        lt_status = Mock(error="", moving_storage=False, paused=False, state=5, list_peers=5, list_seeds=2,
+                         num_complete=-1, num_incomplete=-1)
+
+        self.assertEqual((2, 3), DownloadState(Mock(), lt_status, None).get_swarm_size())
+
+    def test_get_swarm_size_stopped(self) -> None:
+        """
+        Test if stopped downloads do not report a swarm size.
+        """
+        lt_status = Mock(error="", moving_storage=False, paused=True, auto_managed=False, num_complete=10,
+                         num_incomplete=20)
+
+        self.assertEqual((0, 0), DownloadState(Mock(), lt_status, None).get_swarm_size())
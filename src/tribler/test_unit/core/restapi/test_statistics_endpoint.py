@@ -29,8 +29,9 @@ class TestStatisticsEndpoint(TestBase):
         Test if getting Tribler stats forwards MetadataStore statistics.
         """
         endpoint = StatisticsEndpoint()
-        endpoint.session = Mock(download_manager=None)
+        endpoint.session = Mock(download_manager=None, torrent_checker=None)
         endpoint.session.mds = Mock(get_db_file_size=Mock(return_value=42), get_num_torrents=Mock(return_value=7))
+        endpoint.session.mds.writer.get_statistics.return_value = {"transactions": 3}
         endpoint.session.socks_servers = []
         endpoint.session.rust_endpoint = Mock(get_socks5_statistics=Mock(return_value=[]))
         request = MockRequest("/api/statistics/tribler")
@@ -40,6 +41,43 @@ class TestStatisticsEndpoint(TestBase):
 
         self.assertEqual(42, response_body_json["tribler_statistics"]["db_size"])
         self.assertEqual(7, response_body_json["tribler_statistics"]["num_torrents"])
+        self.assertEqual({"transactions": 3}, response_body_json["tribler_statistics"]["db_writer"])
+
+    async def test_get_tribler_stats_with_community(self) -> None:
+        """
+        Test if getting Tribler stats forwards the remote query statistics of the content discovery community.
+        """
+        endpoint = StatisticsEndpoint()
+        endpoint.session = Mock(download_manager=None, mds=None, rust_endpoint=None, torrent_checker=None)
+        endpoint.content_discovery_community = Mock(get_peers=Mock(return_value=[]))
+        endpoint.content_discovery_community.query_scheduler.get_statistics.return_value = {"queued": 3}
+        endpoint.content_discovery_community.response_cache.get_statistics.return_value = {"hits": 5}
+        endpoint.content_discovery_community.send_queue.get_statistics.return_value = {"paced": 9}
+        request = MockRequest("/api/statistics/tribler")
+
+        response = endpoint.get_tribler_stats(request)
+        response_body_json = await response_to_json(response)
+
+        self.assertEqual(0, response_body_json["tribler_statistics"]["peers"])
+        self.assertEqual({"queued": 3}, response_body_json["tribler_statistics"]["remote_queries"])
+        self.assertEqual({"hits": 5}, response_body_json["tribler_statistics"]["remote_query_cache"])
+        self.assertEqual({"paced": 9}, response_body_json["tribler_statistics"]["response_sends"])
+
+    async def test_get_tribler_stats_with_torrent_checker(self) -> None:
+        """
+        Test if getting Tribler stats forwards the health check statistics of the torrent checker.
+        """
+        endpoint = StatisticsEndpoint()
+        endpoint.session = Mock(download_manager=None, mds=None, rust_endpoint=None)
+        endpoint.session.torrent_checker.bulk_scheduler.get_statistics.return_value = {"sessions": 4}
+        endpoint.session.torrent_checker.get_statistics.return_value = {"coalesced": 2}
+        request = MockRequest("/api/statistics/tribler")
+
+        response = endpoint.get_tribler_stats(request)
+        response_body_json = await response_to_json(response)
+
+        self.assertEqual({"sessions": 4}, response_body_json["tribler_statistics"]["bulk_health_checks"])
+        self.assertEqual({"coalesced": 2}, response_body_json["tribler_statistics"]["health_checks"])
 
     async def test_get_ipv8_stats_no_ipv8(self) -> None:
         """
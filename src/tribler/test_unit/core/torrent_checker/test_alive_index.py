@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from ipv8.test.base import TestBase
+
+from tribler.core.torrent_checker.alive_index import AliveTorrentIndex
+from tribler.core.torrent_checker.healthdataclasses import HealthInfo
+
+
+class TestAliveTorrentIndex(TestBase):
+    """
+    Tests for the AliveTorrentIndex class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create an index with ten torrents, with increasing popularity.
+        """
+        super().setUp()
+        self.index = AliveTorrentIndex(HealthInfo(bytes([i]) * 20, i, i) for i in range(10))
+
+    def test_alive_only(self) -> None:
+        """
+        Test if only torrents with seeders are indexed.
+        """
+        self.assertEqual(9, len(self.index))
+        self.assertNotIn(b"\x00" * 20, self.index)
+        self.assertIn(b"\x01" * 20, self.index)
+
+    def test_most_popular(self) -> None:
+        """
+        Test if the most popular torrents are returned, the most popular first.
+        """
+        self.assertEqual([9, 8, 7], [health.seeders for health in self.index.most_popular(3)])
+
+    def test_most_popular_all(self) -> None:
+        """
+        Test if all torrents are returned if there are not enough torrents.
+        """
+        self.assertEqual(9, len(self.index.most_popular(100)))
+
+    def test_update(self) -> None:
+        """
+        Test if updated health info moves a torrent in the popularity order.
+        """
+        self.index.update(HealthInfo(b"\x01" * 20, 100, 0))
+
+        self.assertEqual([100, 9], [health.seeders for health in self.index.most_popular(2)])
+        self.assertEqual(9, len(self.index))
+
+    def test_update_dead(self) -> None:
+        """
+        Test if a torrent is removed when it no longer has seeders.
+        """
+        self.index.update(HealthInfo(b"\x09" * 20, 0, 5))
+
+        self.assertNotIn(b"\x09" * 20, self.index)
+        self.assertEqual([8], [health.seeders for health in self.index.most_popular(1)])
+        self.assertEqual(8, len(self.index.sample(100)))
+
+    def test_remove(self) -> None:
+        """
+        Test if removed torrents are no longer sampled.
+        """
+        for i in range(1, 9):
+            self.index.remove(bytes([i]) * 20)
+        self.index.remove(b"\xff" * 20)
+
+        self.assertEqual([b"\x09" * 20], [health.infohash for health in self.index.sample(10)])
+        self.assertEqual({b"\x09" * 20: 0}, self.index.positions)
+
+    def test_sample(self) -> None:
+        """
+        Test if random samples consist of distinct alive torrents.
+        """
+        sample = self.index.sample(5)
+
+        self.assertEqual(5, len({health.infohash for health in sample}))
+        self.assertTrue(all(health.infohash in self.index for health in sample))
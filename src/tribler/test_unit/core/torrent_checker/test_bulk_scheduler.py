@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any
+from unittest.mock import AsyncMock, Mock
+
+from ipv8.keyvault.crypto import default_eccrypto
+from ipv8.test.base import TestBase
+from pony.orm import db_session
+
+from tribler.core.database.store import MetadataStore
+from tribler.core.torrent_checker.bulk_scheduler import BulkHealthScheduler
+from tribler.core.torrent_checker.healthdataclasses import HealthInfo, TrackerResponse
+from tribler.core.torrent_checker.torrent_checker import TorrentChecker
+from tribler.core.torrent_checker.tracker_manager import MAX_TRACKER_FAILURES, TrackerManager
+from tribler.core.torrent_checker.tracker_scoreboard import BREAKER_THRESHOLD, TrackerScoreboard
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class TestBulkHealthScheduler(TestBase):
+    """
+    Tests for the BulkHealthScheduler class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a database with two trackers and a scheduler for a fake torrent checker.
+        """
+        super().setUp()
+        self.metadata_store = MetadataStore(":memory:", default_eccrypto.generate_key("curve25519"),
+                                            disable_sync=True)
+        self.tracker_manager = TrackerManager(metadata_store=self.metadata_store)
+        self.checker = Mock(mds=self.metadata_store, tracker_manager=self.tracker_manager,
+                            create_session_for_request=self.create_session, tracker_scores=TrackerScoreboard(),
+                            downloading=set())
+        self.metadata_store.run_threaded = self.run_now
+        self.scheduler = BulkHealthScheduler(self.checker, max_sessions=2, packets_per_second=1, burst=4)
+
+        with db_session:
+            udp = self.metadata_store.TrackerState(url="udp://tracker.com:1337")
+            http = self.metadata_store.TrackerState(url="http://tracker.com/announce")
+            for i in range(100):
+                self.metadata_store.TorrentState(infohash=(i + 1).to_bytes(20, "big"), last_check=i,
+                                                 trackers={udp, http} if i < 10 else {udp})
+
+    async def tearDown(self) -> None:
+        """
+        Close the database.
+        """
+        self.metadata_store.shutdown()
+        await super().tearDown()
+
+    async def run_now(self, func: Callable, *args: Any) -> Any:  # noqa: ANN401
+        """
+        Run a database function right away, the in-memory database only exists for this thread.
+        """
+        return func(*args)
+
+    def create_session(self, url: str, timeout: float) -> Mock:
+        """
+        Create a fake session that accepts at most 60 infohashes.
+        """
+        session = Mock(tracker_url=url, infohash_list=[], max_infohashes=60)
+        session.add_infohash = session.infohash_list.append
+        return session
+
+    async def test_refill(self) -> None:
+        """
+        Test if stale torrents are grouped by tracker and only queued for a single tracker.
+        """
+        added = await self.scheduler.refill()
+
+        self.assertEqual(100, added)
+        self.assertEqual(100, sum(len(infohashes) for infohashes in self.scheduler.pending.values()))
+
+    async def test_refill_skip_fresh(self) -> None:
+        """
+        Test if torrents that were checked recently are not queued.
+        """
+        with db_session:
+            self.metadata_store.TorrentState.get(infohash=(1).to_bytes(20, "big")).last_check = 2 ** 40
+
+        self.assertEqual(99, await self.scheduler.refill())
+
+    async def test_refill_skip_selected(self) -> None:
+        """
+        Test if torrents that were selected recently are not queued again.
+        """
+        await self.scheduler.refill()
+        self.scheduler.pending.clear()
+
+        self.assertEqual(0, await self.scheduler.refill())
+
+    async def test_refill_skip_downloading(self) -> None:
+        """
+        Test if torrents that we download are not queued.
+        """
+        self.checker.downloading = {(1).to_bytes(20, "big")}
+
+        self.assertEqual(99, await self.scheduler.refill())
+
+    async def test_refill_skip_dead_tracker(self) -> None:
+        """
+        Test if no torrents are queued for dead trackers.
+        """
+        with db_session:
+            tracker = self.metadata_store.TrackerState.get(url="udp://tracker.com:1337")
+            tracker.set(alive=False, failures=MAX_TRACKER_FAILURES, last_check=int(time.time()))
+
+        self.assertEqual(10, await self.scheduler.refill())
+        self.assertEqual(["http://tracker.com/announce"], list(self.scheduler.pending))
+
+    async def test_refill_revive_dead_tracker(self) -> None:
+        """
+        Test if a dead tracker of which the backoff expired is probed with a single torrent.
+        """
+        with db_session:
+            tracker = self.metadata_store.TrackerState.get(url="http://tracker.com/announce")
+            tracker.set(alive=False, failures=MAX_TRACKER_FAILURES, last_check=1)
+
+        await self.scheduler.refill()
+
+        self.assertEqual(1, len(self.scheduler.pending["http://tracker.com/announce"]))
+
+    async def test_refill_revive_dead_tracker_many_failures(self) -> None:
+        """
+        Test if a dead tracker that failed very often is still probed once its (maximum) backoff expired.
+        """
+        with db_session:
+            tracker = self.metadata_store.TrackerState.get(url="http://tracker.com/announce")
+            tracker.set(alive=False, failures=1000, last_check=1)
+
+        await self.scheduler.refill()
+
+        self.assertEqual(1, len(self.scheduler.pending["http://tracker.com/announce"]))
+
+    async def test_schedule_refill_error(self) -> None:
+        """
+        Test if the stale torrents are not loaded again right away if loading them fails.
+        """
+        self.scheduler.refill = AsyncMock(side_effect=ValueError)
+
+        with self.assertRaises(ValueError):
+            await self.scheduler.schedule()
+        await self.scheduler.schedule()
+
+        self.scheduler.refill.assert_called_once()
+
+    async def test_schedule_full_scrapes(self) -> None:
+        """
+        Test if sessions are filled up to the maximum number of infohashes of their tracker.
+        """
+        self.scheduler.pending["udp://tracker.com:1337"] = deque(range(100))
+
+        started = await self.scheduler.schedule()
+
+        self.assertEqual(1, started)
+        self.assertEqual(40, len(self.scheduler.pending["udp://tracker.com:1337"]))
+        self.assertEqual({"udp://tracker.com:1337"}, self.scheduler.busy_trackers)
+        self.checker.register_anonymous_task.assert_called_once()
+
+    async def test_schedule_concurrency(self) -> None:
+        """
+        Test if no more sessions are started than the concurrency limit allows.
+        """
+        for i in range(3):
+            self.scheduler.pending[f"http://tracker{i}.com/announce"] = deque([i])
+
+        self.assertEqual(2, await self.scheduler.schedule())
+        self.assertEqual(2, len(self.scheduler.busy_trackers))
+
+    async def test_schedule_circuit_open(self) -> None:
+        """
+        Test if no sessions are started for trackers that failed too often recently.
+        """
+        for _ in range(BREAKER_THRESHOLD):
+            self.checker.tracker_scores.record_failure("http://tracker0.com/announce", "request timed out")
+        self.scheduler.pending["http://tracker0.com/announce"] = deque([0])
+
+        self.assertEqual(0, await self.scheduler.schedule())
+        self.assertNotIn("http://tracker0.com/announce", self.scheduler.pending)
+
+    async def test_schedule_packet_budget(self) -> None:
+        """
+        Test if no sessions are started when there is no packet budget left.
+        """
+        await self.scheduler.refill()
+        self.scheduler.bucket.tokens = 0
+
+        self.assertEqual(0, await self.scheduler.schedule())
+
+    async def test_check_update_health(self) -> None:
+        """
+        Test if the health of a successful scrape is stored and scheduled, without notifying the GUI.
+        """
+        infohash = (1).to_bytes(20, "big")
+        health = HealthInfo(infohash, seeders=1, leechers=2, last_check=int(time.time()), self_checked=True)
+        self.checker.get_tracker_response = AsyncMock(return_value=TrackerResponse("udp://tracker.com", [health]))
+        self.checker.set_torrent_health = TorrentChecker.set_torrent_health.__get__(self.checker)
+        self.scheduler.busy_trackers.add("udp://tracker.com")
+
+        await self.scheduler.check("udp://tracker.com", Mock())
+
+        with db_session:
+            torrent_state = self.metadata_store.TorrentState.get(infohash=infohash)
+            self.assertEqual((1, 2, True), (torrent_state.seeders, torrent_state.leechers, torrent_state.self_checked))
+        self.checker.check_schedule.update.assert_called_once_with(health)
+        self.checker.notify.assert_not_called()
+        self.assertEqual(1, self.scheduler.updated)
+        self.assertEqual(set(), self.scheduler.busy_trackers)
+
+    async def test_check_skip_older_health(self) -> None:
+        """
+        Test if the health of a scrape is not stored if the database has fresher health.
+        """
+        infohash = (1).to_bytes(20, "big")
+        with db_session:
+            self.metadata_store.TorrentState.get(infohash=infohash).set(seeders=5, last_check=int(time.time()),
+                                                                           self_checked=True)
+        health = HealthInfo(infohash, seeders=1, leechers=2, last_check=int(time.time()) - 60, self_checked=True)
+        self.checker.get_tracker_response = AsyncMock(return_value=TrackerResponse("udp://tracker.com", [health]))
+
+        await self.scheduler.check("udp://tracker.com", Mock())
+
+        self.checker.set_torrent_health.assert_not_called()
+        self.assertEqual(0, self.scheduler.updated)
+
+    async def test_check_dead_tracker(self) -> None:
+        """
+        Test if the queued torrents of a tracker are dropped when it dies.
+        """
+        url = "udp://tracker.com:1337"
+        await self.scheduler.refill()
+        self.checker.get_tracker_response = AsyncMock(side_effect=ValueError)
+        with db_session:
+            self.metadata_store.TrackerState.get(url=url).alive = False
+
+        await self.scheduler.check(url, Mock())
+
+        self.assertNotIn(url, self.scheduler.pending)
+        self.assertEqual(1, self.scheduler.failed_sessions)
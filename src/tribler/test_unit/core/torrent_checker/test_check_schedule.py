@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from ipv8.test.base import TestBase
+
+from tribler.core.torrent_checker.check_schedule import (
+    INTEREST_LIFETIME,
+    MIN_CHECK_INTERVAL,
+    HealthCheckSchedule,
+    ScheduledTorrent,
+)
+from tribler.core.torrent_checker.healthdataclasses import HealthInfo
+
+
+class TestHealthCheckSchedule(TestBase):
+    """
+    Tests for the HealthCheckSchedule class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create an empty schedule.
+        """
+        super().setUp()
+        self.schedule = HealthCheckSchedule(max_size=10)
+        self.now = 1000000.0
+
+    def test_interval_popular(self) -> None:
+        """
+        Test if popular torrents are checked sooner than unpopular ones.
+        """
+        popular = ScheduledTorrent(b"\x01" * 20, popularity=1000)
+        unpopular = ScheduledTorrent(b"\x02" * 20, popularity=1)
+
+        self.assertLess(self.schedule.get_check_interval(popular, self.now),
+                        self.schedule.get_check_interval(unpopular, self.now))
+
+    def test_interval_dead(self) -> None:
+        """
+        Test if dead torrents are checked later than alive ones.
+        """
+        dead = ScheduledTorrent(b"\x01" * 20)
+        alive = ScheduledTorrent(b"\x02" * 20, popularity=1)
+
+        self.assertLess(self.schedule.get_check_interval(alive, self.now),
+                        self.schedule.get_check_interval(dead, self.now))
+
+    def test_interval_volatile(self) -> None:
+        """
+        Test if torrents of which the health changes a lot are checked sooner.
+        """
+        volatile = ScheduledTorrent(b"\x01" * 20, popularity=10, volatility=1.0)
+        stable = ScheduledTorrent(b"\x02" * 20, popularity=10)
+
+        self.assertLess(self.schedule.get_check_interval(volatile, self.now),
+                        self.schedule.get_check_interval(stable, self.now))
+
+    def test_interval_interest(self) -> None:
+        """
+        Test if torrents that were recently shown to the user are checked sooner, but not too soon.
+        """
+        interesting = ScheduledTorrent(b"\x01" * 20, popularity=10, interest=self.now)
+        forgotten = ScheduledTorrent(b"\x02" * 20, popularity=10, interest=self.now - INTEREST_LIFETIME)
+
+        self.assertLess(self.schedule.get_check_interval(interesting, self.now),
+                        self.schedule.get_check_interval(forgotten, self.now))
+        self.assertLessEqual(MIN_CHECK_INTERVAL, self.schedule.get_check_interval(interesting, self.now))
+
+    def test_update_volatility(self) -> None:
+        """
+        Test if a change in health between checks increases the volatility of a torrent.
+        """
+        self.schedule.update(HealthInfo(b"\x01" * 20, 10, 0, last_check=1), self.now)
+        self.schedule.update(HealthInfo(b"\x01" * 20, 0, 20, last_check=2), self.now)
+
+        self.assertLess(0, self.schedule.torrents[b"\x01" * 20].volatility)
+
+    def test_update_max_size(self) -> None:
+        """
+        Test if no more torrents are scheduled than the maximum size and if new torrents are still scheduled.
+        """
+        for i in range(20):
+            self.schedule.update(HealthInfo(bytes([i]) * 20, 1, 0, last_check=1), self.now)
+
+        self.assertEqual(10, len(self.schedule))
+        self.assertIn(bytes([19]) * 20, self.schedule)
+
+    def test_update_evict_least_popular(self) -> None:
+        """
+        Test if the least popular torrent is forgotten to make room for a new torrent.
+        """
+        for i in range(10):
+            self.schedule.update(HealthInfo(bytes([i]) * 20, 10 - i, 0, last_check=1), self.now)
+
+        self.schedule.update(HealthInfo(b"\xff" * 20, 5, 0, last_check=1), self.now)
+
+        self.assertIn(b"\xff" * 20, self.schedule)
+        self.assertNotIn(bytes([9]) * 20, self.schedule)
+
+    def test_add_interest_full(self) -> None:
+        """
+        Test if torrents that are shown to the user are scheduled, even if the schedule is full.
+        """
+        for i in range(10):
+            self.schedule.update(HealthInfo(bytes([i]) * 20, 1000, 0, last_check=int(self.now)), self.now)
+        self.schedule.add_interest([bytes([0]) * 20], self.now)
+
+        self.schedule.add_interest([b"\xff" * 20], self.now)
+
+        self.assertEqual(10, len(self.schedule))
+        self.assertIn(bytes([0]) * 20, self.schedule)
+        self.assertEqual([b"\xff" * 20], self.schedule.pop_due(10, self.now))
+
+    def test_add_interest_over_capacity(self) -> None:
+        """
+        Test if torrents that are shown to the user go over the maximum size if all torrents were shown to the user.
+        """
+        self.schedule.add_interest([bytes([i]) * 20 for i in range(11)], self.now)
+
+        self.assertEqual(11, len(self.schedule))
+
+    def test_pop_due_order(self) -> None:
+        """
+        Test if the most overdue torrents are returned first and torrents that are not due are not returned.
+        """
+        self.schedule.update(HealthInfo(b"\x01" * 20, 1, 0, last_check=int(self.now) - 3 * 3600), self.now)
+        self.schedule.update(HealthInfo(b"\x02" * 20, 1000, 0, last_check=1), self.now)
+        self.schedule.update(HealthInfo(b"\x03" * 20, 1, 0, last_check=int(self.now)), self.now)
+
+        self.assertEqual([b"\x02" * 20, b"\x01" * 20], self.schedule.pop_due(10, self.now))
+
+    def test_pop_due_retry(self) -> None:
+        """
+        Test if a torrent that was returned is returned again if its check does not update it.
+        """
+        self.schedule.update(HealthInfo(b"\x01" * 20, 1, 0, last_check=1), self.now)
+
+        self.assertEqual([b"\x01" * 20], self.schedule.pop_due(10, self.now))
+        self.assertEqual([], self.schedule.pop_due(10, self.now))
+        self.assertEqual([b"\x01" * 20], self.schedule.pop_due(10, self.now + MIN_CHECK_INTERVAL))
+
+    def test_pop_due_rescheduled(self) -> None:
+        """
+        Test if the old heap items of rescheduled and removed torrents are skipped.
+        """
+        self.schedule.update(HealthInfo(b"\x01" * 20, 1, 0, last_check=1), self.now)
+        self.schedule.update(HealthInfo(b"\x01" * 20, 1, 0, last_check=int(self.now)), self.now)
+        self.schedule.update(HealthInfo(b"\x02" * 20, 1, 0, last_check=1), self.now)
+        self.schedule.remove(b"\x02" * 20)
+
+        self.assertEqual([], self.schedule.pop_due(10, self.now))
+
+    def test_add_interest_unknown(self) -> None:
+        """
+        Test if torrents that were never checked are due right away when they are shown to the user.
+        """
+        self.schedule.add_interest([b"\x01" * 20], self.now)
+
+        self.assertEqual([b"\x01" * 20], self.schedule.pop_due(10, self.now))
+
+    def test_add_interest_sooner(self) -> None:
+        """
+        Test if showing a torrent to the user moves its next check forward.
+        """
+        self.schedule.update(HealthInfo(b"\x01" * 20, 1, 0, last_check=int(self.now)), self.now)
+        next_check = self.schedule.torrents[b"\x01" * 20].next_check
+
+        self.schedule.add_interest([b"\x01" * 20], self.now)
+
+        self.assertLess(self.schedule.torrents[b"\x01" * 20].next_check, next_check)
+
+    def test_compact(self) -> None:
+        """
+        Test if rescheduling the same torrent many times does not grow the heap without bounds.
+        """
+        for i in range(1000):
+            self.schedule.update(HealthInfo(b"\x01" * 20, 1, 0, last_check=i), self.now)
+
+        self.assertGreater(100, len(self.schedule.heap))
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import struct
+from unittest.mock import AsyncMock, Mock, patch
+
+from ipv8.test.base import TestBase
+
+from tribler.core.socks5.client import Socks5Error
+from tribler.core.torrent_checker.swarm_prober import (
+    MESSAGE_BITFIELD,
+    MESSAGE_HAVE_NONE,
+    PROTOCOL_HEADER,
+    RESERVED_BYTES,
+    SwarmProber,
+    is_complete_bitfield,
+)
+
+
+class FakePeer:
+    """
+    A local BitTorrent peer that answers a handshake with a fixed message.
+    """
+
+    def __init__(self, infohash: bytes, message: bytes) -> None:
+        """
+        Create a new fake peer.
+        """
+        self.infohash = infohash
+        self.message = message
+        self.server: asyncio.Server | None = None
+        self.address = ("127.0.0.1", 0)
+
+    async def start(self) -> None:
+        """
+        Start listening on a free local port.
+        """
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.address = self.server.sockets[0].getsockname()[:2]
+
+    async def stop(self) -> None:
+        """
+        Stop listening.
+        """
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Answer a handshake with our own handshake and message.
+        """
+        await reader.readexactly(68)
+        writer.write(PROTOCOL_HEADER + RESERVED_BYTES + self.infohash + b"\x01" * 20)
+        writer.write(struct.pack(">I", len(self.message)) + self.message)
+        await writer.drain()
+        writer.close()
+
+
+class TestSwarmProber(TestBase):
+    """
+    Tests for the SwarmProber class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a prober with a fake download manager.
+        """
+        super().setUp()
+        self.download_manager = Mock(get_dht_peers=AsyncMock(return_value=set()))
+        self.prober = SwarmProber(self.download_manager, max_probes=1, max_peers=10, timeout=5)
+
+    def test_is_complete_bitfield(self) -> None:
+        """
+        Test if bitfields with all pieces are recognized, with and without spare bits.
+        """
+        self.assertTrue(is_complete_bitfield(b"\xff\xff"))
+        self.assertTrue(is_complete_bitfield(b"\xff\xe0"))
+        self.assertFalse(is_complete_bitfield(b"\xff\xa0"))
+        self.assertFalse(is_complete_bitfield(b"\xfe\xff"))
+        self.assertFalse(is_complete_bitfield(b""))
+
+    async def test_probe(self) -> None:
+        """
+        Test if the seed ratio of the answering peers is applied to all peers that the DHT returned.
+        """
+        seeder = FakePeer(b"a" * 20, bytes([MESSAGE_BITFIELD]) + b"\xff\xc0")
+        leecher = FakePeer(b"a" * 20, bytes([MESSAGE_HAVE_NONE]))
+        await seeder.start()
+        await leecher.start()
+        self.download_manager.get_dht_peers.return_value = {seeder.address, leecher.address,
+                                                            ("127.0.0.1", 1), ("127.0.0.1", 2)}
+
+        health = await self.prober.probe(b"a" * 20)
+        await seeder.stop()
+        await leecher.stop()
+
+        self.assertEqual((2, 2), (health.seeders, health.leechers))
+        self.assertEqual({"probes": 1, "running": 0, "peers_contacted": 4, "peers_answered": 2},
+                         self.prober.get_statistics())
+
+    async def test_probe_wrong_infohash(self) -> None:
+        """
+        Test if peers that answer with another infohash are ignored.
+        """
+        peer = FakePeer(b"b" * 20, bytes([MESSAGE_HAVE_NONE]))
+        await peer.start()
+
+        answer = await self.prober.probe_peer(b"a" * 20, peer.address, 5)
+        await peer.stop()
+
+        self.assertIsNone(answer)
+
+    async def test_probe_no_peers(self) -> None:
+        """
+        Test if no health is returned when the DHT knows no peers.
+        """
+        self.assertIsNone(await self.prober.probe(b"a" * 20))
+
+    async def test_probe_timeout(self) -> None:
+        """
+        Test if a probe is cut off at its hard time limit.
+        """
+        async def get_dht_peers(*_: object) -> set:
+            await asyncio.Event().wait()
+            return set()
+
+        self.prober.timeout = 0.01
+        self.download_manager.get_dht_peers = get_dht_peers
+
+        self.assertIsNone(await self.prober.probe(b"a" * 20))
+
+    async def test_probe_bounded(self) -> None:
+        """
+        Test if no more probes run at the same time than allowed.
+        """
+        release = asyncio.Event()
+
+        async def get_dht_peers(*_: object) -> set:
+            await release.wait()
+            return set()
+
+        self.download_manager.get_dht_peers = get_dht_peers
+        probes = [asyncio.ensure_future(self.prober.probe(bytes([i]) * 20)) for i in range(2)]
+        await asyncio.sleep(0)
+        running = self.prober.running
+        release.set()
+        await asyncio.gather(*probes)
+
+        self.assertEqual(1, running)
+        self.assertEqual(2, self.prober.probes)
+
+    async def test_probe_peer_proxy_error(self) -> None:
+        """
+        Test if peers that the SOCKS5 proxy cannot connect to are ignored.
+        """
+        client = Mock(connect_tcp=AsyncMock(side_effect=Socks5Error("Connection refused")))
+        with patch("tribler.core.torrent_checker.swarm_prober.Socks5Client", return_value=client):
+            answer = await self.prober.probe_peer(b"a" * 20, ("1.2.3.4", 5), 5, ("127.0.0.1", 1234))
+
+        self.assertIsNone(answer)
+        client.transport.close.assert_called_once()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import random
 import secrets
 import time
@@ -67,7 +68,8 @@ class TestTorrentChecker(TestBase):
 
         self.tracker_manager = TrackerManager(state_dir=Path("."), metadata_store=self.metadata_store)
         self.torrent_checker = TorrentChecker(config=TriblerConfigManager(), tracker_manager=self.tracker_manager,
-                                              download_manager=MagicMock(get_metainfo=AsyncMock(return_value={})),
+                                              download_manager=MagicMock(get_metainfo=AsyncMock(return_value={}),
+                                                                         get_dht_peers=AsyncMock(return_value=set())),
                                               notifier=MagicMock(), metadata_store=self.metadata_store)
 
     async def tearDown(self) -> None:
@@ -93,6 +95,19 @@ class TestTorrentChecker(TestBase):
         self.assertIsNone(self.torrent_checker.udp_transport)
         self.assertTrue(self.torrent_checker.is_pending_task_active("listen_udp_port"))
 
+    async def test_initialize_no_bulk_checks(self) -> None:
+        """
+        Test if the bulk health checks are not started if they are disabled.
+        """
+        self.torrent_checker.config.set("torrent_checker/bulk_checks", False)
+        self.torrent_checker.create_socket_or_schedule = AsyncMock()
+        self.metadata_store.run_threaded = AsyncMock(return_value=[])
+
+        await self.torrent_checker.initialize()
+
+        self.assertTrue(self.torrent_checker.is_pending_task_active("check local torrents"))
+        self.assertFalse(self.torrent_checker.is_pending_task_active("check stale torrents in bulk"))
+
     async def test_health_check_blacklisted_trackers(self) -> None:
         """
         Test if only cached results of a torrent are returned with only blacklisted trackers.
@@ -122,6 +137,56 @@ class TestTorrentChecker(TestBase):
         self.assertEqual(5, result.seeders)
         self.assertEqual(10, result.leechers)
 
+    async def test_health_check_fresh(self) -> None:
+        """
+        Test if our own recent results of a torrent are returned without a new check, even if a check is forced.
+        """
+        self.torrent_checker.mds.TorrentState.instances = [MockTorrentState(infohash=b"a" * 20, seeders=5, leechers=10,
+                                                                            last_check=int(time.time()),
+                                                                            self_checked=True)]
+        self.torrent_checker.create_session_for_request = Mock()
+
+        result = await self.torrent_checker.check_torrent_health(b"a" * 20, scrape_now=True)
+
+        self.assertEqual(5, result.seeders)
+        self.assertEqual(1, self.torrent_checker.get_statistics()["cache_hits"])
+        self.torrent_checker.create_session_for_request.assert_not_called()
+
+    async def test_health_check_coalesced(self) -> None:
+        """
+        Test if concurrent checks of the same torrent share a single check.
+        """
+        self.torrent_checker._check_torrent_health = AsyncMock(return_value=HealthInfo(b"a" * 20, seeders=3))  # noqa: SLF001
+
+        results = await asyncio.gather(self.torrent_checker.check_torrent_health(b"a" * 20),
+                                       self.torrent_checker.check_torrent_health(b"a" * 20))
+
+        self.assertEqual([3, 3], [health.seeders for health in results])
+        self.torrent_checker._check_torrent_health.assert_called_once()  # noqa: SLF001
+        self.assertEqual({"checks": 1, "cache_hits": 0, "coalesced": 1, "running": 0, "downloading": 0},
+                         self.torrent_checker.get_statistics())
+
+    async def test_health_check_coalesced_cancel(self) -> None:
+        """
+        Test if a caller that stops waiting does not cancel the shared check for the other callers.
+        """
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def check(infohash: bytes, timeout: float) -> HealthInfo:
+            started.set()
+            await release.wait()
+            return HealthInfo(infohash, seeders=3)
+
+        self.torrent_checker._check_torrent_health = check  # noqa: SLF001
+        first = asyncio.ensure_future(self.torrent_checker.check_torrent_health(b"a" * 20))
+        second = asyncio.ensure_future(self.torrent_checker.check_torrent_health(b"a" * 20))
+        await started.wait()
+        first.cancel()
+        release.set()
+
+        self.assertEqual(3, (await second).seeders)
+
     def test_load_torrents_check_from_db_no_self_checked(self) -> None:
         """
         Test if the torrents_checked only considers self-checked torrents.
@@ -241,6 +306,94 @@ class TestTorrentChecker(TestBase):
 
         self.assertIsNone(result)
 
+    async def test_health_check_swarm_probe(self) -> None:
+        """
+        Test if the swarm of a torrent is probed when its trackers do not know it.
+        """
+        self.torrent_checker.config.set("libtorrent/download_defaults/number_hops", 0)
+        self.torrent_checker._swarm_prober = Mock(probe=AsyncMock(return_value=HealthInfo(b"a" * 20, 3, 4)))  # noqa: SLF001
+
+        result = await self.torrent_checker.check_torrent_health(b"a" * 20)
+
+        self.assertEqual((3, 4), (result.seeders, result.leechers))
+        self.torrent_checker.download_manager.get_metainfo.assert_not_called()
+
+    async def test_health_check_swarm_probe_anonymous(self) -> None:
+        """
+        Test if the swarm of a torrent is probed over the SOCKS5 proxy of our anonymity hops.
+        """
+        self.torrent_checker.config.set("libtorrent/download_defaults/number_hops", 2)
+        self.torrent_checker.socks_listen_ports = [1234, 1235]
+        self.torrent_checker._swarm_prober = Mock(probe=AsyncMock(return_value=None))  # noqa: SLF001
+
+        await self.torrent_checker.check_torrent_health(b"a" * 20)
+
+        self.torrent_checker.swarm_prober.probe.assert_called_once_with(b"a" * 20, 2, ("127.0.0.1", 1235))
+
+    async def test_health_check_swarm_probe_no_hops(self) -> None:
+        """
+        Test if the swarm of a torrent is not probed when the required anonymity hops are not available.
+        """
+        self.torrent_checker.config.set("libtorrent/download_defaults/number_hops", 1)
+        self.torrent_checker._swarm_prober = Mock(probe=AsyncMock(return_value=None))  # noqa: SLF001
+
+        result = await self.torrent_checker.check_torrent_health(b"a" * 20)
+
+        self.assertEqual((0, 0), (result.seeders, result.leechers))
+        self.torrent_checker.swarm_prober.probe.assert_not_called()
+
+    async def test_tracker_response_scored(self) -> None:
+        """
+        Test if the latency of a successful tracker session is registered in the tracker scoreboard.
+        """
+        session = HttpTrackerSession("http://localhost/tracker", ("localhost", 8475), "/announce", 5, None)
+        session.connect_to_tracker = AsyncMock(return_value=TrackerResponse("http://localhost/tracker", []))
+        self.torrent_checker.sessions["http://localhost/tracker"].append(session)
+
+        await self.torrent_checker.get_tracker_response(session)
+
+        self.assertEqual(1, self.torrent_checker.tracker_scores.scores["http://localhost/tracker"].successes)
+
+    async def test_tracker_error_scored(self) -> None:
+        """
+        Test if the error class of a failed tracker session is registered in the tracker scoreboard.
+        """
+        session = HttpTrackerSession("http://localhost/tracker", ("localhost", 8475), "/announce", 5, None)
+        session.connect_to_tracker = AsyncMock(side_effect=ValueError("request timed out"))
+        self.torrent_checker.sessions["http://localhost/tracker"].append(session)
+
+        with self.assertRaises(ValueError):
+            await self.torrent_checker.get_tracker_response(session)
+
+        self.assertEqual("timeout", self.torrent_checker.tracker_scores.scores["http://localhost/tracker"].last_error)
+
+    async def test_create_session_adaptive_timeout(self) -> None:
+        """
+        Test if sessions for trackers that usually respond fast get a shorter timeout.
+        """
+        for _ in range(5):
+            self.torrent_checker.tracker_scores.record_success("http://localhost/announce", 0.5)
+        self.torrent_checker.config.set("libtorrent/download_defaults/number_hops", 0)
+
+        session = self.torrent_checker.create_session_for_request("http://localhost/announce", timeout=20)
+
+        self.assertGreater(20, session.timeout)
+        await self.torrent_checker.clean_session(session)
+
+    async def test_health_check_circuit_open(self) -> None:
+        """
+        Test if trackers that failed too often recently are skipped in a health check.
+        """
+        tracker, = self.torrent_checker.mds.TrackerState.instances = [MockTrackerState(url="http://localhost/tracker")]
+        self.torrent_checker.mds.TorrentState.instances = [MockTorrentState(infohash=b"a" * 20, trackers={tracker})]
+        for _ in range(3):
+            self.torrent_checker.tracker_scores.record_failure("http://localhost/tracker", "request timed out")
+        self.torrent_checker.create_session_for_request = Mock()
+
+        await self.torrent_checker.check_torrent_health(b"a" * 20)
+
+        self.torrent_checker.create_session_for_request.assert_not_called()
+
     def test_get_valid_next_tracker_for_auto_check(self) -> None:
         """
         Test if only valid tracker url are used for auto check.
@@ -274,28 +427,112 @@ class TestTorrentChecker(TestBase):
         self.assertEqual(12, ts.leechers)
         self.assertEqual(13, ts.seeders)
 
+    def test_update_health_alive_index(self) -> None:
+        """
+        Test if updating torrent health updates the index of alive torrents.
+        """
+        ts = MockTorrentState(infohash=b"\xee" * 20)
+        self.torrent_checker.mds.TorrentState.instances = [ts]
+
+        now = int(time.time())
+
+        self.torrent_checker.update_torrent_health(HealthInfo(b"\xee" * 20, 13, 12, now - 3600, self_checked=True))
+        alive = self.torrent_checker.alive_torrents.most_popular(10)
+        self.torrent_checker.update_torrent_health(HealthInfo(b"\xee" * 20, 0, 12, now, self_checked=True))
+
+        self.assertEqual([(13, 12)], [(health.seeders, health.leechers) for health in alive])
+        self.assertEqual(0, len(self.torrent_checker.alive_torrents))
+
     async def test_check_local_torrents(self) -> None:
         """
-        Test if the random torrent health checking mechanism picks the right torrents.
+        Test if the periodic health check picks the torrents that are due, the most overdue first.
         """
         self.torrent_checker.mds.TorrentState.instances = [
-            MockTorrentState(bytes([i]) * 20, i, last_check=int(time.time()) if i < 20 else 0) for i in range(40)
+            MockTorrentState(bytes([i]) * 20, i, last_check=int(time.time()) if i < 20 else 1) for i in range(40)
         ]
         self.torrent_checker.mds.TorrentMetadata.instances = [
             MockMiniTorrentMetadata(bytes([i]) * 20, f"torrent{i}", self.torrent_checker.mds.TorrentState.instances[i])
             for i in range(40)
         ]
-        stale_infohashes = [bytes([i]) * 20 for i in range(20, 40)]
+        self.torrent_checker.mds.run_threaded = AsyncMock(side_effect=lambda func: func())
+
+        await self.torrent_checker.load_check_schedule()
+        selected_torrents, _ = await self.torrent_checker.check_local_torrents()
+
+        self.assertEqual(40, len(self.torrent_checker.check_schedule))
+        self.assertEqual([bytes([i]) * 20 for i in range(39, 39 - TORRENT_SELECTION_POOL_SIZE, -1)],
+                         selected_torrents)
+
+    async def test_check_local_torrents_skip_downloading(self) -> None:
+        """
+        Test if the periodic health check skips the torrents that we download.
+        """
+        self.torrent_checker.check_schedule.update(HealthInfo(b"\x01" * 20, last_check=0), now=0)
+        self.torrent_checker.check_schedule.update(HealthInfo(b"\x02" * 20, last_check=0), now=0)
+        self.torrent_checker.downloading = {b"\x01" * 20}
 
-        # 1. Popular torrents are in the front, and
-        # 2. Older torrents are towards the back
-        selection_range = (stale_infohashes[0:TORRENT_SELECTION_POOL_SIZE]
-                           + stale_infohashes[-TORRENT_SELECTION_POOL_SIZE:])
         selected_torrents, _ = await self.torrent_checker.check_local_torrents()
 
-        self.assertLessEqual(len(selected_torrents), TORRENT_SELECTION_POOL_SIZE)
-        for t in selected_torrents:
-            self.assertIn(t.infohash, selection_range)
+        self.assertEqual([b"\x02" * 20], selected_torrents)
+
+    def test_check_downloading_torrents(self) -> None:
+        """
+        Test if the health of the torrents that we download is stored.
+        """
+        ts = MockTorrentState(infohash=b"\xee" * 20)
+        self.torrent_checker.mds.TorrentState.instances = [ts]
+        download = Mock(get_def=Mock(return_value=Mock(infohash=b"\xee" * 20)), hidden=False,
+                        config=Mock(get_hops=Mock(return_value=0)))
+        download.get_state.return_value.get_swarm_size.return_value = (13, 12)
+        self.torrent_checker.download_manager.get_downloads.return_value = [download]
+
+        self.torrent_checker.check_downloading_torrents()
+
+        self.assertEqual((13, 12), (ts.seeders, ts.leechers))
+        self.assertTrue(ts.self_checked)
+        self.assertEqual({b"\xee" * 20}, self.torrent_checker.downloading)
+        self.assertEqual(1, self.torrent_checker.get_statistics()["downloading"])
+
+    def test_check_downloading_torrents_no_peers(self) -> None:
+        """
+        Test if the torrents that we download, but of which we know no peers, are still checked separately.
+        """
+        download = Mock(get_def=Mock(return_value=Mock(infohash=b"\xee" * 20)), hidden=False,
+                        config=Mock(get_hops=Mock(return_value=0)))
+        download.get_state.return_value.get_swarm_size.return_value = (0, 0)
+        self.torrent_checker.download_manager.get_downloads.return_value = [download]
+        self.torrent_checker.downloading = {b"\xee" * 20}
+
+        self.assertEqual([], self.torrent_checker.check_downloading_torrents())
+        self.assertEqual(set(), self.torrent_checker.downloading)
+
+    def test_check_downloading_torrents_anonymous(self) -> None:
+        """
+        Test if the health of anonymous and hidden downloads is not harvested, so that we do not gossip it.
+        """
+        ts = MockTorrentState(infohash=b"\xee" * 20)
+        self.torrent_checker.mds.TorrentState.instances = [ts]
+        anonymous = Mock(get_def=Mock(return_value=Mock(infohash=b"\xee" * 20)), hidden=False,
+                         config=Mock(get_hops=Mock(return_value=1)))
+        hidden = Mock(get_def=Mock(return_value=Mock(infohash=b"\xee" * 20)), hidden=True,
+                      config=Mock(get_hops=Mock(return_value=0)))
+        self.torrent_checker.download_manager.get_downloads.return_value = [anonymous, hidden]
+
+        self.assertEqual([], self.torrent_checker.check_downloading_torrents())
+        self.assertEqual(set(), self.torrent_checker.downloading)
+        self.assertNotIn(b"\xee" * 20, self.torrent_checker.torrents_checked)
+        anonymous.get_state.assert_not_called()
+        hidden.get_state.assert_not_called()
+
+    def test_update_torrent_health_reschedule(self) -> None:
+        """
+        Test if updating the health of a torrent schedules its next check.
+        """
+        self.torrent_checker.mds.TorrentState.instances = [MockTorrentState(b"\xee" * 20)]
+
+        self.torrent_checker.update_torrent_health(HealthInfo(b"\xee" * 20, 1, 2, int(time.time()), self_checked=True))
+
+        self.assertIn(b"\xee" * 20, self.torrent_checker.check_schedule)
 
     def test_update_torrent_health_invalid_health(self) -> None:
         """
@@ -1,13 +1,23 @@
+from __future__ import annotations
+
 import struct
-from asyncio import CancelledError, Future, ensure_future, sleep
+import time
+from asyncio import CancelledError, DatagramProtocol, DatagramTransport, Future, ensure_future, get_running_loop, sleep
 from unittest.mock import Mock, patch
+from urllib.parse import parse_qs
 
+from aiohttp import web
 from aiohttp.web_exceptions import HTTPBadRequest
 from ipv8.test.base import TestBase
 from ipv8.util import succeed
 from libtorrent import bencode
 
 from tribler.core.torrent_checker.torrentchecker_session import (
+    MAX_INFOHASHES_IN_UDP_SCRAPE,
+    MAX_SINGLE_SCRAPE_TRACKERS,
+    SINGLE_SCRAPE_EXPIRY,
+    UDP_CONNECTION_ID_LIFETIME,
+    HttpSessionPool,
     HttpTrackerSession,
     UdpSocketManager,
     UdpTrackerSession,
@@ -27,12 +37,97 @@ class MockUdpSocketManager:
         """
         self.response = None
         self.tracker_sessions = {}
+        self.connection_ids = {}
+        self.sent = []
 
     def send_request(self, data: bytes, tracker_session: UdpTrackerSession) -> Future:
         """
         Fake sending a request and return the registered response.
         """
-        return succeed(self.response)
+        self.sent.append(data)
+        return succeed(self.response(data) if callable(self.response) else self.response)
+
+
+class FakeUdpTracker(DatagramProtocol):
+    """
+    A local UDP tracker that answers connect and scrape requests and counts the packets it receives.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create a new fake tracker.
+        """
+        self.transport: DatagramTransport | None = None
+        self.packets = 0
+
+    def connection_made(self, transport: DatagramTransport) -> None:  # type: ignore[override]
+        """
+        Remember the transport to answer with.
+        """
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        """
+        Answer a connect request with a connection id and a scrape request with some health info.
+        """
+        self.packets += 1
+        _, action, transaction_id = struct.unpack_from("!qii", data)
+        if action == 0:
+            self.transport.sendto(struct.pack("!iiq", 0, transaction_id, 42), addr)
+        else:
+            infohash_count = (len(data) - 16) // 20
+            self.transport.sendto(struct.pack("!ii", 2, transaction_id) + struct.pack("!iii", 1, 2, 3)
+                                  * infohash_count, addr)
+
+
+class FakeHttpTracker:
+    """
+    A local HTTP tracker that answers scrape requests and counts the requests and connections it receives.
+    """
+
+    def __init__(self, multi_scrape: bool = True, status: int = 200) -> None:
+        """
+        Create a new fake tracker.
+        """
+        self.multi_scrape = multi_scrape
+        self.status = status
+        self.requests = 0
+        self.connections: set[tuple[str, int]] = set()
+        self.runner: web.AppRunner | None = None
+        self.port = 0
+
+    async def start(self) -> None:
+        """
+        Start listening on a free local port.
+        """
+        app = web.Application()
+        app.add_routes([web.get("/scrape", self.scrape)])
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = self.runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        """
+        Stop listening.
+        """
+        await self.runner.cleanup()
+
+    async def scrape(self, request: web.Request) -> web.Response:
+        """
+        Answer a scrape request with some health info for every requested infohash.
+        """
+        self.requests += 1
+        self.connections.add(request.transport.get_extra_info("peername"))
+        infohashes = [infohash.encode("latin-1")
+                      for infohash in parse_qs(request.rel_url.raw_query_string, encoding="latin-1")["info_hash"]]
+        if len(infohashes) > 1 and not self.multi_scrape:
+            raise HTTPBadRequest
+        if self.status != 200:
+            return web.Response(status=self.status)
+        return web.Response(body=bencode({b"files": {infohash: {b"complete": 1, b"incomplete": 2}
+                                                     for infohash in infohashes}}))
 
 
 class TestTrackerSession(TestBase):
@@ -115,6 +210,151 @@ class TestTrackerSession(TestBase):
 
         self.assertFalse(self.session.is_failed)
 
+    async def scrape_fake_http_tracker(self, tracker: FakeHttpTracker, infohashes: list[bytes],
+                                       pool: HttpSessionPool | None) -> HttpTrackerSession:
+        """
+        Scrape the given infohashes from the given fake tracker and return the session that did so.
+        """
+        session = HttpTrackerSession(f"http://127.0.0.1:{tracker.port}/announce", ("127.0.0.1", tracker.port),
+                                     "/announce", 5, None, pool)
+        for infohash in infohashes:
+            session.add_infohash(infohash)
+        try:
+            await session.connect_to_tracker()
+        finally:
+            await session.cleanup()
+        return session
+
+    async def test_http_pool_reuse_connection(self) -> None:
+        """
+        Test if HTTP sessions in a pool scrape a tracker over a single connection, instead of one per scrape.
+        """
+        tracker = FakeHttpTracker()
+        await tracker.start()
+        pool = HttpSessionPool()
+
+        for i in range(10):
+            await self.scrape_fake_http_tracker(tracker, [bytes([i]) * 20], pool)
+        pooled_connections = len(tracker.connections)
+        tracker.connections.clear()
+        for i in range(10):
+            await self.scrape_fake_http_tracker(tracker, [bytes([i]) * 20], None)
+        await pool.close()
+        await tracker.stop()
+
+        self.assertEqual(20, tracker.requests)
+        self.assertEqual(1, pooled_connections)
+        self.assertEqual(10, len(tracker.connections))
+
+    async def test_http_pool_cleanup(self) -> None:
+        """
+        Test if cleaning up a pooled HTTP session does not close the shared session.
+        """
+        pool = HttpSessionPool()
+        self.session = HttpTrackerSession("localhost", ("localhost", 8475), "/announce", 5, None, pool)
+
+        await self.session.cleanup()
+
+        self.assertFalse(pool.get_session(None).closed)
+        self.assertIs(self.session.session, pool.get_session(None))
+        await pool.close()
+
+    async def test_http_multi_scrape(self) -> None:
+        """
+        Test if multiple infohashes are scraped from an HTTP tracker in a single request.
+        """
+        tracker = FakeHttpTracker()
+        await tracker.start()
+        pool = HttpSessionPool()
+        infohashes = [bytes([i]) * 20 for i in range(3)]
+
+        session = HttpTrackerSession(f"http://127.0.0.1:{tracker.port}/announce", ("127.0.0.1", tracker.port),
+                                     "/announce", 5, None, pool)
+        for infohash in infohashes:
+            session.add_infohash(infohash)
+        response = await session.connect_to_tracker()
+        await session.cleanup()
+        await pool.close()
+        await tracker.stop()
+
+        self.assertEqual(1, tracker.requests)
+        self.assertEqual(set(infohashes), {health.infohash for health in response.torrent_health_list})
+        self.assertEqual({1}, {health.seeders for health in response.torrent_health_list})
+
+    async def test_http_single_scrape_fallback(self) -> None:
+        """
+        Test if trackers that reject a scrape of multiple infohashes are scraped one infohash at a time afterwards.
+        """
+        tracker = FakeHttpTracker(multi_scrape=False)
+        await tracker.start()
+        pool = HttpSessionPool()
+
+        retried = await self.scrape_fake_http_tracker(tracker, [b"\x01" * 20, b"\x02" * 20], pool)
+        session = await self.scrape_fake_http_tracker(tracker, [b"\x01" * 20, b"\x02" * 20], pool)
+        await pool.close()
+        await tracker.stop()
+
+        self.assertEqual(3, tracker.requests)
+        self.assertFalse(retried.is_failed)
+        self.assertEqual(1, session.max_infohashes)
+        self.assertFalse(session.is_failed)
+
+    async def test_http_single_scrape_failing_tracker(self) -> None:
+        """
+        Test if trackers that fail for another reason than a scrape of multiple infohashes are not downgraded.
+        """
+        tracker = FakeHttpTracker(status=503)
+        await tracker.start()
+        pool = HttpSessionPool()
+
+        with self.assertRaises(ValueError):
+            await self.scrape_fake_http_tracker(tracker, [b"\x01" * 20, b"\x02" * 20], pool)
+        await pool.close()
+        await tracker.stop()
+
+        self.assertEqual(1, tracker.requests)
+        self.assertTrue(pool.supports_multi_scrape(f"http://127.0.0.1:{tracker.port}/announce"))
+
+    async def test_http_single_scrape_rejected(self) -> None:
+        """
+        Test if trackers that also reject a scrape of a single infohash are not downgraded.
+        """
+        tracker = FakeHttpTracker(status=400)
+        await tracker.start()
+        pool = HttpSessionPool()
+
+        with self.assertRaises(ValueError):
+            await self.scrape_fake_http_tracker(tracker, [b"\x01" * 20, b"\x02" * 20], pool)
+        await pool.close()
+        await tracker.stop()
+
+        self.assertEqual(2, tracker.requests)
+        self.assertTrue(pool.supports_multi_scrape(f"http://127.0.0.1:{tracker.port}/announce"))
+
+    def test_single_scrape_expiry(self) -> None:
+        """
+        Test if trackers are scraped with multiple infohashes again after a while.
+        """
+        pool = HttpSessionPool()
+        pool.reject_multi_scrape("http://tracker.com/announce")
+        self.assertFalse(pool.supports_multi_scrape("http://tracker.com/announce"))
+
+        pool.single_scrape_trackers["http://tracker.com/announce"] = time.time() - SINGLE_SCRAPE_EXPIRY - 1
+
+        self.assertTrue(pool.supports_multi_scrape("http://tracker.com/announce"))
+        self.assertEqual({}, pool.single_scrape_trackers)
+
+    def test_single_scrape_bounded(self) -> None:
+        """
+        Test if the oldest single-scrape trackers are forgotten if there are too many of them.
+        """
+        pool = HttpSessionPool()
+        for i in range(MAX_SINGLE_SCRAPE_TRACKERS + 1):
+            pool.reject_multi_scrape(f"http://tracker{i}.com/announce")
+
+        self.assertEqual(MAX_SINGLE_SCRAPE_TRACKERS, len(pool.single_scrape_trackers))
+        self.assertTrue(pool.supports_multi_scrape("http://tracker0.com/announce"))
+
     async def test_pop_finished_transaction(self) -> None:
         """
         Test if receiving a datagram for an already finished tracker session does not result in InvalidStateError.
@@ -364,3 +604,108 @@ class TestTrackerSession(TestBase):
 
         with self.assertRaises(ValueError):
             self.session.failed("\xd0")
+
+    async def test_connect_caches_connection_id(self) -> None:
+        """
+        Test if the connection id that a tracker gives us is cached in the socket manager.
+        """
+        self.session = UdpTrackerSession("localhost", ("localhost", 4782), "/announce", 5, None,
+                                         self.fake_udp_socket_manager)
+        self.fake_udp_socket_manager.response = struct.pack("!iiq", 0, self.session.transaction_id, 2)
+
+        await self.session.connect()
+
+        self.assertEqual(2, self.fake_udp_socket_manager.connection_ids[(("localhost", 4782), None)][0])
+
+    async def test_use_cached_connection_id(self) -> None:
+        """
+        Test if a session skips the connect request when the tracker gave us a connection id recently.
+        """
+        self.fake_udp_socket_manager.connection_ids[(("localhost", 4782), None)] = (2, time.time())
+        self.session = UdpTrackerSession("localhost", ("localhost", 4782), "/announce", 5, None,
+                                         self.fake_udp_socket_manager)
+
+        self.assertTrue(self.session.use_cached_connection_id())
+        self.assertEqual(2, self.session._connection_id)  # noqa: SLF001
+        self.assertEqual(2, self.session.action)
+
+    async def test_use_cached_connection_id_expired(self) -> None:
+        """
+        Test if a session does not use a connection id that is older than its lifetime.
+        """
+        self.fake_udp_socket_manager.connection_ids[(("localhost", 4782), None)] = (
+            2, time.time() - UDP_CONNECTION_ID_LIFETIME
+        )
+        self.session = UdpTrackerSession("localhost", ("localhost", 4782), "/announce", 5, None,
+                                         self.fake_udp_socket_manager)
+
+        self.assertFalse(self.session.use_cached_connection_id())
+        self.assertEqual({}, self.fake_udp_socket_manager.connection_ids)
+
+    async def test_scrape_cached_connection_id_rejected(self) -> None:
+        """
+        Test if a session reconnects once when the tracker rejects a cached connection id.
+        """
+        self.fake_udp_socket_manager.connection_ids[(("localhost", 4782), None)] = (2, time.time())
+        self.session = UdpTrackerSession("localhost", ("localhost", 4782), "/announce", 5, None,
+                                         self.fake_udp_socket_manager)
+        self.session.infohash_list.append(b"a" * 20)
+        self.session.use_cached_connection_id()
+
+        def respond(data: bytes) -> bytes:
+            connection_id, action, transaction_id = struct.unpack_from("!qii", data)
+            if action == 0:
+                return struct.pack("!iiq", 0, transaction_id, 3)
+            if connection_id == 2:
+                return struct.pack("!ii", 3, transaction_id) + b"Connection ID missmatch."
+            return struct.pack("!iiiii", 2, transaction_id, 1, 2, 3)
+
+        self.fake_udp_socket_manager.response = respond
+        response = await self.session.scrape()
+
+        self.assertEqual(3, len(self.fake_udp_socket_manager.sent))
+        self.assertEqual(1, response.torrent_health_list[0].seeders)
+        self.assertEqual(3, self.fake_udp_socket_manager.connection_ids[(("localhost", 4782), None)][0])
+
+    def test_udp_add_infohash_limit(self) -> None:
+        """
+        Test if a UDP session accepts as many infohashes as fit in a single scrape packet.
+        """
+        self.session = UdpTrackerSession("localhost", ("localhost", 4782), "/announce", 5, None,
+                                         self.fake_udp_socket_manager)
+
+        for i in range(100):
+            self.session.add_infohash(i.to_bytes(20, "big"))
+
+        self.assertEqual(MAX_INFOHASHES_IN_UDP_SCRAPE, len(self.session.infohash_list))
+
+    async def test_fake_tracker_packets(self) -> None:
+        """
+        Test how many packets it takes to check 1000 infohashes on a local UDP tracker.
+
+        Only the first session connects, the others reuse its connection id.
+        """
+        tracker = FakeUdpTracker()
+        tracker_transport, _ = await get_running_loop().create_datagram_endpoint(lambda: tracker,
+                                                                                 local_addr=("127.0.0.1", 0))
+        mgr = UdpSocketManager()
+        mgr_transport, _ = await get_running_loop().create_datagram_endpoint(lambda: mgr,
+                                                                             local_addr=("127.0.0.1", 0))
+        port = tracker_transport.get_extra_info("sockname")[1]
+        infohashes = [i.to_bytes(20, "big") for i in range(1000)]
+        results = []
+        try:
+            while infohashes:
+                session = UdpTrackerSession(f"udp://127.0.0.1:{port}", ("127.0.0.1", port), "/announce", 5,
+                                            None, mgr)
+                for infohash in infohashes[:session.max_infohashes]:
+                    session.add_infohash(infohash)
+                infohashes = infohashes[session.max_infohashes:]
+                results.extend((await session.connect_to_tracker()).torrent_health_list)
+                await session.cleanup()
+        finally:
+            tracker_transport.close()
+            mgr_transport.close()
+
+        self.assertEqual(1000, len(results))
+        self.assertEqual(1 + 14, tracker.packets)
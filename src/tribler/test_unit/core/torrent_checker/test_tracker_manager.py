@@ -1,12 +1,13 @@
 from __future__ import annotations
 
+import time
 from pathlib import Path
 from unittest.mock import Mock
 
 from ipv8.test.base import TestBase
 
 from tribler.core.libtorrent.trackers import get_uniformed_tracker_url
-from tribler.core.torrent_checker.tracker_manager import TrackerManager
+from tribler.core.torrent_checker.tracker_manager import MAX_TRACKER_FAILURES, TrackerManager
 from tribler.test_unit.core.torrent_checker.mocks import MockTrackerState
 
 
@@ -145,3 +146,40 @@ class TestTrackerManager(TestBase):
 
         self.assertIn("http://test1.com/announce", self.tracker_manager.blacklist)
         self.assertIn("http://test2.com/announce", self.tracker_manager.blacklist)
+
+    def test_get_trackers_to_revive(self) -> None:
+        """
+        Test if only dead trackers of which the backoff expired are probed again.
+        """
+        now = int(time.time())
+        MockTrackerState(url="http://alive.com/announce", failures=0, alive=True)
+        MockTrackerState(url="http://due.com/announce", last_check=now - 3600, failures=MAX_TRACKER_FAILURES,
+                         alive=False)
+        MockTrackerState(url="http://recent.com/announce", last_check=now, failures=MAX_TRACKER_FAILURES,
+                         alive=False)
+
+        self.assertEqual(["http://due.com/announce"], self.tracker_manager.get_trackers_to_revive(10))
+
+    def test_get_trackers_to_revive_limit(self) -> None:
+        """
+        Test if blacklisted trackers are not probed and if the trackers that were checked the longest ago come first.
+        """
+        for i in range(3):
+            MockTrackerState(url=f"http://due{i}.com/announce", last_check=i, failures=MAX_TRACKER_FAILURES,
+                             alive=False)
+        self.tracker_manager.blacklist.append("http://due0.com/announce")
+
+        self.assertEqual(["http://due1.com/announce"], self.tracker_manager.get_trackers_to_revive(1))
+
+    def test_revive_tracker(self) -> None:
+        """
+        Test if a dead tracker is revived by a successful check.
+        """
+        self.tracker_manager.add_tracker("http://test1.com:80/announce")
+        for _ in range(MAX_TRACKER_FAILURES):
+            self.tracker_manager.update_tracker_info("http://test1.com/announce", False)
+        self.assertFalse(self.tracker_manager.get_tracker_info("http://test1.com/announce")["is_alive"])
+
+        self.tracker_manager.update_tracker_info("http://test1.com/announce", True)
+
+        self.assertTrue(self.tracker_manager.get_tracker_info("http://test1.com/announce")["is_alive"])
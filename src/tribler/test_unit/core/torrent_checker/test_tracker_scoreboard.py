@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from ipv8.test.base import TestBase
+
+from tribler.core.torrent_checker.tracker_scoreboard import (
+    BASE_BACKOFF,
+    BREAKER_THRESHOLD,
+    MIN_TIMEOUT,
+    PROBE_TIMEOUT,
+    TrackerScoreboard,
+    classify_error,
+    get_backoff,
+)
+
+
+class TestTrackerScoreboard(TestBase):
+    """
+    Tests for the TrackerScoreboard class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create an empty scoreboard.
+        """
+        super().setUp()
+        self.scoreboard = TrackerScoreboard()
+        self.url = "udp://tracker.com:1337"
+
+    def fail(self, times: int) -> None:
+        """
+        Register the given number of failed checks of our tracker.
+        """
+        for _ in range(times):
+            self.scoreboard.record_failure(self.url, "request timed out")
+
+    def test_get_backoff(self) -> None:
+        """
+        Test if the backoff starts at the breaker threshold and doubles with every failure.
+        """
+        self.assertEqual(0, get_backoff(BREAKER_THRESHOLD - 1))
+        self.assertEqual(BASE_BACKOFF, get_backoff(BREAKER_THRESHOLD))
+        self.assertEqual(2 * BASE_BACKOFF, get_backoff(BREAKER_THRESHOLD + 1))
+
+    def test_classify_error(self) -> None:
+        """
+        Test if tracker session errors are classified.
+        """
+        self.assertEqual("timeout", classify_error("request timed out"))
+        self.assertEqual("dns", classify_error("[Errno -2] Name or service not known"))
+        self.assertEqual("http", classify_error("error code 404"))
+        self.assertEqual("protocol", classify_error("invalid response size"))
+        self.assertEqual("tracker", classify_error("torrent not registered"))
+
+    def test_record_success(self) -> None:
+        """
+        Test if a successful check updates the latency and success rate of a tracker.
+        """
+        self.fail(1)
+        self.scoreboard.record_success(self.url, 2.0)
+
+        score = self.scoreboard.scores[self.url]
+        self.assertEqual(2.0, score.latency)
+        self.assertEqual(0, score.consecutive_failures)
+        self.assertLess(score.success_rate, 1.0)
+        self.assertEqual("timeout", score.last_error)
+
+    def test_allow_closed(self) -> None:
+        """
+        Test if trackers that did not fail too often are allowed.
+        """
+        self.fail(BREAKER_THRESHOLD - 1)
+
+        self.assertTrue(self.scoreboard.allow(self.url))
+        self.assertEqual("closed", self.scoreboard.scores[self.url].state)
+
+    def test_allow_open(self) -> None:
+        """
+        Test if trackers that failed too often are not allowed until their backoff expires.
+        """
+        self.fail(BREAKER_THRESHOLD)
+        open_until = self.scoreboard.scores[self.url].open_until
+
+        self.assertFalse(self.scoreboard.allow(self.url, open_until - 1))
+        self.assertEqual("open", self.scoreboard.scores[self.url].state)
+
+    def test_allow_half_open(self) -> None:
+        """
+        Test if a single probe is allowed after the backoff of a tracker expires.
+        """
+        self.fail(BREAKER_THRESHOLD)
+        open_until = self.scoreboard.scores[self.url].open_until
+
+        self.assertTrue(self.scoreboard.allow(self.url, open_until))
+        self.assertFalse(self.scoreboard.allow(self.url, open_until))
+        self.assertEqual("half-open", self.scoreboard.scores[self.url].state)
+        self.assertTrue(self.scoreboard.allow(self.url, open_until + PROBE_TIMEOUT))
+
+    def test_probe_failure(self) -> None:
+        """
+        Test if a failed probe opens the circuit for twice as long.
+        """
+        self.fail(BREAKER_THRESHOLD)
+        self.scoreboard.allow(self.url, self.scoreboard.scores[self.url].open_until)
+        self.fail(1)
+
+        score = self.scoreboard.scores[self.url]
+        self.assertEqual("open", score.state)
+        self.assertAlmostEqual(2 * BASE_BACKOFF, score.open_until - score.last_check)
+
+    def test_probe_success(self) -> None:
+        """
+        Test if a successful probe closes the circuit.
+        """
+        self.fail(BREAKER_THRESHOLD)
+        self.scoreboard.allow(self.url, self.scoreboard.scores[self.url].open_until)
+        self.scoreboard.record_success(self.url, 1.0)
+
+        self.assertEqual("closed", self.scoreboard.scores[self.url].state)
+        self.assertTrue(self.scoreboard.allow(self.url))
+
+    def test_get_timeout_unknown(self) -> None:
+        """
+        Test if trackers with too few successful checks get the default timeout.
+        """
+        self.scoreboard.record_success(self.url, 0.1)
+
+        self.assertEqual(20, self.scoreboard.get_timeout(self.url, 20))
+
+    def test_get_timeout_adaptive(self) -> None:
+        """
+        Test if fast trackers get a shorter timeout, but no shorter than the minimum.
+        """
+        for latency in [1.0, 1.5, 2.0, 1.0, 1.5]:
+            self.scoreboard.record_success(self.url, latency)
+        fast = "udp://fast.com:1337"
+        for _ in range(5):
+            self.scoreboard.record_success(fast, 0.01)
+
+        self.assertGreater(20, self.scoreboard.get_timeout(self.url, 20))
+        self.assertLess(MIN_TIMEOUT, self.scoreboard.get_timeout(self.url, 20))
+        self.assertEqual(MIN_TIMEOUT, self.scoreboard.get_timeout(fast, 20))
+
+    def test_to_api_response(self) -> None:
+        """
+        Test if the scores are reported with the most reliable trackers first.
+        """
+        self.fail(1)
+        self.scoreboard.record_success("udp://good.com:1337", 1.0)
+
+        response = self.scoreboard.to_api_response()
+
+        self.assertEqual(["udp://good.com:1337", self.url], [score["url"] for score in response])
+        self.assertEqual("closed", response[1]["state"])
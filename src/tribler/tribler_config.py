@@ -115,6 +115,7 @@ class ContentDiscoveryCommunityConfig(TypedDict):
     """
 
     enabled: bool
+    remote_query_workers: int
 
 
 class DHTDiscoveryCommunityConfig(TypedDict):
@@ -131,6 +132,7 @@ class DatabaseConfig(TypedDict):
     """
 
     enabled: bool
+    warm_up: bool
 
 
 class VersioningConfig(TypedDict):
@@ -236,6 +238,10 @@ class TorrentCheckerConfig(TypedDict):
     """
 
     enabled: bool
+    bulk_checks: bool
+    max_swarm_probes: int
+    max_probed_peers: int
+    swarm_probe_timeout: int
 
 
 class TunnelCommunityConfig(TypedDict):
@@ -306,8 +312,8 @@ DEFAULT_CONFIG = {
     "ipv8": ipv8_default_config,
     "statistics": False,
 
-    "content_discovery_community": ContentDiscoveryCommunityConfig(enabled=True),
-    "database": DatabaseConfig(enabled=True),
+    "content_discovery_community": ContentDiscoveryCommunityConfig(enabled=True, remote_query_workers=4),
+    "database": DatabaseConfig(enabled=True, warm_up=True),
     "dht_discovery": DHTDiscoveryCommunityConfig(enabled=True),
     "libtorrent": LibtorrentConfig(
         socks_listen_ports=[0, 0, 0, 0, 0],
@@ -361,7 +367,8 @@ DEFAULT_CONFIG = {
     "recommender": RecommenderConfig(enabled=True),
     "rendezvous": RendezvousConfig(enabled=True),
     "rss": RSSConfig(enabled=True, urls=[]),
-    "torrent_checker": TorrentCheckerConfig(enabled=True),
+    "torrent_checker": TorrentCheckerConfig(enabled=True, bulk_checks=True, max_swarm_probes=4,
+                                            max_probed_peers=20, swarm_probe_timeout=20),
     "tunnel_community": TunnelCommunityConfig(enabled=True, min_circuits=3, max_circuits=8),
     "versioning": VersioningConfig(enabled=True, allow_pre=False),
     "watch_folder": WatchFolderConfig(enabled=False, directory="", check_interval=10.0),
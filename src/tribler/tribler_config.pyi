@@ -41,6 +41,7 @@ class ContentDiscoveryCommunityConfig(TypedDict):
     """
 
     enabled: bool
+    remote_query_workers: int
 
 class DatabaseConfig(TypedDict):
     """
@@ -48,6 +49,7 @@ class DatabaseConfig(TypedDict):
     """
 
     enabled: bool
+    warm_up: bool
 
 class DownloadDefaultsConfig(TypedDict):
     """
@@ -185,6 +187,10 @@ class TorrentCheckerConfig(TypedDict):
     """
 
     enabled: bool
+    bulk_checks: bool
+    max_swarm_probes: int
+    max_probed_peers: int
+    swarm_probe_timeout: int
 
 class TriblerConfig(TypedDict):
     """
@@ -323,8 +329,12 @@ class TriblerConfigManager:
     @overload
     def set(self, option: Literal["content_discovery_community/enabled"], value: bool) -> None: ...
     @overload
+    def set(self, option: Literal["content_discovery_community/remote_query_workers"], value: int) -> None: ...
+    @overload
     def set(self, option: Literal["database/enabled"], value: bool) -> None: ...
     @overload
+    def set(self, option: Literal["database/warm_up"], value: bool) -> None: ...
+    @overload
     def set(self, option: Literal["libtorrent/socks_listen_ports"], value: list[int]) -> None: ...
     @overload
     def set(self, option: Literal["libtorrent/listen_interface"], value: str) -> None: ...
@@ -399,6 +409,14 @@ class TriblerConfigManager:
     @overload
     def set(self, option: Literal["torrent_checker/enabled"], value: bool) -> None: ...
     @overload
+    def set(self, option: Literal["torrent_checker/bulk_checks"], value: bool) -> None: ...
+    @overload
+    def set(self, option: Literal["torrent_checker/max_swarm_probes"], value: int) -> None: ...
+    @overload
+    def set(self, option: Literal["torrent_checker/max_probed_peers"], value: int) -> None: ...
+    @overload
+    def set(self, option: Literal["torrent_checker/swarm_probe_timeout"], value: int) -> None: ...
+    @overload
     def set(self, option: Literal["tunnel_community/enabled"], value: bool) -> None: ...
     @overload
     def set(self, option: Literal["tunnel_community/min_circuits"], value: int) -> None: ...
@@ -552,8 +570,12 @@ class TriblerConfigManager:
     @overload
     def get(self, option: Literal["content_discovery_community/enabled"]) -> bool: ...
     @overload
+    def get(self, option: Literal["content_discovery_community/remote_query_workers"]) -> int: ...
+    @overload
     def get(self, option: Literal["database/enabled"]) -> bool: ...
     @overload
+    def get(self, option: Literal["database/warm_up"]) -> bool: ...
+    @overload
     def get(self, option: Literal["libtorrent/socks_listen_ports"]) -> list[int]: ...
     @overload
     def get(self, option: Literal["libtorrent/listen_interface"]) -> str: ...
@@ -628,6 +650,14 @@ class TriblerConfigManager:
     @overload
     def get(self, option: Literal["torrent_checker/enabled"]) -> bool: ...
     @overload
+    def get(self, option: Literal["torrent_checker/bulk_checks"]) -> bool: ...
+    @overload
+    def get(self, option: Literal["torrent_checker/max_swarm_probes"]) -> int: ...
+    @overload
+    def get(self, option: Literal["torrent_checker/max_probed_peers"]) -> int: ...
+    @overload
+    def get(self, option: Literal["torrent_checker/swarm_probe_timeout"]) -> int: ...
+    @overload
     def get(self, option: Literal["tunnel_community/enabled"]) -> bool: ...
     @overload
     def get(self, option: Literal["tunnel_community/min_circuits"]) -> int: ...